@@ -2,15 +2,18 @@ from __future__ import annotations
 
 import json
 import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 import gymnasium as gym
 import numpy as np
 from sqlalchemy import create_engine, select
-from sqlalchemy.orm import Session
 
+from src.logging.partitions import resolve_db_paths
+from src.logging.replay import is_jsonl_export, open_export
 from src.logging.schema import Episode, Step
 
 
@@ -44,89 +47,276 @@ def _normalize_obs(obs_payload: Any) -> dict[str, Any]:
     return parsed
 
 
-def load_transitions_from_sqlite(db_path: Path) -> list[OfflineTransition]:
-    engine = create_engine(f"sqlite:///{db_path}")
-    with Session(engine) as session:
-        rows = session.execute(select(Step, Episode.mode).join(Episode, Step.episode_id == Episode.id)).all()
+@dataclass
+class RunningStats:
+    """Welford running mean/variance so reward scale never needs the full dataset."""
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def update(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / self.count)) if self.count else 0.0
+
+
+def _parse_sqlite_rows(rows: list[tuple[Any, Any, Any, Any, Any]]) -> list[OfflineTransition]:
     transitions: list[OfflineTransition] = []
-    for step, mode in rows:
-        obs = _normalize_obs(step.obs_json)
+    for obs_json, action, reward, done, mode in rows:
+        obs = _normalize_obs(obs_json)
         if not obs:
             continue
         transitions.append(
             OfflineTransition(
                 mode=mode or "unknown",
                 obs=obs,
-                action=int(step.action_int),
-                reward=float(step.reward_float),
-                done=bool(step.done_bool),
+                action=int(action),
+                reward=float(reward),
+                done=bool(done),
             )
         )
     return transitions
 
 
-def load_transitions_from_jsonl(path: Path) -> list[OfflineTransition]:
+def _parse_jsonl_lines(lines: list[str]) -> list[OfflineTransition]:
     transitions: list[OfflineTransition] = []
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            line = line.strip()
-            if not line:
-                continue
-            row = _decode_json_payload(line)
-            obs = _normalize_obs(row.get("obs"))
-            if not obs:
-                continue
-            transitions.append(
-                OfflineTransition(
-                    mode=str(row.get("mode") or "unknown"),
-                    obs=obs,
-                    action=int(row.get("action", 0)),
-                    reward=float(row.get("reward", 0.0)),
-                    done=bool(row.get("done", False)),
-                )
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        row = _decode_json_payload(line)
+        obs = _normalize_obs(row.get("obs"))
+        if not obs:
+            continue
+        transitions.append(
+            OfflineTransition(
+                mode=str(row.get("mode") or "unknown"),
+                obs=obs,
+                action=int(row.get("action", 0)),
+                reward=float(row.get("reward", 0.0)),
+                done=bool(row.get("done", False)),
             )
+        )
     return transitions
 
 
+def _sqlite_chunks(db_path: Path, chunk_size: int) -> Iterator[list[tuple]]:
+    query = (
+        select(Step.obs_json, Step.action_int, Step.reward_float, Step.done_bool, Episode.mode)
+        .join(Episode, Step.episode_id == Episode.id)
+        .order_by(Step.id)
+    )
+    for db_file in resolve_db_paths(db_path):
+        engine = create_engine(f"sqlite:///{db_file}")
+        try:
+            with engine.connect() as connection:
+                result = connection.execution_options(stream_results=True, yield_per=chunk_size).execute(query)
+                for partition in result.partitions(chunk_size):
+                    yield [tuple(row) for row in partition]
+        finally:
+            engine.dispose()
+
+
+def _jsonl_chunks(path: Path, chunk_size: int) -> Iterator[list[str]]:
+    with open_export(path) as handle:
+        chunk: list[str] = []
+        for line in handle:
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+class OfflineTransitionStream:
+    """Iterable offline dataset read from SQLite or a (``.gz``/``.zst``) JSONL export in chunks of ``chunk_size`` rows.
+
+    With ``parse_workers > 0`` raw chunks are decoded in a process pool; at most
+    ``2 * parse_workers`` chunks are in flight, so memory stays bounded by the chunk
+    size rather than the dataset size. ``reward_stats`` covers each row once: passes
+    after the first (restarts of the stream) do not count rows again.
+    """
+
+    def __init__(self, path: Path, chunk_size: int = 1024, parse_workers: int = 0) -> None:
+        self.path = Path(path)
+        self.chunk_size = max(1, int(chunk_size))
+        self.parse_workers = max(0, int(parse_workers))
+        self.reward_stats = RunningStats()
+
+    def _raw_chunks(self):
+        if is_jsonl_export(self.path):
+            return _jsonl_chunks(self.path, self.chunk_size), _parse_jsonl_lines
+        return _sqlite_chunks(self.path, self.chunk_size), _parse_sqlite_rows
+
+    def _parsed_chunks(self) -> Iterator[list[OfflineTransition]]:
+        chunks, parse = self._raw_chunks()
+        if self.parse_workers == 0:
+            for chunk in chunks:
+                yield parse(chunk)
+            return
+        with ProcessPoolExecutor(max_workers=self.parse_workers) as pool:
+            pending: deque = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(parse, chunk))
+                if len(pending) >= 2 * self.parse_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def is_empty(self) -> bool:
+        return not any(self._parsed_chunks())
+
+    def __iter__(self) -> Iterator[OfflineTransition]:
+        position = 0
+        for transitions in self._parsed_chunks():
+            for transition in transitions:
+                if position >= self.reward_stats.count:
+                    self.reward_stats.update(transition.reward)
+                position += 1
+                yield transition
+
+
+def episode_segments(source: Iterable[OfflineTransition], horizon: int) -> Iterator[list[OfflineTransition]]:
+    """Split ``source`` into in-order runs that end at a ``done`` transition or after ``horizon`` rows."""
+
+    segment: list[OfflineTransition] = []
+    for transition in source:
+        segment.append(transition)
+        if transition.done or len(segment) >= horizon:
+            yield segment
+            segment = []
+    if segment:
+        yield segment
+
+
+def shuffle_buffer(source: Iterable[Any], buffer_size: int, rng: random.Random) -> Iterator[Any]:
+    """Approximate shuffle holding at most ``buffer_size`` items; ``buffer_size <= 1`` keeps order."""
+
+    if buffer_size <= 1:
+        yield from source
+        return
+    buffer: list[Any] = []
+    for item in source:
+        if len(buffer) < buffer_size:
+            buffer.append(item)
+            continue
+        idx = rng.randrange(buffer_size)
+        yield buffer[idx]
+        buffer[idx] = item
+    rng.shuffle(buffer)
+    yield from buffer
+
+
+def load_transitions_from_sqlite(db_path: Path) -> list[OfflineTransition]:
+    return list(OfflineTransitionStream(db_path))
+
+
+def load_transitions_from_jsonl(path: Path) -> list[OfflineTransition]:
+    return list(OfflineTransitionStream(path))
+
+
 class OfflineReplayEnv(gym.Env):
+    """Replays logged transitions as an env rewarding agreement with the logged action.
+
+    ``transitions`` is either an in-memory list or an ``OfflineTransitionStream``.
+    Streams are cut into ``episode_segments`` of at most ``episode_horizon`` rows;
+    whole segments go through a shuffle buffer of about ``shuffle_buffer_size``
+    rows and each one is replayed in logged order as one episode, so recurrent
+    policies see real sequences. Streams restart when exhausted, and the reward
+    scale follows the stream's running reward statistics.
+    """
+
     metadata = {"render_modes": []}
 
     def __init__(
         self,
-        transitions: list[OfflineTransition],
+        transitions: list[OfflineTransition] | OfflineTransitionStream,
         observation_space: gym.Space,
         action_space: gym.Space,
         algorithm: str = "iql",
         episode_horizon: int = 128,
+        shuffle_buffer_size: int = 4096,
     ) -> None:
         super().__init__()
-        if not transitions:
-            raise ValueError("OfflineReplayEnv requires at least one transition")
-        self.transitions = transitions
         self.observation_space = observation_space
         self.action_space = action_space
         self.algorithm = algorithm.lower()
         self.episode_horizon = max(1, int(episode_horizon))
+        self.shuffle_buffer_size = int(shuffle_buffer_size)
         self._idx = 0
         self._steps = 0
-        self._reward_scale = max(1.0, float(np.std([t.reward for t in transitions]) or 1.0))
         self._rng = random.Random(0)
+        self.stream: OfflineTransitionStream | None = None
+        self._source: Iterator[list[OfflineTransition]] | None = None
+        self._segment: list[OfflineTransition] = []
+        self._segment_idx = 0
+        if isinstance(transitions, OfflineTransitionStream):
+            self.stream = transitions
+            self.transitions: list[OfflineTransition] = []
+            if not self._next_segment():
+                raise ValueError("OfflineReplayEnv requires at least one transition")
+        else:
+            if not transitions:
+                raise ValueError("OfflineReplayEnv requires at least one transition")
+            self.transitions = transitions
+            self._reward_scale = max(1.0, float(np.std([t.reward for t in transitions]) or 1.0))
+
+    def _next_segment(self) -> bool:
+        assert self.stream is not None
+        segments_in_buffer = max(1, self.shuffle_buffer_size // self.episode_horizon)
+        for _attempt in range(2):
+            if self._source is None:
+                segments = episode_segments(self.stream, self.episode_horizon)
+                self._source = shuffle_buffer(segments, segments_in_buffer, self._rng)
+            segment = next(self._source, None)
+            if segment is not None:
+                self._segment = segment
+                self._segment_idx = 0
+                self._reward_scale = max(1.0, self.stream.reward_stats.std or 1.0)
+                return True
+            self._source = None
+        return False
+
+    def _advance(self) -> OfflineTransition:
+        if self.stream is not None:
+            self._segment_idx += 1
+            if self._segment_idx >= len(self._segment):
+                self._next_segment()
+            return self._segment[self._segment_idx]
+        self._idx = (self._idx + 1) % len(self.transitions)
+        return self.transitions[self._idx]
+
+    def _transition(self) -> OfflineTransition:
+        if self.stream is not None:
+            return self._segment[self._segment_idx]
+        return self.transitions[self._idx]
 
     def reset(self, *, seed: int | None = None, options: dict | None = None):
         super().reset(seed=seed)
         if seed is not None:
             self._rng.seed(seed)
         self._steps = 0
-        self._idx = self._rng.randrange(len(self.transitions))
-        return self._coerce_obs(self.transitions[self._idx].obs), {}
+        if self.stream is None:
+            self._idx = self._rng.randrange(len(self.transitions))
+        elif self._segment_idx > 0:
+            # Episodes always start at the head of a segment.
+            self._next_segment()
+        return self._coerce_obs(self._transition().obs), {}
 
     def step(self, action: int):
-        tr = self.transitions[self._idx]
+        tr = self._transition()
         reward = self._offline_reward(tr, int(action))
         self._steps += 1
-        self._idx = (self._idx + 1) % len(self.transitions)
-        done = self._steps >= self.episode_horizon or tr.done
-        obs = self._coerce_obs(self.transitions[self._idx].obs)
+        segment_end = self.stream is not None and self._segment_idx + 1 >= len(self._segment)
+        done = self._steps >= self.episode_horizon or tr.done or segment_end
+        obs = self._coerce_obs(self._advance().obs)
         info = {"expected_action": tr.action, "mode": tr.mode, "algorithm": self.algorithm}
         return obs, reward, done, False, info
 
@@ -167,6 +357,10 @@ class OfflineReplayEnv(gym.Env):
 
 
 def load_offline_transitions(path: Path) -> list[OfflineTransition]:
-    if path.suffix.lower() == ".jsonl":
+    if is_jsonl_export(path):
         return load_transitions_from_jsonl(path)
     return load_transitions_from_sqlite(path)
+
+
+def stream_offline_transitions(path: Path, chunk_size: int = 1024, parse_workers: int = 0) -> OfflineTransitionStream:
+    return OfflineTransitionStream(path, chunk_size=chunk_size, parse_workers=parse_workers)
@@ -69,6 +69,14 @@ def observation_schema_signature(observation_space: gym.Space) -> dict[str, Any]
     return {"type": observation_space.__class__.__name__}
 
 
+def env_observation_schema(env) -> dict[str, Any]:
+    """``observation_schema_signature`` plus the env's ``observation_schema_extras`` (encoder version, entity features)."""
+
+    schema = observation_schema_signature(env.observation_space)
+    schema.update(getattr(env, "observation_schema_extras", None) or {})
+    return schema
+
+
 def schema_hash(schema: dict[str, Any]) -> str:
     encoded = json.dumps(schema, sort_keys=True, separators=(",", ":")).encode("utf-8")
     return hashlib.sha256(encoded).hexdigest()
@@ -7,12 +7,13 @@ from sb3_contrib import RecurrentPPO
 
 from src.agent.dagger import DAgger
 from src.agent.imitation import ImitationBuffer
-from src.agent.offline_rl import OfflineReplayEnv, OfflineTransition
+from src.agent.offline_rl import OfflineReplayEnv, OfflineTransition, OfflineTransitionStream
 from src.agent.policy import build_model
 from src.agent.preference_reward import PreferenceRewardModel, extract_state_features
 from src.agent.replay_buffer import MultiModeReplayBuffer, ReplayTransition, SamplingStrategy
 from src.agent.world_model import GoalManager
 from src.config import AtlasConfig
+from src.runtime.fast_path import FastPolicyRunner
 from src.env.modes import CurriculumStage, default_curriculum_stages, mode_success
 
 
@@ -90,6 +91,8 @@ class AtlasTrainer:
     preference_model: PreferenceRewardModel = field(default_factory=PreferenceRewardModel)
     curriculum: CurriculumManager = field(default_factory=CurriculumManager)
     replay_buffer: MultiModeReplayBuffer = field(default_factory=MultiModeReplayBuffer)
+    fast_inference: dict | None = None
+    _fast_runner: FastPolicyRunner | None = field(default=None, init=False, repr=False)
 
     def load(self, env) -> None:
         checkpoint = self.checkpoint_dir / "atlas_model.zip"
@@ -108,15 +111,17 @@ class AtlasTrainer:
         if self.model is None:
             raise RuntimeError("Model not initialized")
         self.model.learn(total_timesteps=total_steps, reset_num_timesteps=False)
+        self._fast_runner = None
 
     def offline_fine_tune(
         self,
         *,
         online_env,
-        transitions: list[OfflineTransition],
+        transitions: list[OfflineTransition] | OfflineTransitionStream,
         total_steps: int,
         algorithm: str = "iql",
         episode_horizon: int = 128,
+        shuffle_buffer_size: int = 4096,
     ) -> None:
         if self.model is None:
             raise RuntimeError("Model not initialized")
@@ -126,15 +131,32 @@ class AtlasTrainer:
             action_space=online_env.action_space,
             algorithm=algorithm,
             episode_horizon=episode_horizon,
+            shuffle_buffer_size=shuffle_buffer_size,
         )
         self.model.set_env(offline_env)
         self.model.learn(total_timesteps=total_steps, reset_num_timesteps=False)
         self.model.set_env(online_env)
+        self._fast_runner = None
+
+    def enable_fast_inference(self, num_threads: int | None = 1, traced: bool = False) -> None:
+        self.fast_inference = {"num_threads": num_threads, "traced": bool(traced)}
+        self._fast_runner = None
+
+    def _fast_path(self) -> FastPolicyRunner | None:
+        if self.fast_inference is None or self.model is None:
+            return None
+        if self._fast_runner is None or self._fast_runner.policy is not self.model.policy:
+            self._fast_runner = FastPolicyRunner(self.model, **self.fast_inference)
+        return self._fast_runner
 
     def predict(self, obs, state=None, mask=None):
         if self.model is None:
             raise RuntimeError("Model not initialized")
-        action, next_state = self.model.predict(obs, state=state, episode_start=mask, deterministic=False)
+        fast_path = self._fast_path()
+        if fast_path is not None:
+            action, next_state = fast_path.predict(obs, state=state, episode_start=bool(mask), deterministic=False)
+        else:
+            action, next_state = self.model.predict(obs, state=state, episode_start=mask, deterministic=False)
         try:
             scalar_action = int(action)
         except (TypeError, ValueError):
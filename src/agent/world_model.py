@@ -3,6 +3,10 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any
 
+import numpy as np
+
+from src.env.physics import PASSABLE
+
 
 @dataclass
 class GoalStackState:
@@ -23,6 +27,16 @@ class WorldModel:
     breakable_tested: dict[tuple[int, int], bool] = field(default_factory=dict)
     boundaries: set[tuple[int, int]] = field(default_factory=set)
 
+    def sync(self, memory, world) -> WorldModel:
+        """Refresh ``visited``/``frontier``/``boundaries`` from an ``env.exploration.ExplorationMemory``."""
+
+        seen = memory.seen_mask()
+        passable = PASSABLE[world.tile_codes()]
+        self.visited = {(int(x), int(y)) for y, x in np.argwhere(memory.visited_mask())}
+        self.frontier = {(int(x), int(y)) for x, y in memory.frontier(world)}
+        self.boundaries = {(int(x), int(y)) for y, x in np.argwhere(seen & ~passable)}
+        return self
+
 
 @dataclass
 class GoalManager:
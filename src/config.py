@@ -4,7 +4,7 @@ from pathlib import Path
 from typing import Literal
 
 import yaml
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ToggleConfig(BaseModel):
@@ -24,6 +24,7 @@ class RenderingConfig(BaseModel):
 class TimingConfig(BaseModel):
     env_step_hz: int
     agent_step_hz: int
+    threaded_inference: bool = False
 
 
 class ControlsConfig(BaseModel):
@@ -49,6 +50,8 @@ class TrainingConfig(BaseModel):
     n_steps: int
     batch_size: int
     policy_hidden_size: int
+    # Train on envs that leave tool-safety/progression/transform/fly diagnostics out of ``info``.
+    lean_info: bool = False
 
 
 class WorldConfig(BaseModel):
@@ -58,6 +61,23 @@ class WorldConfig(BaseModel):
     max_episode_steps: int
 
 
+class ObservationConfig(BaseModel):
+    # ``local_entities`` holds the ``entity_k`` nearest entities, one row of ``entity_features`` each.
+    entity_k: int = Field(default=4, ge=1)
+    entity_features: list[Literal["type", "dx", "dy", "distance", "hp", "hostile"]] = Field(
+        default_factory=lambda: ["type", "dx", "dy"], min_length=1
+    )
+
+
+class ShapingConfig(BaseModel):
+    # Potential-based shaping toward the GoalManager subgoal (``src.env.shaping``), switched per mode name.
+    modes: dict[str, bool] = Field(default_factory=dict)
+    scale: float = Field(default=0.1, ge=0.0)
+
+    def enabled(self, mode_name: str) -> bool:
+        return bool(self.modes.get(mode_name, False))
+
+
 class ProgressionConfig(BaseModel):
     enable_leveling: bool
     exp_curve: Literal["linear", "sqrt", "exp"]
@@ -65,6 +85,18 @@ class ProgressionConfig(BaseModel):
     gate_enabled: bool
 
 
+class LoggingConfig(BaseModel):
+    db_path: str = "atlas.db"
+    # When set, logs go to rotating partition files under this directory instead of db_path.
+    partition_dir: str | None = None
+    rotation: Literal["daily", "episodes", "size"] = "daily"
+    episodes_per_partition: int = 100
+    max_partition_mb: float = 256.0
+    # Batching for the multi-process LogAggregator (src.logging.aggregator).
+    aggregator_batch_size: int = 256
+    aggregator_flush_interval: float = 1.0
+
+
 class OpenAIConfig(BaseModel):
     api_key_env: str
     llm_model: str
@@ -79,8 +111,11 @@ class AtlasConfig(BaseModel):
     controls: ControlsConfig
     training: TrainingConfig
     world: WorldConfig
+    observation: ObservationConfig = Field(default_factory=ObservationConfig)
+    shaping: ShapingConfig = Field(default_factory=ShapingConfig)
     progression: ProgressionConfig
     openai: OpenAIConfig
+    logging: LoggingConfig = Field(default_factory=LoggingConfig)
 
 
 DEFAULT_CONFIG_PATH = Path(__file__).resolve().parents[1] / "configs" / "default.yaml"
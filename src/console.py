@@ -4,7 +4,9 @@ import json
 from dataclasses import dataclass, field
 from typing import Any
 
-from src.env.modes import create_mode
+from src.core.types import Enemy, Vec2
+from src.env.items import make_item
+from src.env.modes import create_mode, validate_mode_params
 from src.env.world_gen import PRESETS
 
 
@@ -41,7 +43,10 @@ class Console:
             return f"switched world to {preset} seed {seed}"
         if parts[:2] == ["mode", "set"] and len(parts) >= 3:
             mode_name = parts[2]
-            params = json.loads(" ".join(parts[3:]) or "{}")
+            try:
+                params = validate_mode_params(mode_name, json.loads(" ".join(parts[3:]) or "{}"))
+            except ValueError as exc:
+                return f"mode set failed: {exc}"
             game.env.set_mode(mode_name, params)
             return f"mode set to {mode_name}"
         if parts[:2] == ["hide", "set"] and len(parts) >= 3:
@@ -81,10 +86,38 @@ class Console:
         if parts[:2] == ["teleport"] and len(parts) >= 4:
             target = parts[1]
             x, y = int(parts[2]), int(parts[3])
-            actor = game.env.world.get_actor(target)
+            try:
+                actor = game.env.world.get_actor(target)
+            except KeyError:
+                return f"unknown actor: {target}"
             actor.pos.x = x
             actor.pos.y = y
             return f"teleported {target}"
+        if parts[:2] == ["enemy", "spawn"] and len(parts) >= 7:
+            enemy_type = parts[2]
+            x, y, hp, exp_value = (int(value) for value in parts[3:7])
+            world = game.env.world
+            if not world.in_bounds((x, y)):
+                return "enemy spawn out of bounds"
+            taken = {enemy.enemy_id for enemy in world.enemies}
+            serial = len(world.enemies) + 1
+            while f"{enemy_type}_{serial}" in taken:
+                serial += 1
+            enemy = Enemy(enemy_id=f"{enemy_type}_{serial}", pos=Vec2(x, y), hp=hp, atk=1, exp_value=exp_value, aggro_radius=4, enemy_type=enemy_type)
+            world.spawn_enemy(enemy)
+            return f"spawned {enemy.enemy_id} at ({x}, {y})"
+        if parts[:2] == ["item", "spawn"] and len(parts) >= 5:
+            item_type = parts[2]
+            x, y = int(parts[3]), int(parts[4])
+            world = game.env.world
+            if not world.in_bounds((x, y)):
+                return "item spawn out of bounds"
+            serial = len(world.items) + 1
+            while world.item_by_id(f"{item_type}_{serial}") is not None:
+                serial += 1
+            item = make_item(item_type, f"{item_type}_{serial}", (x, y))
+            world.spawn_item(item)
+            return f"spawned {item.item_id} at ({x}, {y})"
         if parts[:2] == ["pause", "ai"]:
             game.ai_paused = True
             return "AI paused"
@@ -0,0 +1,160 @@
+"""Struct-of-arrays actor storage for batched NumPy updates over many actors.
+
+Experimental: only ``physics.apply_vertical_motion_batch`` uses it, and that kernel
+has no production callers (see ``src.env.physics``).
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+
+# column -> (dtype, attribute path on Character/Enemy, default when the object lacks it)
+ACTOR_COLUMNS: dict[str, tuple[type, str, Any]] = {
+    "x": (np.float64, "pos.x", 0.0),
+    "y": (np.float64, "pos.y", 0.0),
+    "vel_x": (np.float64, "vel.x", 0.0),
+    "vel_y": (np.float64, "vel.y", 0.0),
+    "hp": (np.int32, "hp", 0),
+    "level": (np.int32, "level", 1),
+    "exp": (np.int32, "exp", 0),
+    "fly_timer": (np.int32, "fly_timer", 0),
+    "transform_timer": (np.int32, "transform_timer", 0),
+    "jump_remaining": (np.int32, "jump_remaining", 0),
+    "jump_cooldown": (np.int32, "jump_cooldown", 0),
+    "can_fly": (np.bool_, "can_fly", False),
+    "grounded": (np.bool_, "grounded", False),
+}
+
+
+_PATHS = {name: tuple(path.partition(".")[::2]) for name, (_dtype, path, _default) in ACTOR_COLUMNS.items()}
+
+
+def _get(obj: Any, name: str) -> Any:
+    head, tail = _PATHS[name]
+    value = getattr(obj, head, None)
+    if tail and value is not None:
+        value = getattr(value, tail, None)
+    return ACTOR_COLUMNS[name][2] if value is None else value
+
+
+def _set(obj: Any, name: str, value: Any) -> None:
+    head, tail = _PATHS[name]
+    if tail:
+        target = getattr(obj, head, None)
+        if target is not None:
+            setattr(target, tail, value)
+    elif hasattr(obj, head):
+        setattr(obj, head, value)
+
+
+class ActorTable:
+    """One NumPy column per actor attribute; row ``i`` belongs to ``ids[i]``.
+
+    ``load`` copies ``Character``/``Enemy`` objects in, batched kernels update the
+    columns, and ``store`` writes them back. Attributes an object does not have
+    (e.g. ``level`` on an ``Enemy``) use the column default and are not written back.
+    Rows are removed by swapping in the last row, so row order is not stable.
+    """
+
+    __slots__ = ("ids", "rows", "size", "columns")
+
+    def __init__(self, capacity: int = 16) -> None:
+        capacity = max(1, int(capacity))
+        self.ids: list[str] = []
+        self.rows: dict[str, int] = {}
+        self.size = 0
+        self.columns = {name: np.full(capacity, default, dtype=dtype) for name, (dtype, _path, default) in ACTOR_COLUMNS.items()}
+
+    @classmethod
+    def from_actors(cls, actors: Sequence[Any]) -> ActorTable:
+        table = cls(capacity=len(actors))
+        for actor in actors:
+            table.add(actor)
+        return table
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Live view of the used part of a column; writes go straight into the table."""
+
+        return self.columns[name][: self.size]
+
+    @staticmethod
+    def _actor_id(actor: Any) -> str:
+        return str(getattr(actor, "entity_id", None) or getattr(actor, "enemy_id"))
+
+    def _grow(self) -> None:
+        for name, column in self.columns.items():
+            dtype, _path, default = ACTOR_COLUMNS[name]
+            grown = np.full(len(column) * 2, default, dtype=dtype)
+            grown[: len(column)] = column
+            self.columns[name] = grown
+
+    def add(self, actor: Any) -> int:
+        actor_id = self._actor_id(actor)
+        if actor_id in self.rows:
+            raise ValueError(f"Actor already in table: {actor_id}")
+        if self.size == len(self.columns["x"]):
+            self._grow()
+        row = self.size
+        self.size += 1
+        self.ids.append(actor_id)
+        self.rows[actor_id] = row
+        self.load_row(row, actor)
+        return row
+
+    def remove(self, actor_id: str) -> None:
+        row = self.rows.pop(actor_id)
+        last = self.size - 1
+        if row != last:
+            moved = self.ids[last]
+            for column in self.columns.values():
+                column[row] = column[last]
+            self.ids[row] = moved
+            self.rows[moved] = row
+        self.ids.pop()
+        self.size = last
+
+    def load_row(self, row: int, actor: Any, columns: Iterable[str] = ACTOR_COLUMNS) -> None:
+        for name in columns:
+            self.columns[name][row] = _get(actor, name)
+
+    def load(self, actors: Iterable[Any], columns: Iterable[str] = ACTOR_COLUMNS) -> None:
+        """Refresh rows from their objects (e.g. after per-object tool calls)."""
+
+        for actor in actors:
+            self.load_row(self.rows[self._actor_id(actor)], actor, columns)
+
+    def store(self, actors: Iterable[Any], columns: Iterable[str] = ACTOR_COLUMNS) -> None:
+        """Write the columns back onto the objects, converting to Python scalars."""
+
+        actors = list(actors)
+        rows = [self.rows[self._actor_id(actor)] for actor in actors]
+        for name in columns:
+            values = self[name].tolist()
+            for actor, row in zip(actors, rows):
+                _set(actor, name, values[row])
+
+    def cells(self) -> np.ndarray:
+        """``(n, 2)`` integer ``(x, y)`` grid cells, truncated like ``Vec2.as_int``."""
+
+        return np.stack([self["x"], self["y"]], axis=1).astype(np.int64)
+
+    def tick_cooldowns(self) -> None:
+        cooldown = self["jump_cooldown"]
+        np.subtract(cooldown, 1, out=cooldown, where=cooldown > 0)
+
+    def apply_gravity(self, can_stand: np.ndarray, gravity: float, max_fall_speed: float) -> None:
+        """Batched ``rules.apply_gravity``: fliers are untouched, standing actors stop, the rest accelerate."""
+
+        vel_y = self["vel_y"]
+        active = ~self["can_fly"]
+        falling = active & ~can_stand
+        vel_y[falling] = np.minimum(vel_y[falling] + gravity, max_fall_speed)
+        vel_y[active & can_stand] = 0.0
+
+    def move(self, dx: np.ndarray | float, dy: np.ndarray | float) -> None:
+        self["x"][:] += dx
+        self["y"][:] += dy
@@ -25,3 +25,66 @@ class Timebase:
         elapsed = now - self._last
         if elapsed < target:
             time.sleep(target - elapsed)
+
+
+@dataclass
+class FixedRate:
+    """Accumulates elapsed time and reports how many fixed-rate ticks are due."""
+
+    hz: float
+    max_catch_up: int = 4
+
+    def __post_init__(self) -> None:
+        self._accumulator = 0.0
+
+    @property
+    def period(self) -> float:
+        return 1.0 / self.hz if self.hz > 0 else 0.0
+
+    def advance(self, delta: float) -> int:
+        if self.hz <= 0:
+            return 1
+        self._accumulator += max(0.0, delta)
+        due = int((self._accumulator + 1e-9) / self.period)
+        if due:
+            self._accumulator = max(0.0, self._accumulator - due * self.period)
+        if due > self.max_catch_up:
+            # Drop the backlog instead of spiralling when a frame took far too long.
+            due = self.max_catch_up
+            self._accumulator = 0.0
+        return due
+
+    def time_to_next(self) -> float:
+        if self.hz <= 0:
+            return 0.0
+        return max(0.0, self.period - self._accumulator)
+
+
+class LoopScheduler:
+    """Runs named channels (agent, env, render, ...) at independent fixed rates.
+
+    In headless mode no wall-clock time is consumed: every ``tick`` advances a
+    virtual clock by the period of the fastest channel, so channels keep their
+    relative rates while the loop runs as fast as possible.
+    """
+
+    def __init__(self, rates: dict[str, float], headless: bool = False, max_catch_up: int = 4) -> None:
+        self.channels = {name: FixedRate(float(hz), max_catch_up=max_catch_up) for name, hz in rates.items()}
+        self.headless = bool(headless)
+        bounded = [clock.period for clock in self.channels.values() if clock.hz > 0]
+        self._virtual_step = min(bounded) if bounded else 0.0
+        self._timebase = Timebase(target_hz=0)
+
+    def tick(self) -> dict[str, int]:
+        delta = self._virtual_step if self.headless else self._timebase.tick()
+        return {name: clock.advance(delta) for name, clock in self.channels.items()}
+
+    def sleep_until_next(self) -> None:
+        if self.headless:
+            return
+        waits = [clock.time_to_next() for clock in self.channels.values() if clock.hz > 0]
+        if not waits:
+            return
+        remaining = min(waits) - (time.perf_counter() - self._timebase._last)
+        if remaining > 0:
+            time.sleep(remaining)
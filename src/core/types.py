@@ -27,7 +27,7 @@ class TileType(str, Enum):
     GATE = "GATE"
 
 
-@dataclass
+@dataclass(slots=True)
 class TileProps:
     passable: bool
     solid: bool
@@ -54,7 +54,7 @@ TILE_PROPS: dict[TileType, TileProps] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class Vec2:
     x: float
     y: float
@@ -62,8 +62,16 @@ class Vec2:
     def as_int(self) -> tuple[int, int]:
         return int(self.x), int(self.y)
 
+    def set(self, x: float, y: float) -> None:
+        self.x = x
+        self.y = y
 
-@dataclass
+    def add(self, dx: float, dy: float) -> None:
+        self.x += dx
+        self.y += dy
+
+
+@dataclass(slots=True)
 class Character:
     entity_id: str
     display_name: str
@@ -71,6 +79,7 @@ class Character:
     vel: Vec2 = field(default_factory=lambda: Vec2(0, 0))
     facing: Facing = Facing.EAST
     hp: int = 10
+    max_hp: int = 10
     atk: int = 1
     defense: int = 0
     speed: float = 1.0
@@ -85,9 +94,11 @@ class Character:
     jump_remaining: int = 0
     jump_cooldown: int = 0
     grounded: bool = False
+    hand_item: Optional[Item] = None
+    inventory: list[Item] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ItemProps:
     pickupable: bool = True
     weapon_like: bool = False
@@ -100,7 +111,7 @@ class ItemProps:
     transform_unlock: Optional[dict] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     item_id: str
     pos: Vec2
@@ -108,7 +119,7 @@ class Item:
     props: ItemProps = field(default_factory=ItemProps)
 
 
-@dataclass
+@dataclass(slots=True)
 class Enemy:
     enemy_id: str
     pos: Vec2
@@ -116,3 +127,5 @@ class Enemy:
     atk: int
     exp_value: int
     aggro_radius: int
+    enemy_type: str = "slime"
+    defense: int = 0
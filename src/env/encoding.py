@@ -2,8 +2,15 @@ from __future__ import annotations
 
 import numpy as np
 
-from src.core.types import Facing
-from src.env import tools
+from src.core.types import Facing, TileType
+from src.env import items, tools
+
+# Bump when the meaning of an observation changes without changing its shape; exported
+# policy artifacts record it and are rejected on mismatch.
+OBSERVATION_SCHEMA_VERSION = 3
+
+# Observation code of each tile type (its position in the enum).
+TILE_CODES = {tile: idx for idx, tile in enumerate(TileType)}
 
 ACTION_MEANINGS = {
     0: "NOOP",
@@ -55,6 +62,20 @@ def action_mask_for(world, actor, tool_safety=None, tick: int = 0, strict_safety
     return mask
 
 
+def encode_hand_item(item) -> np.ndarray:
+    """``[held, opens doors, weapon, consumable]`` flags for ``observation["hand_item"]``."""
+
+    hand = np.zeros((4,), dtype=np.float32)
+    if item is None:
+        return hand
+    props = item.props
+    hand[0] = 1.0
+    hand[1] = float(props.key_id is not None)
+    hand[2] = float(props.weapon_like)
+    hand[3] = float(items.is_consumable(item))
+    return hand
+
+
 def facing_to_dir(facing: Facing) -> tuple[int, int]:
     mapping = {
         Facing.NORTH: (0, -1),
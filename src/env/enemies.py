@@ -0,0 +1,151 @@
+"""Enemy simulation: aggro, chasing and melee combat, indexed by a spatial hash."""
+from __future__ import annotations
+
+import numpy as np
+
+from src.core.events import Event
+from src.core.types import Enemy
+from src.env import rules
+from src.env.physics import PASSABLE
+from src.env.spatial_hash import SpatialHash
+
+# ``local_entities`` type code for enemies; the other codes live in ``entity_encoder``.
+ENEMY_ENTITY_TYPE = 4
+ENEMY_ATTACK_COOLDOWN = 3
+_FAR = np.iinfo(np.int64).max
+
+
+class EnemySystem:
+    """Owns ``World.enemies``: an id map, a ``SpatialHash`` of their cells and per-tick updates.
+
+    Each ``step`` only touches enemies within the largest ``aggro_radius`` of a
+    live actor (found through the hash), so idle enemies elsewhere on the map
+    cost nothing. Aggroed enemies pick the nearest actor inside their own
+    radius, attack it when adjacent and otherwise step one cell towards it.
+    Enemies do not fall; they walk through passable tiles only (gates block them).
+    """
+
+    def __init__(self, enemies: list[Enemy], cell_size: int = 4) -> None:
+        self.enemies = enemies
+        self.by_id: dict[str, Enemy] = {}
+        self.hash = SpatialHash(cell_size)
+        self.max_aggro = 0
+        self.tick = 0
+        self._ready_at: dict[str, int] = {}
+        for enemy in enemies:
+            self._index(enemy)
+
+    def _index(self, enemy: Enemy) -> None:
+        if enemy.enemy_id in self.by_id:
+            raise ValueError(f"Duplicate enemy id: {enemy.enemy_id}")
+        self.by_id[enemy.enemy_id] = enemy
+        self.hash.insert(enemy.enemy_id, enemy.pos.as_int())
+        self.max_aggro = max(self.max_aggro, int(enemy.aggro_radius))
+
+    def spawn(self, enemy: Enemy) -> None:
+        self._index(enemy)
+        self.enemies.append(enemy)
+
+    def remove(self, enemy_id: str) -> Enemy:
+        enemy = self.by_id.pop(enemy_id)
+        self.hash.remove(enemy_id)
+        self._ready_at.pop(enemy_id, None)
+        self.enemies.remove(enemy)
+        return enemy
+
+    def at(self, pos: tuple[int, int]) -> Enemy | None:
+        ids = self.hash.at(pos)
+        return self.by_id[min(ids)] if ids else None
+
+    def near(self, pos: tuple[int, int], radius: int) -> list[Enemy]:
+        """Enemies within Chebyshev distance ``radius``, ordered by id."""
+
+        return [self.by_id[enemy_id] for enemy_id in sorted(self.hash.query(pos, radius))]
+
+    def nearest(self, pos: tuple[int, int], k: int, radius: int) -> list[Enemy]:
+        return [self.by_id[enemy_id] for enemy_id in self.hash.nearest(pos, k, radius)]
+
+    def damage(self, enemy_id: str, amount: int, attacker_id: str) -> list[Event]:
+        enemy = self.by_id[enemy_id]
+        enemy.hp -= int(amount)
+        events = [Event("enemy_hit", {"enemy_id": enemy_id, "damage": int(amount), "hp": enemy.hp, "by": attacker_id})]
+        if enemy.hp <= 0:
+            self.remove(enemy_id)
+            events.append(
+                Event(
+                    "enemy_defeated",
+                    {"enemy_id": enemy_id, "enemy_type": enemy.enemy_type, "exp_value": enemy.exp_value, "by": attacker_id},
+                )
+            )
+        return events
+
+    def step(self, world) -> list[Event]:
+        """Advance every aggroed enemy by one tick; returns combat events."""
+
+        self.tick += 1
+        actors = [actor for actor in world.actors() if actor.hp > 0]
+        if not self.by_id or not actors:
+            return []
+        actor_cells = [actor.pos.as_int() for actor in actors]
+        nearby: set[str] = set()
+        for cell in actor_cells:
+            nearby.update(self.hash.query(cell, self.max_aggro))
+        if not nearby:
+            return []
+
+        ids = sorted(nearby)
+        enemies = [self.by_id[enemy_id] for enemy_id in ids]
+        enemy_pos = np.array([self.hash.position(enemy_id) for enemy_id in ids], dtype=np.int64)
+        delta = np.array(actor_cells, dtype=np.int64)[None, :, :] - enemy_pos[:, None, :]
+        distance = np.abs(delta).sum(axis=2)
+        radius = np.array([enemy.aggro_radius for enemy in enemies], dtype=np.int64)
+        distance = np.where(distance <= radius[:, None], distance, _FAR)
+        target = distance.argmin(axis=1)
+        rows = np.arange(len(ids))
+        best = distance[rows, target]
+        aggro = best != _FAR
+        ready = np.array([self._ready_at.get(enemy_id, 0) <= self.tick for enemy_id in ids], dtype=bool)
+        attacking = aggro & (best <= 1) & ready
+        chasing = aggro & (best > 1)
+
+        events: list[Event] = []
+        for row in np.flatnonzero(attacking).tolist():
+            enemy, actor = enemies[row], actors[target[row]]
+            if actor.hp <= 0:
+                continue
+            amount = rules.combat_damage(enemy.atk, actor.defense)
+            actor.hp = max(0, actor.hp - amount)
+            self._ready_at[enemy.enemy_id] = self.tick + ENEMY_ATTACK_COOLDOWN
+            events.append(Event("actor_damaged", {"actor_id": actor.entity_id, "enemy_id": enemy.enemy_id, "damage": amount, "hp": actor.hp}))
+            if actor.hp == 0:
+                events.append(Event("actor_defeated", {"actor_id": actor.entity_id, "enemy_id": enemy.enemy_id}))
+
+        if chasing.any():
+            self._chase(world, enemies, enemy_pos, delta[rows, target], chasing, set(actor_cells))
+        return events
+
+    def _chase(self, world, enemies, enemy_pos, to_target, chasing, blocked: set[tuple[int, int]]) -> None:
+        # Step along the dominant axis; fall back to the other axis if that cell is blocked.
+        step = np.sign(to_target)
+        horizontal = np.abs(to_target[:, 0]) >= np.abs(to_target[:, 1])
+        primary = np.where(horizontal[:, None], step * [1, 0], step * [0, 1])
+        secondary = step - primary
+        codes = world.tile_codes()
+        height, width = codes.shape
+
+        def passable(cells: np.ndarray) -> np.ndarray:
+            inside = (cells[:, 0] >= 0) & (cells[:, 0] < width) & (cells[:, 1] >= 0) & (cells[:, 1] < height)
+            result = np.zeros(len(cells), dtype=bool)
+            result[inside] = PASSABLE[codes[cells[inside, 1], cells[inside, 0]]]
+            return result
+
+        first, second = enemy_pos + primary, enemy_pos + secondary
+        first_ok, second_ok = passable(first), passable(second) & secondary.any(axis=1)
+        for row in np.flatnonzero(chasing).tolist():
+            enemy = enemies[row]
+            for cell, ok in ((first[row], first_ok[row]), (second[row], second_ok[row])):
+                cell = (int(cell[0]), int(cell[1]))
+                if ok and cell not in blocked and not self.hash.at(cell):
+                    self.hash.move(enemy.enemy_id, cell)
+                    enemy.pos.set(float(cell[0]), float(cell[1]))
+                    break
@@ -0,0 +1,202 @@
+"""Fog-of-war exploration memory as packed bitmaps over the tile grid."""
+from __future__ import annotations
+
+import numpy as np
+
+from src.env.physics import PASSABLE
+
+# Set bits per byte value, for counting newly revealed cells without unpacking.
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.int64)
+
+
+# First square search radius of ``nearest_frontier``; it doubles until a frontier cell is found.
+_FRONTIER_SEARCH_RADIUS = 8
+
+
+class ExplorationMemory:
+    """Which cells an actor has seen (inside its visibility window) and stood on.
+
+    ``seen`` and ``visited`` are ``np.packbits`` rows, one bit per cell, so a
+    step's update is a byte-wise OR of a cached column mask into the window
+    rows. ``border`` (same layout) marks seen cells next to an unseen cell; it
+    only changes around newly seen cells, so ``observe`` patches it inside the
+    window grown by one cell. The frontier is ``border`` restricted to passable
+    tiles, which is applied when the frontier is read, so tile changes never
+    force a rescan. ``nearest_frontier`` (and so ``hint``) searches a square
+    around the position and touches the whole grid only when the frontier is far.
+    """
+
+    __slots__ = (
+        "height",
+        "width",
+        "seen",
+        "visited",
+        "border",
+        "seen_count",
+        "visited_count",
+        "revisit",
+        "_masks",
+        "_border_version",
+        "_frontier",
+        "_frontier_key",
+    )
+
+    def __init__(self, height: int, width: int) -> None:
+        self.height = int(height)
+        self.width = int(width)
+        row_bytes = (self.width + 7) // 8
+        self.seen = np.zeros((self.height, row_bytes), dtype=np.uint8)
+        self.visited = np.zeros((self.height, row_bytes), dtype=np.uint8)
+        self.border = np.zeros((self.height, row_bytes), dtype=np.uint8)
+        self.seen_count = 0
+        self.visited_count = 0
+        self.revisit = False
+        self._masks: dict[tuple[int, int], np.ndarray] = {}
+        self._border_version = 0
+        self._frontier: np.ndarray | None = None
+        self._frontier_key: tuple[int, int] | None = None
+
+    @classmethod
+    def for_world(cls, world) -> ExplorationMemory:
+        height, width = world.tiles.shape
+        return cls(height, width)
+
+    def _column_mask(self, x0: int, x1: int) -> np.ndarray:
+        mask = self._masks.get((x0, x1))
+        if mask is None:
+            row = np.zeros(self.width, dtype=bool)
+            row[x0:x1] = True
+            mask = self._masks[(x0, x1)] = np.packbits(row)
+        return mask
+
+    def _unpack(self, bits: np.ndarray, y0: int, y1: int, x0: int, x1: int) -> np.ndarray:
+        """Boolean ``bits[y0:y1, x0:x1]``, unpacking only the bytes that hold those columns."""
+
+        b0 = x0 >> 3
+        block = np.unpackbits(bits[y0:y1, b0 : (x1 + 7) >> 3], axis=1)
+        return block[:, x0 - 8 * b0 : x1 - 8 * b0].astype(bool)
+
+    def _update_border(self, x0: int, x1: int, y0: int, y1: int) -> None:
+        # Only cells in the revealed window and its one-cell ring can change border state;
+        # deciding those needs ``seen`` one cell further out.
+        rx0, rx1 = max(0, x0 - 1), min(self.width, x1 + 1)
+        ry0, ry1 = max(0, y0 - 1), min(self.height, y1 + 1)
+        sx0, sx1 = max(0, rx0 - 1), min(self.width, rx1 + 1)
+        sy0, sy1 = max(0, ry0 - 1), min(self.height, ry1 + 1)
+        unseen = ~self._unpack(self.seen, sy0, sy1, sx0, sx1)
+        near_unseen = np.zeros_like(unseen)
+        near_unseen[1:, :] |= unseen[:-1, :]
+        near_unseen[:-1, :] |= unseen[1:, :]
+        near_unseen[:, 1:] |= unseen[:, :-1]
+        near_unseen[:, :-1] |= unseen[:, 1:]
+        patch = (~unseen & near_unseen)[ry0 - sy0 : ry1 - sy0, rx0 - sx0 : rx1 - sx0]
+
+        b0, b1 = rx0 >> 3, (rx1 + 7) >> 3
+        rows = np.unpackbits(self.border[ry0:ry1, b0:b1], axis=1)
+        rows[:, rx0 - 8 * b0 : rx1 - 8 * b0] = patch
+        self.border[ry0:ry1, b0:b1] = np.packbits(rows, axis=1)
+        self._border_version += 1
+
+    @staticmethod
+    def _bit(bits: np.ndarray, x: int, y: int) -> bool:
+        return bool((bits[y, x >> 3] >> (7 - (x & 7))) & 1)
+
+    def is_seen(self, pos: tuple[int, int]) -> bool:
+        return self._bit(self.seen, *pos)
+
+    def is_visited(self, pos: tuple[int, int]) -> bool:
+        return self._bit(self.visited, *pos)
+
+    def observe(self, pos: tuple[int, int], radius: int) -> int:
+        """Mark the window around ``pos`` seen and ``pos`` visited; returns the number of newly seen cells."""
+
+        x, y = pos
+        x0, x1 = max(0, x - radius), min(self.width, x + radius + 1)
+        y0, y1 = max(0, y - radius), min(self.height, y + radius + 1)
+        revealed = 0
+        if x0 < x1 and y0 < y1:
+            mask = self._column_mask(x0, x1)
+            window = self.seen[y0:y1]
+            revealed = int(_POPCOUNT[mask & ~window].sum())
+            window |= mask
+            self.seen_count += revealed
+            if revealed:
+                self._update_border(x0, x1, y0, y1)
+        self.revisit = False
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.revisit = self._bit(self.visited, x, y)
+            if not self.revisit:
+                self.visited[y, x >> 3] |= np.uint8(0x80 >> (x & 7))
+                self.visited_count += 1
+        return revealed
+
+    def seen_mask(self) -> np.ndarray:
+        return np.unpackbits(self.seen, axis=1, count=self.width).astype(bool)
+
+    def visited_mask(self) -> np.ndarray:
+        return np.unpackbits(self.visited, axis=1, count=self.width).astype(bool)
+
+    def border_mask(self) -> np.ndarray:
+        return np.unpackbits(self.border, axis=1, count=self.width).astype(bool)
+
+    def frontier(self, world) -> np.ndarray:
+        """``(n, 2)`` ``(x, y)`` cells that are seen, passable and border an unseen cell (row-major order).
+
+        A full-grid read, cached until new cells are seen or the tiles change;
+        the per-step ``hint`` does not use it.
+        """
+
+        key = (self._border_version, int(world.tile_version))
+        if self._frontier is None or self._frontier_key != key:
+            open_border = self.border_mask() & PASSABLE[world.tile_codes()]
+            self._frontier = np.argwhere(open_border)[:, ::-1]
+            self._frontier_key = key
+        return self._frontier
+
+    def nearest_frontier(self, world, pos: tuple[int, int]) -> tuple[int, int] | None:
+        """Manhattan-nearest frontier cell (first in row-major order on ties), or ``None``.
+
+        Searches a square of growing radius ``r`` around ``pos``: a hit at
+        distance ``d <= r`` is final, since every cell outside the square is
+        farther than ``r``; a farther hit widens the square to ``d`` once.
+        """
+
+        x, y = pos
+        codes = world.tile_codes()
+        radius = _FRONTIER_SEARCH_RADIUS
+        while True:
+            x0, x1 = max(0, x - radius), min(self.width, x + radius + 1)
+            y0, y1 = max(0, y - radius), min(self.height, y + radius + 1)
+            whole = x0 == 0 and y0 == 0 and x1 == self.width and y1 == self.height
+            cells = np.empty((0, 2), dtype=np.int64)
+            if x0 < x1 and y0 < y1:
+                cells = np.argwhere(self._unpack(self.border, y0, y1, x0, x1) & PASSABLE[codes[y0:y1, x0:x1]])
+            if len(cells):
+                distance = np.abs(cells[:, 1] + x0 - x) + np.abs(cells[:, 0] + y0 - y)
+                best = int(distance.argmin())
+                if distance[best] <= radius or whole:
+                    cy, cx = cells[best]
+                    return int(cx + x0), int(cy + y0)
+                radius = int(distance[best])
+            elif whole:
+                return None
+            else:
+                radius *= 2
+
+    def hint(self, world, pos: tuple[int, int]) -> np.ndarray:
+        """``observation["memory_hint"]``: ``[seen fraction, revisit flag, frontier dx, frontier dy]``.
+
+        The frontier direction points at the nearest frontier cell, scaled so the
+        larger component is +-1; it is 0 when nothing is left to explore.
+        """
+
+        hint = np.zeros((4,), dtype=np.float32)
+        hint[0] = self.seen_count / max(1, self.height * self.width)
+        hint[1] = float(self.revisit)
+        target = self.nearest_frontier(world, pos)
+        if target is not None:
+            dx, dy = target[0] - pos[0], target[1] - pos[1]
+            scale = max(abs(dx), abs(dy), 1)
+            hint[2] = dx / scale
+            hint[3] = dy / scale
+        return hint
@@ -6,25 +6,36 @@ from typing import Any
 import gymnasium as gym
 import numpy as np
 
+from src.agent.world_model import GoalManager
 from src.config import AtlasConfig
 from src.core.events import Event
 from src.core.rng import RNG
 from src.core.types import TILE_PROPS, Character, Facing, TileType, Vec2
 from src.env import encoding
-from src.env.modes import Mode, create_mode
+from src.env.enemies import EnemySystem
+from src.env.entity_encoder import EntityEncoder
+from src.env.exploration import ExplorationMemory
+from src.env.items import ItemSystem
+from src.env.modes import HideAndSeek, Mode, create_mode
 from src.env.rewards import compute_reward
+from src.env.shaping import GoalShaper
+from src.env.tile_index import TileIndex
 from src.env import rules
 from src.env.tools import (
     DEFAULT_TOOL_SAFETY_CONFIG,
     ToolSafetyTracker,
     ask_human,
+    attack,
     break_tile,
+    drop_hand,
     inspect,
     jump,
     move,
+    pickup_adjacent,
     speak,
     tool_safety_commit,
     tool_safety_precheck,
+    use_adjacent,
 )
 from src.env.world_gen import default_spawn, generate_world, world_snapshot_hash
 
@@ -67,17 +78,70 @@ def _apply_vertical_motion(world: World, actor: Character) -> None:
         actor.vel.y = 0
 
 
+def apply_agent_action(world: World, actor: Character, action: int) -> list[Event]:
+    """Execute one (already safety-checked) discrete action for ``actor``; returns the tool events."""
+
+    if rules.is_defeated(actor):
+        return []
+    if action == 2:
+        result = move(world, actor.entity_id, "E")
+    elif action == 4:
+        result = move(world, actor.entity_id, "W")
+    elif action == 5:
+        result = jump(world, actor.entity_id)
+    elif action == 6:
+        result = pickup_adjacent(world, actor.entity_id)
+    elif action == 7:
+        result = drop_hand(world, actor.entity_id)
+    elif action == 8:
+        result = use_adjacent(world, actor.entity_id)
+    elif action == 9:
+        dx, dy = encoding.facing_to_dir(actor.facing)
+        result = attack(world, actor.entity_id, (int(actor.pos.x + dx), int(actor.pos.y + dy)))
+    elif action == 10:
+        dx, dy = encoding.facing_to_dir(actor.facing)
+        result = break_tile(world, actor.entity_id, int(actor.pos.x + dx), int(actor.pos.y + dy))
+    elif action == 11:
+        dx, dy = encoding.facing_to_dir(actor.facing)
+        result = inspect(world, actor.entity_id, int(actor.pos.x + dx), int(actor.pos.y + dy))
+    elif action == 12:
+        result = speak(world, "Atlas (Plan): Weiter erkunden.")
+    elif action == 13:
+        result = ask_human(world, "Was soll ich als Nächstes tun?")
+    else:
+        return []
+    return result.events
+
+
 @dataclass
 class World:
     tiles: np.ndarray
     atlas: Character
     human: Character
+    # Extra agent-controlled actors (multi-agent mode), keyed by entity id.
+    agents: dict[str, Character] = field(default_factory=dict)
+    # Floor items and enemies are indexed by ``item_system``/``enemy_system``; change them
+    # through ``spawn_item``/``take_item``/``place_item`` and ``spawn_enemy``/``remove_enemy``.
     items: list = field(default_factory=list)
     enemies: list = field(default_factory=list)
     messages: list[tuple[str, str]] = field(default_factory=list)
     atlas_has_flag: bool = False
-    hand_item: Any | None = None
     pending_question: bool = False
+    dirty_tiles: set[tuple[int, int]] = field(default_factory=set)
+    tile_version: int = 0
+    tile_index: TileIndex | None = field(default=None, repr=False, compare=False)
+    enemy_system: EnemySystem | None = field(default=None, repr=False, compare=False)
+    item_system: ItemSystem | None = field(default=None, repr=False, compare=False)
+
+    @property
+    def hand_item(self):
+        """The lead Atlas's hand; other actors carry items in their own ``hand_item``."""
+
+        return self.atlas.hand_item
+
+    @hand_item.setter
+    def hand_item(self, item) -> None:
+        self.atlas.hand_item = item
 
     def in_bounds(self, pos: tuple[int, int]) -> bool:
         x, y = pos
@@ -89,6 +153,107 @@ class World:
             return TileType.WALL
         return self.tiles[y, x]
 
+    def set_tile(self, pos: tuple[int, int], tile: TileType) -> None:
+        """Mutate one tile and record it so cached views (renderer, maps) update incrementally."""
+
+        x, y = pos
+        old = self.tiles[y, x]
+        if old == tile:
+            return
+        self.tiles[y, x] = tile
+        self.dirty_tiles.add((x, y))
+        self.tile_version += 1
+        if self.tile_index is not None and self.tile_index.tiles is self.tiles:
+            self.tile_index.move((x, y), old, tile)
+
+    def tile_codes(self) -> np.ndarray:
+        """``int16`` grid of ``encoding.TILE_CODES``, built with the tile index and patched by ``set_tile``."""
+
+        return self._tile_index().codes
+
+    def _tile_index(self) -> TileIndex:
+        # Rebuilt lazily if ``tiles`` was replaced wholesale; direct array writes must go through ``set_tile``.
+        if self.tile_index is None or self.tile_index.tiles is not self.tiles:
+            self.tile_index = TileIndex(self.tiles)
+        return self.tile_index
+
+    def tiles_of(self, tile: TileType) -> list[tuple[int, int]]:
+        """All ``(x, y)`` cells holding ``tile``, in row-major order."""
+
+        return self._tile_index().positions(tile)
+
+    def has_tile(self, tile: TileType) -> bool:
+        return self._tile_index().contains(tile)
+
+    def _item_system(self) -> ItemSystem:
+        # Rebuilt if ``items`` was replaced. The length check only catches plain appends or
+        # removals; an add plus a remove behind the system's back goes unnoticed, so route
+        # every change through the methods below.
+        system = self.item_system
+        if system is None or system.items is not self.items or len(system.by_id) != len(self.items):
+            system = self.item_system = ItemSystem(self.items)
+        return system
+
+    def spawn_item(self, item) -> None:
+        self._item_system().spawn(item)
+
+    def item_by_id(self, item_id: str):
+        return self._item_system().get(item_id)
+
+    def items_at(self, pos: tuple[int, int]) -> list:
+        return self._item_system().at(pos) if self.items else []
+
+    def items_near(self, pos: tuple[int, int], radius: int) -> list:
+        return self._item_system().near(pos, radius) if self.items else []
+
+    def items_adjacent(self, pos: tuple[int, int]) -> list:
+        return self._item_system().adjacent(pos) if self.items else []
+
+    def take_item(self, item_id: str):
+        return self._item_system().take(item_id)
+
+    def place_item(self, item, pos: tuple[int, int]) -> None:
+        self._item_system().place(item, pos)
+
+    def _enemy_system(self) -> EnemySystem:
+        # Same contract as ``_item_system``: change ``enemies`` only through the methods below.
+        system = self.enemy_system
+        if system is None or system.enemies is not self.enemies or len(system.by_id) != len(self.enemies):
+            system = self.enemy_system = EnemySystem(self.enemies)
+        return system
+
+    def spawn_enemy(self, enemy) -> None:
+        self._enemy_system().spawn(enemy)
+
+    def remove_enemy(self, enemy_id: str):
+        return self._enemy_system().remove(enemy_id)
+
+    def enemy_at(self, pos: tuple[int, int]):
+        if not self.enemies:
+            return None
+        return self._enemy_system().at(pos)
+
+    def enemies_near(self, pos: tuple[int, int], radius: int) -> list:
+        return self._enemy_system().near(pos, radius) if self.enemies else []
+
+    def nearest_enemies(self, pos: tuple[int, int], k: int, radius: int) -> list:
+        if not self.enemies:
+            return []
+        return self._enemy_system().nearest(pos, k, radius)
+
+    def damage_enemy(self, enemy_id: str, amount: int, attacker_id: str) -> list[Event]:
+        return self._enemy_system().damage(enemy_id, amount, attacker_id)
+
+    def step_enemies(self) -> list[Event]:
+        if not self.enemies:
+            return []
+        return self._enemy_system().step(self)
+
+    def consume_dirty_tiles(self) -> set[tuple[int, int]]:
+        dirty = self.dirty_tiles
+        self.dirty_tiles = set()
+        return dirty
+
     def is_passable(self, pos: tuple[int, int]) -> bool:
         if not self.in_bounds(pos):
             return False
@@ -110,7 +275,15 @@ class World:
     def get_actor(self, actor_id: str) -> Character:
         if actor_id == self.atlas.entity_id:
             return self.atlas
-        return self.human
+        if actor_id == self.human.entity_id:
+            return self.human
+        actor = self.agents.get(actor_id)
+        if actor is None:
+            raise KeyError(f"Unknown actor: {actor_id}")
+        return actor
+
+    def actors(self) -> list[Character]:
+        return [self.atlas, self.human, *self.agents.values()]
 
     def describe_at(self, pos: tuple[int, int]) -> str:
         x, y = pos
@@ -127,33 +300,57 @@ class World:
 
 
 class GridEnv(gym.Env):
-    metadata = {"render_modes": ["human"], "render_fps": 30}
+    metadata = {"render_modes": ["human", "rgb_array"], "render_fps": 30}
 
-    def __init__(self, config: AtlasConfig, preset: str = "floating_islands", seed: int | None = None, strict_safety: bool = False):
+    def __init__(
+        self,
+        config: AtlasConfig,
+        preset: str = "floating_islands",
+        seed: int | None = None,
+        strict_safety: bool = False,
+        render_mode: str | None = None,
+        lean_info: bool = False,
+    ):
         super().__init__()
+        if render_mode is not None and render_mode not in self.metadata["render_modes"]:
+            raise ValueError(f"Unsupported render_mode: {render_mode}")
+        self.render_mode = render_mode
+        self._frame_renderer = None
         self.config = config
         self.preset = preset
         self.seed_value = seed or config.training.seed
         self.rng = RNG(self.seed_value)
         self.mode: Mode = create_mode("ExitGame")
+        self.mode_params: dict[str, Any] = {}
         self.world_hash = ""
         self.strict_safety = bool(strict_safety)
+        # Skip the tool-safety/progression/transform/fly diagnostics in ``info`` (pure training).
+        self.lean_info = bool(lean_info)
         self.tool_safety = ToolSafetyTracker(recent_tool_ticks=[], cooldown_until={})
         self.world = self._build_world()
+        self.exploration = ExplorationMemory.for_world(self.world)
+        self.entity_encoder = EntityEncoder.from_config(config)
+        self.goal_manager = GoalManager()
+        self.goal_shaper = GoalShaper.from_config(config)
         radius = config.world.visibility_radius
         tile_shape = (2 * radius + 1, 2 * radius + 1)
         self.observation_space = gym.spaces.Dict(
             {
                 "local_tiles": gym.spaces.Box(low=0, high=len(TileType), shape=tile_shape, dtype=np.int32),
-                "local_entities": gym.spaces.Box(low=-10, high=10, shape=(4, 3), dtype=np.float32),
+                "local_entities": gym.spaces.Box(low=-np.inf, high=np.inf, shape=self.entity_encoder.shape, dtype=np.float32),
                 "hand_item": gym.spaces.Box(low=0, high=1, shape=(4,), dtype=np.float32),
                 "stats": gym.spaces.Box(low=0, high=100, shape=(4,), dtype=np.float32),
                 "mode_features": gym.spaces.Box(low=0, high=1, shape=(2,), dtype=np.float32),
                 "action_mask": gym.spaces.Box(low=0, high=1, shape=(encoding.ACTION_COUNT,), dtype=np.int8),
-                "memory_hint": gym.spaces.Box(low=0, high=1, shape=(1,), dtype=np.float32),
+                "memory_hint": gym.spaces.Box(low=-1, high=1, shape=(4,), dtype=np.float32),
             }
         )
         self.action_space = gym.spaces.Discrete(encoding.ACTION_COUNT)
+        # Merged into the exported observation schema (see ``agent.policy.env_observation_schema``).
+        self.observation_schema_extras = {
+            "version": encoding.OBSERVATION_SCHEMA_VERSION,
+            "entity_features": list(self.entity_encoder.features),
+        }
         self._steps = 0
 
     def _build_world(self) -> World:
@@ -173,17 +370,49 @@ class GridEnv(gym.Env):
         self.rng = RNG(self.seed_value)
         self.tool_safety = ToolSafetyTracker(recent_tool_ticks=[], cooldown_until={})
         self.world = self._build_world()
+        self.exploration = ExplorationMemory.for_world(self.world)
+        self.exploration.observe(self.world.atlas.pos.as_int(), self.config.world.visibility_radius)
         self._steps = 0
+        self.goal_shaper.reset()
+        self._configure_mode_shaping()
         self.mode.reset(self.world, self.rng)
         return self._obs(), {}
 
+    def render(self):
+        if self.render_mode != "rgb_array":
+            return None
+        if self._frame_renderer is None:
+            from src.render.frame_capture import FrameRenderer
+
+            self._frame_renderer = FrameRenderer(self.config.rendering.tile_size)
+        return self._frame_renderer.render(self.world)
+
     def set_mode(self, name: str, params: dict | None = None) -> None:
         self.mode = create_mode(name, params)
+        self.mode_params = dict(params or {})
+        self._configure_mode_shaping()
         self.mode.reset(self.world, self.rng)
 
+    def goal_shaping_enabled(self) -> bool:
+        return self.config.shaping.enabled(self.mode.name)
+
+    def _configure_mode_shaping(self) -> None:
+        # BFS goal shaping replaces HideAndSeek's Manhattan shaping, which walls make misleading.
+        if isinstance(self.mode, HideAndSeek):
+            self.mode.distance_shaping = not self.goal_shaping_enabled()
+
+    def goal_shaping(self, actor: Character, prev_pos: tuple[int, int], mode_info: dict[str, Any], done: bool) -> float:
+        """Shaping toward the ``GoalManager`` subgoal for ``actor``'s move from ``prev_pos``; 0 when off for the mode."""
+
+        if not self.goal_shaping_enabled():
+            return 0.0
+        subgoal = self.goal_manager.update(self.mode.name, mode_info).active_subgoal
+        return self.goal_shaper.shape(self.world, subgoal, mode_info, prev_pos, actor.pos.as_int(), done, key=actor.entity_id)
+
     def step(self, action: int, preference_reward: float = 0.0):
         events: list[Event] = []
         atlas = self.world.atlas
+        prev_pos = atlas.pos.as_int()
         tool_rejection_code: str | None = None
         rejected_tool_action = False
         penalty = 0.0
@@ -196,29 +425,7 @@ class GridEnv(gym.Env):
             strict_safety=self.strict_safety,
         )
         if safety_result.ok:
-            if action == 2:
-                result = move(self.world, atlas.entity_id, "E")
-                events.extend(result.events)
-            elif action == 4:
-                result = move(self.world, atlas.entity_id, "W")
-                events.extend(result.events)
-            elif action == 5:
-                result = jump(self.world, atlas.entity_id)
-                events.extend(result.events)
-            elif action == 10:
-                dx, dy = encoding.facing_to_dir(atlas.facing)
-                result = break_tile(self.world, atlas.entity_id, int(atlas.pos.x + dx), int(atlas.pos.y + dy))
-                events.extend(result.events)
-            elif action == 11:
-                dx, dy = encoding.facing_to_dir(atlas.facing)
-                result = inspect(self.world, atlas.entity_id, int(atlas.pos.x + dx), int(atlas.pos.y + dy))
-                events.extend(result.events)
-            elif action == 12:
-                result = speak(self.world, "Atlas (Plan): Weiter erkunden.")
-                events.extend(result.events)
-            elif action == 13:
-                result = ask_human(self.world, "Was soll ich als Nächstes tun?")
-                events.extend(result.events)
+            events.extend(apply_agent_action(self.world, atlas, int(action)))
             tool_safety_commit(
                 int(action),
                 tick=self._steps,
@@ -236,10 +443,17 @@ class GridEnv(gym.Env):
         human_transform_ended = rules.tick_transform(self.world.human)
         atlas_fly_ended = rules.tick_fly(atlas)
         human_fly_ended = rules.tick_fly(self.world.human)
+        events.extend(self.world.step_enemies())
+        discovered = self.exploration.observe(atlas.pos.as_int(), self.config.world.visibility_radius)
+        if discovered:
+            events.append(Event("cells_discovered", {"count": discovered}))
 
         mode_reward, mode_events, done, info = self.mode.step(self.world, events, self.rng)
         all_events = events + mode_events
-        reward, reward_terms = compute_reward(mode_reward, all_events, preference_reward=preference_reward)
+        shaping = self.goal_shaping(atlas, prev_pos, info, done)
+        reward, reward_terms = compute_reward(mode_reward, all_events, preference_reward=preference_reward, shaping=shaping)
+        # Death rule: Atlas at 0 HP ends the episode (terminal) with ``DEATH_PENALTY``.
+        done = done or rules.is_defeated(atlas)
         if rejected_tool_action:
             reward += penalty
             reward_terms["safety_penalty"] = float(penalty)
@@ -249,28 +463,30 @@ class GridEnv(gym.Env):
         if info is None:
             info = {}
         info["reward_terms"] = reward_terms
-        info["tool_safety"] = {
-            "rejected": bool(rejected_tool_action),
-            "rejection_code": tool_rejection_code,
-            "strict": bool(self.strict_safety),
-        }
-        info["progression"] = progression
-        info["transform"] = {
-            "atlas_state": atlas.transform_state,
-            "atlas_timer": int(atlas.transform_timer),
-            "atlas_ended": bool(atlas_transform_ended),
-            "human_state": self.world.human.transform_state,
-            "human_timer": int(self.world.human.transform_timer),
-            "human_ended": bool(human_transform_ended),
-        }
-        info["fly"] = {
-            "atlas_can_fly": bool(atlas.can_fly),
-            "atlas_timer": int(atlas.fly_timer),
-            "atlas_ended": bool(atlas_fly_ended),
-            "human_can_fly": bool(self.world.human.can_fly),
-            "human_timer": int(self.world.human.fly_timer),
-            "human_ended": bool(human_fly_ended),
-        }
+        if not self.lean_info:
+            human = self.world.human
+            info["tool_safety"] = {
+                "rejected": bool(rejected_tool_action),
+                "rejection_code": tool_rejection_code,
+                "strict": bool(self.strict_safety),
+            }
+            info["progression"] = progression
+            info["transform"] = {
+                "atlas_state": atlas.transform_state,
+                "atlas_timer": int(atlas.transform_timer),
+                "atlas_ended": bool(atlas_transform_ended),
+                "human_state": human.transform_state,
+                "human_timer": int(human.transform_timer),
+                "human_ended": bool(human_transform_ended),
+            }
+            info["fly"] = {
+                "atlas_can_fly": bool(atlas.can_fly),
+                "atlas_timer": int(atlas.fly_timer),
+                "atlas_ended": bool(atlas_fly_ended),
+                "human_can_fly": bool(human.can_fly),
+                "human_timer": int(human.fly_timer),
+                "human_ended": bool(human_fly_ended),
+            }
         self._steps += 1
         if self._steps >= self.config.world.max_episode_steps:
             done = True
@@ -285,11 +501,9 @@ class GridEnv(gym.Env):
                 x = int(atlas.pos.x + dx)
                 y = int(atlas.pos.y + dy)
                 if self.world.in_bounds((x, y)):
-                    tiles[dy + radius, dx + radius] = list(TileType).index(self.world.tiles[y, x])
-        entities = np.zeros((4, 3), dtype=np.float32)
-        entities[0] = np.array([1, self.world.human.pos.x - atlas.pos.x, self.world.human.pos.y - atlas.pos.y])
-        entities[1] = np.array([2, 0.0, 0.0])
-        hand = np.zeros((4,), dtype=np.float32)
+                    tiles[dy + radius, dx + radius] = encoding.TILE_CODES[self.world.tiles[y, x]]
+        entities = self.entity_encoder.encode(self.world, atlas)
+        hand = encoding.encode_hand_item(atlas.hand_item)
         stats = np.array([atlas.hp, atlas.level, atlas.exp, atlas.speed], dtype=np.float32)
         mode_features = np.array([1.0, 0.0], dtype=np.float32)
         action_mask = encoding.action_mask_for(
@@ -299,7 +513,7 @@ class GridEnv(gym.Env):
             tick=self._steps,
             strict_safety=self.strict_safety,
         ).astype(np.int8)
-        memory_hint = np.array([0.0], dtype=np.float32)
+        memory_hint = self.exploration.hint(self.world, atlas.pos.as_int())
         return {
             "local_tiles": tiles,
             "local_entities": entities,
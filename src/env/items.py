@@ -0,0 +1,149 @@
+"""Item bookkeeping (id map, per-cell grid index) and item effects for pickup/drop/use."""
+from __future__ import annotations
+
+from dataclasses import replace
+
+from src.core.types import Character, Item, ItemProps, TileType, Vec2
+from src.env import rules
+from src.env.spatial_hash import SpatialHash
+
+INVENTORY_CAPACITY = 4
+
+# ``item spawn <type>`` presets; unknown types spawn as plain pickupables.
+ITEM_PRESETS: dict[str, ItemProps] = {
+    "key": ItemProps(key_id="door"),
+    "potion": ItemProps(heal=5),
+    "boots": ItemProps(jump_boost=1),
+    "feather": ItemProps(fly_grant={"duration_ticks": rules.DEFAULT_FLY_DURATION}),
+    "sword": ItemProps(weapon_like=True, damage=2),
+    "pickaxe": ItemProps(weapon_like=True, damage=1, break_power=1),
+    "crystal": ItemProps(transform_unlock={"transform_id": "berserk"}),
+}
+
+_NEIGHBOURS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+
+def make_item(item_type: str, item_id: str, pos: tuple[int, int]) -> Item:
+    preset = ITEM_PRESETS.get(item_type, ItemProps())
+    props = replace(
+        preset,
+        fly_grant=dict(preset.fly_grant) if preset.fly_grant else None,
+        transform_unlock=dict(preset.transform_unlock) if preset.transform_unlock else None,
+    )
+    return Item(item_id=item_id, pos=Vec2(float(pos[0]), float(pos[1])), type=item_type, props=props)
+
+
+def is_consumable(item: Item) -> bool:
+    props = item.props
+    return bool(props.heal or props.jump_boost or props.fly_grant or props.transform_unlock)
+
+
+class ItemSystem:
+    """Indexes the floor items of ``World.items`` by id and by grid cell.
+
+    ``get`` and ``at`` are O(1) and ``adjacent`` checks the four neighbouring
+    cells, so pickup checks no longer scan every item; ``near`` answers radius
+    queries through a ``SpatialHash``. Carried items leave the floor index and
+    live on the actor (``hand_item`` plus ``inventory``).
+    """
+
+    def __init__(self, items: list[Item]) -> None:
+        self.items = items
+        self.by_id: dict[str, Item] = {}
+        self.cells: dict[tuple[int, int], list[Item]] = {}
+        self.hash = SpatialHash()
+        for item in items:
+            self._index(item)
+
+    def _index(self, item: Item) -> None:
+        if item.item_id in self.by_id:
+            raise ValueError(f"Duplicate item id: {item.item_id}")
+        self.by_id[item.item_id] = item
+        self.cells.setdefault(item.pos.as_int(), []).append(item)
+        self.hash.insert(item.item_id, item.pos.as_int())
+
+    def spawn(self, item: Item) -> None:
+        self._index(item)
+        self.items.append(item)
+
+    def take(self, item_id: str) -> Item:
+        """Remove an item from the floor (it is about to be carried)."""
+
+        item = self.by_id.pop(item_id)
+        self.hash.remove(item_id)
+        cell = item.pos.as_int()
+        stack = self.cells[cell]
+        stack.remove(item)
+        if not stack:
+            del self.cells[cell]
+        self.items.remove(item)
+        return item
+
+    def place(self, item: Item, pos: tuple[int, int]) -> None:
+        item.pos.set(float(pos[0]), float(pos[1]))
+        self.spawn(item)
+
+    def get(self, item_id: str) -> Item | None:
+        return self.by_id.get(item_id)
+
+    def at(self, pos: tuple[int, int]) -> list[Item]:
+        return list(self.cells.get(pos, ()))
+
+    def near(self, pos: tuple[int, int], radius: int) -> list[Item]:
+        """Floor items within Chebyshev distance ``radius``, ordered by id."""
+
+        return [self.by_id[item_id] for item_id in sorted(self.hash.query(pos, radius))]
+
+    def adjacent(self, pos: tuple[int, int]) -> list[Item]:
+        """Pickupable floor items on the four cells around ``pos`` (N, E, S, W order)."""
+
+        x, y = pos
+        found: list[Item] = []
+        for dx, dy in _NEIGHBOURS:
+            found.extend(item for item in self.cells.get((x + dx, y + dy), ()) if item.props.pickupable)
+        return found
+
+
+def carry(actor: Character, item: Item) -> str:
+    """Put a picked-up item in the hand, or in the inventory if the hand is full; returns the slot."""
+
+    if actor.hand_item is None:
+        actor.hand_item = item
+        return "hand"
+    actor.inventory.append(item)
+    return "inventory"
+
+
+def can_carry(actor: Character) -> bool:
+    return actor.hand_item is None or len(actor.inventory) < INVENTORY_CAPACITY
+
+
+def release_hand(actor: Character) -> Item | None:
+    """Empty the hand; the next inventory item (if any) moves into it."""
+
+    item = actor.hand_item
+    actor.hand_item = actor.inventory.pop(0) if actor.inventory else None
+    return item
+
+
+def apply_item_effects(actor: Character, item: Item) -> dict[str, object]:
+    """Apply a consumable's ``ItemProps`` effects to ``actor``; returns what changed."""
+
+    props = item.props
+    applied: dict[str, object] = {}
+    if props.heal:
+        healed = max(0, min(int(props.heal), actor.max_hp - actor.hp))
+        actor.hp += healed
+        applied["heal"] = healed
+    if props.jump_boost:
+        actor.jump_power += float(props.jump_boost)
+        applied["jump_power"] = actor.jump_power
+    if props.fly_grant:
+        applied["fly"] = rules.apply_fly_item(actor, props.fly_grant)
+    if props.transform_unlock:
+        applied["transform"] = rules.activate_transform(actor, **props.transform_unlock)
+    return applied
+
+
+def key_opens(item: Item, tile: TileType) -> bool:
+    return item.props.key_id is not None and tile == TileType.DOOR_CLOSED
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
 from src.core.events import Event
 from src.core.rng import RNG
@@ -11,28 +11,50 @@ from src.core.types import TileType
 from src.env import rules
 
 
-class ModeState(BaseModel):
+_STATE_FIELDS: dict[type, tuple[str, ...]] = {}
+
+
+@dataclass(slots=True)
+class ModeState:
+    """Per-episode mode bookkeeping, mutated in place every tick.
+
+    Plain slotted dataclasses keep ``Mode.step`` cheap; ``to_dict`` snapshots the
+    state only when ``Mode.info()`` is asked for it.
+    """
+
     name: str
     objective: str
     status: str = ""
     done: bool = False
-    details: dict[str, Any] = Field(default_factory=dict)
+    details: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        names = _STATE_FIELDS.get(type(self))
+        if names is None:
+            names = _STATE_FIELDS[type(self)] = tuple(item.name for item in fields(self))
+        data = {name: getattr(self, name) for name in names}
+        data["details"] = dict(self.details)
+        return data
 
 
+@dataclass(slots=True)
 class FreeExploreState(ModeState):
     pass
 
 
+@dataclass(slots=True)
 class ExitGameState(ModeState):
     goal_reached: bool = False
     key_collected: bool = False
     door_open: bool = False
 
 
+@dataclass(slots=True)
 class HideAndSeekState(ModeState):
     hide_target: tuple[int, int] | None = None
 
 
+@dataclass(slots=True)
 class CaptureTheFlagState(ModeState):
     atlas_has_flag: bool = False
     flag_pos: tuple[int, int] | None = None
@@ -40,10 +62,22 @@ class CaptureTheFlagState(ModeState):
     score: int = 0
 
 
+@dataclass(slots=True)
 class TrainingArenaState(ModeState):
     pass
 
 
+class ModeParams(BaseModel):
+    """Validated ``mode set <mode> <json>`` parameters; only used at the console/config boundary."""
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class HideAndSeekParams(ModeParams):
+    hide_target: tuple[int, int] | None = None
+    time_limit_steps: int | None = Field(default=None, ge=1)
+
+
 @dataclass(frozen=True)
 class CurriculumStage:
     name: str
@@ -72,7 +106,7 @@ class Mode:
     def info(self) -> dict[str, Any]:
         if not self.state:
             return {"name": self.name}
-        return self.state.model_dump()
+        return self.state.to_dict()
 
 
 @dataclass
@@ -104,21 +138,15 @@ class ExitGame(Mode):
         if atlas_tile == TileType.FLAG and not world.atlas_has_flag:
             world.atlas_has_flag = True
             reward += 1.0
-            for y in range(world.tiles.shape[0]):
-                for x in range(world.tiles.shape[1]):
-                    if world.tiles[y, x] == TileType.DOOR_CLOSED:
-                        world.tiles[y, x] = TileType.DOOR_OPEN
+            for pos in world.tiles_of(TileType.DOOR_CLOSED):
+                world.set_tile(pos, TileType.DOOR_OPEN)
 
         if world.tile_at(world.atlas.pos) == TileType.GOAL:
             reward += 10.0
             done = True
         if self.state and isinstance(self.state, ExitGameState):
             self.state.key_collected = world.atlas_has_flag
-            self.state.door_open = any(
-                world.tiles[y, x] == TileType.DOOR_OPEN
-                for y in range(world.tiles.shape[0])
-                for x in range(world.tiles.shape[1])
-            )
+            self.state.door_open = world.has_tile(TileType.DOOR_OPEN)
             self.state.goal_reached = done
             self.state.done = done
             if done:
@@ -137,6 +165,8 @@ class HideAndSeek(Mode):
     name: str = "HideAndSeek"
     hide_target: tuple[int, int] | None = None
     time_limit_steps: int | None = None
+    # Manhattan distance shaping; GridEnv turns it off when BFS goal shaping is on for this mode.
+    distance_shaping: bool = True
     _prev_distance: int | None = None
     _steps_elapsed: int = 0
 
@@ -165,7 +195,7 @@ class HideAndSeek(Mode):
         if self.hide_target:
             atlas_x, atlas_y = world.atlas.pos.as_int()
             curr_distance = abs(atlas_x - self.hide_target[0]) + abs(atlas_y - self.hide_target[1])
-            if self._prev_distance is not None and curr_distance != self._prev_distance:
+            if self.distance_shaping and self._prev_distance is not None and curr_distance != self._prev_distance:
                 reward += 0.1 * float(self._prev_distance - curr_distance)
             self._prev_distance = curr_distance
 
@@ -199,7 +229,7 @@ class CaptureTheFlag(Mode):
     name: str = "CaptureTheFlag"
 
     def reset(self, world, rng: RNG) -> ModeState:
-        flag_positions = rules.find_tiles(world.tiles, TileType.FLAG)
+        flag_positions = rules.find_tiles(world, TileType.FLAG)
         score_zone = (2, world.tiles.shape[0] - 2)
         self.state = CaptureTheFlagState(
             name=self.name,
@@ -264,6 +294,27 @@ MODE_REGISTRY = {
 }
 
 
+MODE_PARAMS: dict[str, type[ModeParams]] = {
+    "FreeExplore": ModeParams,
+    "ExitGame": ModeParams,
+    "HideAndSeek": HideAndSeekParams,
+    "CaptureTheFlag": ModeParams,
+    "TrainingArena": ModeParams,
+}
+
+
+def validate_mode_params(name: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Check user-supplied mode params; returns them normalised (e.g. lists -> tuples)."""
+
+    if name not in MODE_PARAMS:
+        raise ValueError(f"Unknown mode: {name} (available: {', '.join(MODE_REGISTRY)})")
+    try:
+        validated = MODE_PARAMS[name].model_validate(params or {})
+    except ValidationError as exc:
+        raise ValueError(f"Invalid params for {name}: {exc.errors()[0]['msg']} ({exc.errors()[0]['loc']})") from exc
+    return validated.model_dump(exclude_unset=True)
+
+
 def create_mode(name: str, params: dict[str, Any] | None = None) -> Mode:
     params = params or {}
     mode_cls = MODE_REGISTRY.get(name, FreeExplore)
@@ -0,0 +1,298 @@
+"""N Atlas agents in one world behind a PettingZoo-style parallel API, with batched observations."""
+from __future__ import annotations
+
+from typing import Any
+
+import gymnasium as gym
+import numpy as np
+
+from src.config import AtlasConfig
+from src.core.events import Event
+from src.core.types import Character, TileType, Vec2
+from src.env import encoding, rules
+from src.env.exploration import ExplorationMemory
+from src.env.grid_env import GridEnv, _apply_vertical_motion, apply_agent_action
+from src.env.items import can_carry
+from src.env.physics import GATE_REQ, PASSABLE, STANDABLE
+from src.env.rewards import compute_reward
+from src.env.tools import (
+    DEFAULT_TOOL_SAFETY_CONFIG,
+    TOOL_ACTION_IDS,
+    ToolSafetyTracker,
+    tool_safety_commit,
+    tool_safety_precheck,
+)
+
+BREAKABLE_CODE = encoding.TILE_CODES[TileType.BREAKABLE_WALL]
+_CODE_IDENTITY = np.arange(len(encoding.TILE_CODES), dtype=np.int32)
+# Facing.value -> (dx, dy), in the order of ``Facing``.
+_FACING_DELTAS = {"N": (0, -1), "E": (1, 0), "S": (0, 1), "W": (-1, 0)}
+
+
+def _trunc(values: np.ndarray) -> np.ndarray:
+    return np.trunc(values).astype(np.int64)
+
+
+def _lookup(table: np.ndarray, codes: np.ndarray, ix: np.ndarray, iy: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """``(table[code], in_bounds)`` per cell; off-grid cells read as 0/False."""
+
+    height, width = codes.shape
+    inside = (ix >= 0) & (ix < width) & (iy >= 0) & (iy < height)
+    values = np.zeros(ix.shape, dtype=table.dtype)
+    values[inside] = table[codes[iy[inside], ix[inside]]]
+    return values, inside
+
+
+def batch_action_masks(
+    world,
+    actors: list[Character],
+    trackers: list[ToolSafetyTracker] | None = None,
+    tick: int = 0,
+    strict_safety: bool = False,
+) -> np.ndarray:
+    """``encoding.action_mask_for`` for every actor in one pass over the tile-code grid; ``(N, ACTION_COUNT)``."""
+
+    count = len(actors)
+    codes = world.tile_codes()
+    x = np.fromiter((actor.pos.x for actor in actors), dtype=np.float64, count=count)
+    y = np.fromiter((actor.pos.y for actor in actors), dtype=np.float64, count=count)
+    level = np.fromiter((actor.level for actor in actors), dtype=np.int64, count=count)
+    can_fly = np.fromiter((actor.can_fly for actor in actors), dtype=bool, count=count)
+    grounded = np.fromiter((actor.grounded for actor in actors), dtype=bool, count=count)
+    cooldown = np.fromiter((actor.jump_cooldown for actor in actors), dtype=np.int64, count=count)
+    facing = np.array([_FACING_DELTAS[actor.facing.value] for actor in actors], dtype=np.float64).reshape(count, 2)
+    cell_x, cell_y = _trunc(x), _trunc(y)
+
+    mask = np.ones((count, encoding.ACTION_COUNT), dtype=bool)
+    for action, (dx, dy) in zip((1, 2, 3, 4), ((0, -1), (1, 0), (0, 1), (-1, 0))):
+        tx, ty = _trunc(x + dx), _trunc(y + dy)
+        passable, inside = _lookup(PASSABLE, codes, tx, ty)
+        gate, _ = _lookup(GATE_REQ, codes, tx, ty)
+        ok = inside & (passable | ((gate > 0) & (level >= gate)))
+        mask[:, action] = ok & can_fly if dy else ok
+    standable, _ = _lookup(STANDABLE, codes, cell_x, _trunc(y + 1))
+    mask[:, 5] = (cooldown <= 0) & (can_fly | (standable & grounded))
+
+    holding = np.fromiter((actor.hand_item is not None for actor in actors), dtype=bool, count=count)
+    if world.items:
+        for row, actor in enumerate(actors):
+            mask[row, 6] = can_carry(actor) and bool(world.items_adjacent(actor.pos.as_int()))
+    else:
+        mask[:, 6] = False
+    mask[:, 7] = holding
+
+    tx, ty = _trunc(x + facing[:, 0]), _trunc(y + facing[:, 1])
+    target_codes, inside = _lookup(_CODE_IDENTITY, codes, tx, ty)
+    reachable = inside & (np.abs(cell_x - tx) + np.abs(cell_y - ty) == 1)
+    mask[:, 8] = reachable & holding
+    mask[:, 9] = reachable
+    mask[:, 10] = reachable & (target_codes == BREAKABLE_CODE)
+    mask[:, 11] = reachable
+
+    if trackers is not None:
+        for row, tracker in enumerate(trackers):
+            for action_id in TOOL_ACTION_IDS:
+                if action_id < encoding.ACTION_COUNT and mask[row, action_id]:
+                    mask[row, action_id] = tool_safety_precheck(
+                        action_id, tick=tick, tracker=tracker, strict_safety=strict_safety
+                    ).ok
+    return mask
+
+
+def batch_local_tiles(world, actors: list[Character], radius: int) -> np.ndarray:
+    """``(N, 2r+1, 2r+1)`` tile codes around each actor, 0 outside the world (as ``GridEnv._obs``)."""
+
+    codes = world.tile_codes()
+    offsets = np.arange(-radius, radius + 1, dtype=np.float64)
+    x = np.array([actor.pos.x for actor in actors], dtype=np.float64)
+    y = np.array([actor.pos.y for actor in actors], dtype=np.float64)
+    gx = _trunc(x[:, None] + offsets[None, :])[:, None, :]
+    gy = _trunc(y[:, None] + offsets[None, :])[:, :, None]
+    gx, gy = np.broadcast_arrays(gx, gy)
+    tiles, _inside = _lookup(_CODE_IDENTITY, codes, gx, gy)
+    return tiles
+
+
+class MultiAgentGridEnv:
+    """``n_agents`` Atlas agents sharing one ``GridEnv`` world (PettingZoo ``ParallelEnv`` API).
+
+    Agent ``ai_atlas`` is the world's lead Atlas, so modes (which evaluate
+    ``world.atlas``) work unchanged; their reward is shared by the whole team,
+    while tool progress, step cost and safety penalties are per agent.
+    Observations and action masks are computed for all agents in one batched
+    pass; each agent's dict holds views into the stacked arrays. Teammates show
+    up in ``local_entities`` like any other nearby entity.
+
+    An agent brought to 0 HP is terminated (and leaves ``agents``); as modes are
+    judged on the lead Atlas, its defeat terminates the whole team.
+    """
+
+    metadata = {"name": "atlas_multi_agent_v0", "render_modes": ["rgb_array"]}
+
+    def __init__(
+        self,
+        config: AtlasConfig,
+        n_agents: int = 4,
+        preset: str = "floating_islands",
+        seed: int | None = None,
+        mode: str = "ExitGame",
+        mode_params: dict | None = None,
+        strict_safety: bool = False,
+        render_mode: str | None = None,
+    ) -> None:
+        if n_agents < 1:
+            raise ValueError("n_agents must be at least 1")
+        self.base = GridEnv(config, preset=preset, seed=seed, strict_safety=strict_safety, render_mode=render_mode)
+        self.base.set_mode(mode, mode_params)
+        self.config = config
+        self.render_mode = render_mode
+        self.possible_agents = ["ai_atlas", *[f"atlas_{idx}" for idx in range(1, n_agents)]]
+        self.agents: list[str] = []
+        self.trackers: dict[str, ToolSafetyTracker] = {}
+        self.memories: dict[str, ExplorationMemory] = {}
+        self._steps = 0
+        self._observation_space = self.base.observation_space
+        self._action_space = gym.spaces.Discrete(encoding.ACTION_COUNT)
+
+    @property
+    def world(self):
+        return self.base.world
+
+    def observation_space(self, agent: str) -> gym.spaces.Space:
+        return self._observation_space
+
+    def action_space(self, agent: str) -> gym.spaces.Space:
+        return self._action_space
+
+    def _spawn_agents(self) -> None:
+        world = self.world
+        spawn = world.atlas.pos.as_int()
+        taken = {spawn, world.human.pos.as_int()}
+        free = sorted(
+            (cell for cell in world.tiles_of(TileType.EMPTY) if cell not in taken),
+            key=lambda cell: (abs(cell[0] - spawn[0]) + abs(cell[1] - spawn[1]), cell[1], cell[0]),
+        )
+        world.agents = {}
+        for agent_id, cell in zip(self.possible_agents[1:], free):
+            actor = Character(entity_id=agent_id, display_name=agent_id, pos=Vec2(float(cell[0]), float(cell[1])))
+            actor.grounded = world.can_stand_on((cell[0], cell[1] + 1))
+            world.agents[agent_id] = actor
+        if len(world.agents) < len(self.possible_agents) - 1:
+            raise RuntimeError(f"World has room for only {len(world.agents) + 1} agents")
+
+    def _actors(self) -> list[Character]:
+        return [self.world.get_actor(agent) for agent in self.agents]
+
+    def observe_batch(self) -> dict[str, np.ndarray]:
+        """Stacked observations ``(N, ...)`` for ``self.agents`` in one pass."""
+
+        actors = self._actors()
+        count = len(actors)
+        world = self.world
+        radius = self.config.world.visibility_radius
+        entities = self.base.entity_encoder.encode_batch(world, actors)
+        stats = np.array([[actor.hp, actor.level, actor.exp, actor.speed] for actor in actors], dtype=np.float32).reshape(count, 4)
+        masks = batch_action_masks(
+            world,
+            actors,
+            [self.trackers[agent] for agent in self.agents],
+            tick=self._steps,
+            strict_safety=self.base.strict_safety,
+        )
+        return {
+            "local_tiles": batch_local_tiles(world, actors, radius),
+            "local_entities": entities,
+            "hand_item": np.stack([encoding.encode_hand_item(actor.hand_item) for actor in actors]).reshape(count, 4),
+            "stats": stats,
+            "mode_features": np.tile(np.array([1.0, 0.0], dtype=np.float32), (count, 1)),
+            "action_mask": masks.astype(np.int8),
+            "memory_hint": np.stack([self.memories[agent].hint(world, actor.pos.as_int()) for agent, actor in zip(self.agents, actors)]).reshape(count, 4),
+        }
+
+    def _split(self, batch: dict[str, np.ndarray]) -> dict[str, dict[str, np.ndarray]]:
+        return {agent: {key: value[row] for key, value in batch.items()} for row, agent in enumerate(self.agents)}
+
+    def reset(self, seed: int | None = None, options: dict | None = None) -> tuple[dict, dict]:
+        self.base.reset(seed=seed, options=options)
+        self.agents = list(self.possible_agents)
+        self._spawn_agents()
+        self.trackers = {agent: ToolSafetyTracker(recent_tool_ticks=[], cooldown_until={}) for agent in self.agents}
+        # The lead agent shares the base env's memory, so its observation matches ``GridEnv._obs``.
+        self.memories = {agent: ExplorationMemory.for_world(self.world) for agent in self.agents[1:]}
+        self.memories[self.agents[0]] = self.base.exploration
+        for agent in self.agents[1:]:
+            self.memories[agent].observe(self.world.get_actor(agent).pos.as_int(), self.config.world.visibility_radius)
+        self._steps = 0
+        return self._split(self.observe_batch()), {agent: {} for agent in self.agents}
+
+    def step(self, actions: dict[str, int]) -> tuple[dict, dict, dict, dict, dict]:
+        world = self.world
+        agent_events: dict[str, list[Event]] = {}
+        prev_positions = {agent: world.get_actor(agent).pos.as_int() for agent in self.agents}
+        penalties: dict[str, float] = {}
+        rejections: dict[str, str | None] = {}
+        for agent in self.agents:
+            actor = world.get_actor(agent)
+            action = int(actions.get(agent, 0))
+            safety = tool_safety_precheck(
+                action, tick=self._steps, tracker=self.trackers[agent], strict_safety=self.base.strict_safety
+            )
+            rejections[agent] = safety.error_code
+            if safety.ok:
+                agent_events[agent] = apply_agent_action(world, actor, action)
+                tool_safety_commit(action, tick=self._steps, tracker=self.trackers[agent], config=DEFAULT_TOOL_SAFETY_CONFIG)
+                penalties[agent] = 0.0
+            else:
+                agent_events[agent] = []
+                penalties[agent] = -0.05
+
+        for actor in [world.human, *self._actors()]:
+            _apply_vertical_motion(world, actor)
+            rules.tick_transform(actor)
+            rules.tick_fly(actor)
+
+        enemy_events = world.step_enemies()
+        for event in enemy_events:
+            if event.payload.get("actor_id") in agent_events:
+                agent_events[event.payload["actor_id"]].append(event)
+        all_events = [event for events in agent_events.values() for event in events]
+        all_events += [event for event in enemy_events if event.payload.get("actor_id") not in agent_events]
+        radius = self.config.world.visibility_radius
+        for agent in self.agents:
+            discovered = self.memories[agent].observe(world.get_actor(agent).pos.as_int(), radius)
+            if discovered:
+                agent_events[agent].append(Event("cells_discovered", {"count": discovered}))
+        mode_reward, mode_events, done, mode_info = self.base.mode.step(world, all_events, self.base.rng)
+        exp_gain = rules.objective_exp_from(mode_reward, all_events + mode_events)
+        self._steps += 1
+        self.base._steps = self._steps
+        truncated = self._steps >= self.config.world.max_episode_steps
+
+        rewards: dict[str, float] = {}
+        infos: dict[str, dict[str, Any]] = {}
+        for agent in self.agents:
+            shaping = self.base.goal_shaping(world.get_actor(agent), prev_positions[agent], mode_info, done)
+            reward, terms = compute_reward(mode_reward, agent_events[agent] + mode_events, shaping=shaping, actor_id=agent)
+            if penalties[agent]:
+                reward += penalties[agent]
+                terms["safety_penalty"] = penalties[agent]
+            if exp_gain > 0:
+                rules.grant_exp(world.get_actor(agent), exp_gain)
+            rewards[agent] = float(reward)
+            infos[agent] = {"reward_terms": terms, "tool_rejection_code": rejections[agent], "mode": mode_info}
+
+        observations = self._split(self.observe_batch())
+        done = done or rules.is_defeated(world.atlas)
+        terminations = {agent: bool(done or rules.is_defeated(world.get_actor(agent))) for agent in self.agents}
+        truncations = {agent: bool(truncated and not terminations[agent]) for agent in self.agents}
+        if done or truncated:
+            self.agents = []
+        else:
+            self.agents = [agent for agent in self.agents if not terminations[agent]]
+        return observations, rewards, terminations, truncations, infos
+
+    def render(self):
+        return self.base.render()
+
+    def close(self) -> None:
+        self.agents = []
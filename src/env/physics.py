@@ -0,0 +1,134 @@
+"""Per-property tile lookup tables, plus an experimental array kernel for vertical motion.
+
+The lookup tables (``PASSABLE``, ``STANDABLE``, ...) are used across the env. The
+kernel (``vertical_motion``/``apply_vertical_motion_batch``) has no production
+callers: ``GridEnv`` and ``MultiAgentGridEnv`` move actors with the scalar
+``grid_env._apply_vertical_motion``, which is cheaper while actors live on
+``Character`` objects and must be copied in and out of an ``ActorTable`` each
+tick. It is kept, with its differential tests, for when the table becomes the
+source of truth. Do not call it from per-step code before a benchmark shows a win.
+"""
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from src.core.actor_table import ActorTable
+from src.core.types import TILE_PROPS, TileType
+from src.env import rules
+from src.env.encoding import TILE_CODES
+
+# Per-property lookup tables indexed by tile code.
+SOLID = np.array([TILE_PROPS[tile].solid for tile in TileType], dtype=bool)
+ONE_WAY = np.array([TILE_PROPS[tile].one_way_platform for tile in TileType], dtype=bool)
+STANDABLE = SOLID | ONE_WAY
+PASSABLE = np.array([TILE_PROPS[tile].passable for tile in TileType], dtype=bool)
+GATE_REQ = np.array([TILE_PROPS[tile].gate_req_level for tile in TileType], dtype=np.int32)
+
+assert list(TILE_CODES.values()) == list(range(len(TileType)))
+
+# ActorTable columns the kernel reads or writes.
+MOTION_COLUMNS = ("x", "y", "vel_y", "jump_remaining", "jump_cooldown", "can_fly", "grounded")
+# ... and the subset it writes, which is all ``store`` has to copy back.
+MOTION_WRITES = ("y", "vel_y", "jump_remaining", "jump_cooldown", "grounded")
+
+
+def _trunc(values: np.ndarray) -> np.ndarray:
+    # ``int()`` semantics (towards zero), as the scalar path uses.
+    return np.trunc(values).astype(np.int64)
+
+
+def vertical_motion(
+    codes: np.ndarray,
+    actors: ActorTable,
+    passer_level: np.ndarray,
+    world_index: np.ndarray | None = None,
+) -> None:
+    """One tick of ``grid_env._apply_vertical_motion`` for every row of ``actors``, in place.
+
+    ``codes`` is a ``(H, W)`` tile-code grid or a ``(B, H, W)`` stack for vectorized
+    worlds, with ``world_index`` giving each actor's world. ``passer_level`` is the
+    level used for gate checks while jumping; the scalar path checks the Atlas
+    level for every actor, so callers pass that to stay equivalent.
+
+    Branches are expressed as masked ``np.copyto``/``np.where`` over whole
+    columns rather than boolean-indexed writes: at the handful of actors a
+    world holds, the per-call NumPy overhead is the whole cost.
+    """
+
+    height, width = codes.shape[-2:]
+    x, y, vel_y = actors["x"], actors["y"], actors["vel_y"]
+    jump_remaining, grounded, can_fly = actors["jump_remaining"], actors["grounded"], actors["can_fly"]
+    actors.tick_cooldowns()
+
+    flat = codes.reshape(-1)
+    ix = _trunc(x)
+    # Flat offset of each actor's column in its world; rows are added per lookup.
+    column = np.minimum(np.maximum(ix, 0), width - 1)
+    if world_index is not None:
+        column += np.asarray(world_index, dtype=np.int64) * (height * width)
+    x_inside = (ix >= 0) & (ix < width)
+
+    def lookup(table: np.ndarray, iy: np.ndarray) -> np.ndarray:
+        # ``table[code]`` under each actor at row ``iy``; off-grid cells read as ``False``/0.
+        row = np.minimum(np.maximum(iy, 0), height - 1)
+        row *= width
+        row += column
+        values = table[flat[row]]
+        values *= x_inside & (iy >= 0) & (iy < height)
+        return values
+
+    flying = can_fly.copy()
+    if flying.any():
+        np.copyto(jump_remaining, 0, where=flying)
+        np.copyto(vel_y, 0.0, where=flying)
+        np.copyto(grounded, False, where=flying)
+
+    jumping = ~flying & (jump_remaining > 0)
+    if jumping.any():
+        next_y = y - 1
+        target_y = _trunc(next_y)
+        gate = lookup(GATE_REQ, target_y)
+        # Off-grid cells read as impassable, matching ``World.is_passable``.
+        passable = lookup(PASSABLE, target_y) | ((gate > 0) & (passer_level >= gate))
+        rises = jumping & passable
+        np.copyto(y, next_y, where=rises)
+        jump_remaining -= rises
+        np.copyto(jump_remaining, 0, where=jumping & ~passable)
+        np.copyto(vel_y, np.minimum(vel_y + rules.GRAVITY, rules.MAX_FALL_SPEED), where=jumping)
+        np.copyto(grounded, False, where=jumping)
+
+    falling = ~flying & ~jumping
+    if not falling.any():
+        return
+    can_stand = lookup(STANDABLE, _trunc(y + 1))
+    np.copyto(vel_y, np.where(can_stand, 0.0, np.minimum(vel_y + rules.GRAVITY, rules.MAX_FALL_SPEED)), where=falling)
+
+    next_y = y + vel_y * 0.1
+    target_y = _trunc(next_y)
+    lands = falling & (vel_y > 0) & lookup(STANDABLE, target_y) & (_trunc(y) < target_y)
+    moving = falling & ~lands
+    np.copyto(y, np.where(lands, target_y - 1.0, next_y), where=falling)
+    np.copyto(vel_y, 0.0, where=lands)
+    np.copyto(grounded, True, where=lands)
+
+    standing = lookup(STANDABLE, _trunc(y + 1)) & (vel_y >= 0)
+    np.copyto(grounded, standing, where=moving)
+    np.copyto(vel_y, 0.0, where=moving & standing)
+
+
+def apply_vertical_motion_batch(world, actors: Sequence, table: ActorTable | None = None) -> ActorTable:
+    """Run ``vertical_motion`` for ``actors`` of one ``World`` and write the results back (experimental).
+
+    Pass the returned ``table`` in again to avoid re-allocating columns every tick.
+    """
+
+    if table is None or table.ids != [ActorTable._actor_id(actor) for actor in actors]:
+        table = ActorTable.from_actors(actors)
+    else:
+        table.load(actors, MOTION_COLUMNS)
+    passer_level = np.full(len(table), world.atlas.level, dtype=np.int32)
+    vertical_motion(world.tile_codes(), table, passer_level)
+    table.store(actors, MOTION_WRITES)
+    return table
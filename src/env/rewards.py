@@ -4,26 +4,39 @@ from src.core.events import Event
 
 RewardBreakdown = dict[str, float]
 
+# Charged when the rewarded actor is brought to 0 HP (``actor_defeated``); that also ends its episode.
+DEATH_PENALTY = 5.0
+
+# Per cell first seen this step (``cells_discovered`` events from the exploration memory).
+EXPLORE_BONUS_PER_CELL = 0.005
+
 
 def compute_reward(
     mode_reward: float,
     events: list[Event],
     step_cost: float = 0.01,
     preference_reward: float = 0.0,
+    shaping: float = 0.0,
+    actor_id: str = "ai_atlas",
 ) -> tuple[float, RewardBreakdown]:
     progress_reward = 0.0
     exploration_reward = 0.0
-    shaping = 0.0
+    death = 0.0
     for event in events:
         if event.type == "tile_broken":
             progress_reward += 0.1
-    total = mode_reward + progress_reward + exploration_reward + shaping + preference_reward - step_cost
+        elif event.type == "cells_discovered":
+            exploration_reward += EXPLORE_BONUS_PER_CELL * int(event.payload["count"])
+        elif event.type == "actor_defeated" and event.payload.get("actor_id") == actor_id:
+            death -= DEATH_PENALTY
+    total = mode_reward + progress_reward + exploration_reward + shaping + preference_reward + death - step_cost
     breakdown = {
         "mode": mode_reward,
         "progress": progress_reward,
         "explore": exploration_reward,
         "preference": preference_reward,
         "shaping": shaping,
+        "death": death,
         "step_cost": step_cost,
         "total": total,
     }
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from src.core.types import TILE_PROPS, Character, Vec2
+import numpy as np
+
+from src.core.types import TILE_PROPS, Character
 
 
 GRAVITY = 0.2
@@ -23,7 +25,7 @@ def apply_gravity(character: Character, can_stand: bool) -> None:
 
 
 def move_character(character: Character, dx: float, dy: float) -> None:
-    character.pos = Vec2(character.pos.x + dx, character.pos.y + dy)
+    character.pos.add(dx, dy)
 
 
 def is_passable(tile) -> bool:
@@ -60,7 +62,13 @@ def objective_exp_from(mode_reward: float, events: list) -> int:
         "ctf_scored": 12,
         "hide_target_found": 8,
     }
-    total = sum(event_exp.get(getattr(event, "type", ""), 0) for event in events)
+    total = 0
+    for event in events:
+        event_type = getattr(event, "type", "")
+        if event_type == "enemy_defeated" and "exp_value" in event.payload:
+            total += int(event.payload["exp_value"])
+        else:
+            total += event_exp.get(event_type, 0)
     if mode_reward >= 5.0:
         total += 6
     return total
@@ -119,24 +127,40 @@ def tick_transform(actor: Character) -> bool:
     return True
 
 
+def combat_damage(atk: int, defense: int) -> int:
+    return max(1, int(atk) - int(defense))
+
+
+def is_defeated(actor: Character) -> bool:
+    """Actors at 0 HP are out: their actions and commands are ignored and enemies stop targeting them."""
+
+    return actor.hp <= 0
+
+
 def is_adjacent(a: tuple[int, int], b: tuple[int, int]) -> bool:
     return abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1
 
 
-def find_item_by_id(items: list, item_id: str):
+def find_item_by_id(items, item_id: str):
+    """Item with ``item_id``; ``items`` is a ``World`` (O(1) via its item index) or a list."""
+
+    if hasattr(items, "item_by_id"):
+        return items.item_by_id(item_id)
     for item in items:
         if getattr(item, "item_id", None) == item_id:
             return item
     return None
 
 
-def find_tiles(tiles, tile_type) -> list[tuple[int, int]]:
-    positions: list[tuple[int, int]] = []
-    for y in range(tiles.shape[0]):
-        for x in range(tiles.shape[1]):
-            if tiles[y, x] == tile_type:
-                positions.append((x, y))
-    return positions
+def find_tiles(source, tile_type) -> list[tuple[int, int]]:
+    """Cells holding ``tile_type`` in row-major order; ``source`` is a ``World`` (uses its tile index) or a tile grid."""
+
+    if hasattr(source, "tiles_of"):
+        return source.tiles_of(tile_type)
+    # Wrap the enum in a 0-d object array so NumPy compares members rather than coercing them to strings.
+    target = np.empty((), dtype=object)
+    target[()] = tile_type
+    return [(int(x), int(y)) for y, x in np.argwhere(source == target)]
 
 
 def grant_fly(actor: Character, *, duration_ticks: int | None = None, permanent: bool = False) -> dict[str, int | bool]:
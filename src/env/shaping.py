@@ -0,0 +1,166 @@
+"""Potential-based reward shaping from cached BFS distance maps to the active subgoal."""
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+import numpy as np
+
+from src.core.types import TileType
+from src.env.physics import PASSABLE
+
+UNREACHABLE = -1
+
+# GoalManager subgoals whose targets are tiles of the world ...
+SUBGOAL_TILES: dict[str, tuple[TileType, ...]] = {
+    "find_key": (TileType.FLAG,),
+    "go_door": (TileType.DOOR_CLOSED, TileType.DOOR_OPEN),
+    "go_goal": (TileType.GOAL,),
+}
+# ... and those whose target is a cell in the mode info.
+SUBGOAL_INFO_KEYS: dict[str, str] = {
+    "find_flag": "flag_pos",
+    "return_flag": "score_zone",
+    "score": "score_zone",
+    "find_hide_target": "hide_target",
+}
+
+
+def distance_map(passable: np.ndarray, targets: Iterable[tuple[int, int]]) -> np.ndarray:
+    """``int32`` grid of 4-neighbour step counts to the nearest target; ``UNREACHABLE`` where there is no path.
+
+    Targets are seeded even if they are not passable themselves (a closed
+    door), and the wavefront then only spreads through passable cells.
+    """
+
+    height, width = passable.shape
+    dist = np.full((height, width), UNREACHABLE, dtype=np.int32)
+    front = np.zeros((height, width), dtype=bool)
+    for x, y in targets:
+        if 0 <= x < width and 0 <= y < height:
+            front[y, x] = True
+    step = 0
+    while front.any():
+        dist[front] = step
+        grown = np.zeros_like(front)
+        grown[1:, :] |= front[:-1, :]
+        grown[:-1, :] |= front[1:, :]
+        grown[:, 1:] |= front[:, :-1]
+        grown[:, :-1] |= front[:, 1:]
+        front = grown & passable & (dist == UNREACHABLE)
+        step += 1
+    return dist
+
+
+def subgoal_targets(subgoal: str, world, mode_info: dict[str, Any] | None = None) -> tuple[tuple[int, int], ...]:
+    """Target cells for a ``GoalManager`` subgoal; empty for subgoals without a place (``explore``)."""
+
+    tiles = SUBGOAL_TILES.get(subgoal)
+    if tiles is not None:
+        for tile in tiles:
+            cells = world.tiles_of(tile)
+            if cells:
+                return tuple(cells)
+        return ()
+    key = SUBGOAL_INFO_KEYS.get(subgoal)
+    cell = (mode_info or {}).get(key) if key else None
+    if cell is None:
+        return ()
+    return ((int(cell[0]), int(cell[1])),)
+
+
+class DistanceMaps:
+    """BFS distance maps keyed on their target cells, dropped as soon as the tiles change.
+
+    The cache is bound to one tile grid and ``world.tile_version``; a new grid
+    (reset, world switch) or any ``set_tile`` flushes it, so maps are only
+    rebuilt after a door opens or a wall breaks, never per step.
+    """
+
+    __slots__ = ("max_maps", "builds", "_maps", "_tiles", "_version")
+
+    def __init__(self, max_maps: int = 8) -> None:
+        self.max_maps = int(max_maps)
+        self.builds = 0
+        self._maps: dict[tuple[tuple[int, int], ...], np.ndarray] = {}
+        self._tiles: np.ndarray | None = None
+        self._version = -1
+
+    def clear(self) -> None:
+        self._maps.clear()
+        self._tiles = None
+        self._version = -1
+
+    def get(self, world, targets: tuple[tuple[int, int], ...]) -> np.ndarray:
+        if world.tiles is not self._tiles or world.tile_version != self._version:
+            self._maps.clear()
+            self._tiles = world.tiles
+            self._version = world.tile_version
+        dist = self._maps.get(targets)
+        if dist is None:
+            if len(self._maps) >= self.max_maps:
+                self._maps.pop(next(iter(self._maps)))
+            dist = self._maps[targets] = distance_map(PASSABLE[world.tile_codes()], targets)
+            self.builds += 1
+        return dist
+
+
+class GoalShaper:
+    """``F = gamma * phi(s') - phi(s)`` with ``phi = -scale * distance`` to the subgoal active in that state.
+
+    ``phi(s)`` is the potential cached from the previous step (per actor ``key``),
+    computed under the subgoal and tiles of that step, so a subgoal switch or a
+    door opening changes the potential like any other state change and the
+    shaping return telescopes. Terminal states, subgoals without a place and
+    positions with no path to the target have potential 0.
+    """
+
+    __slots__ = ("scale", "gamma", "maps", "_last")
+
+    def __init__(self, scale: float = 0.1, gamma: float = 0.99) -> None:
+        self.scale = float(scale)
+        self.gamma = float(gamma)
+        self.maps = DistanceMaps()
+        # key -> (position, potential) of the last state shaped for that actor.
+        self._last: dict[str, tuple[tuple[int, int], float]] = {}
+
+    @classmethod
+    def from_config(cls, config) -> GoalShaper:
+        return cls(config.shaping.scale, config.training.gamma)
+
+    def reset(self) -> None:
+        self.maps.clear()
+        self._last.clear()
+
+    def distance(self, world, targets: tuple[tuple[int, int], ...], pos: tuple[int, int]) -> int:
+        x, y = pos
+        height, width = world.tiles.shape
+        if not targets or not (0 <= x < width and 0 <= y < height):
+            return UNREACHABLE
+        return int(self.maps.get(world, targets)[y, x])
+
+    def potential(self, world, subgoal: str, mode_info: dict[str, Any] | None, pos: tuple[int, int]) -> float:
+        dist = self.distance(world, subgoal_targets(subgoal, world, mode_info), pos)
+        return 0.0 if dist == UNREACHABLE else -self.scale * dist
+
+    def shape(
+        self,
+        world,
+        subgoal: str,
+        mode_info: dict[str, Any] | None,
+        prev_pos: tuple[int, int],
+        pos: tuple[int, int],
+        done: bool = False,
+        key: str = "",
+    ) -> float:
+        last = self._last.get(key)
+        if last is not None and last[0] == prev_pos:
+            before = last[1]
+        else:
+            # First step after a reset (or the actor was moved between steps).
+            before = self.potential(world, subgoal, mode_info, prev_pos)
+        if done:
+            self._last.pop(key, None)
+            return -before
+        after = self.potential(world, subgoal, mode_info, pos)
+        self._last[key] = (pos, after)
+        return self.gamma * after - before
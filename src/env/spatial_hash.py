@@ -0,0 +1,96 @@
+"""Uniform-grid spatial hash for proximity queries over moving entities."""
+from __future__ import annotations
+
+from typing import Hashable, Iterator
+
+
+class SpatialHash:
+    """Buckets entity keys by ``(x // cell_size, y // cell_size)``.
+
+    ``insert``/``move``/``remove`` are O(1); ``query`` visits only the buckets
+    overlapping the query square, so proximity lookups cost O(entities nearby)
+    rather than O(all entities). ``at`` answers "who is on this grid cell".
+    """
+
+    __slots__ = ("cell_size", "_buckets", "_cells", "_positions")
+
+    def __init__(self, cell_size: int = 4) -> None:
+        if cell_size < 1:
+            raise ValueError("cell_size must be at least 1")
+        self.cell_size = int(cell_size)
+        self._buckets: dict[tuple[int, int], set[Hashable]] = {}
+        self._cells: dict[tuple[int, int], set[Hashable]] = {}
+        self._positions: dict[Hashable, tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._positions
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._positions)
+
+    def _bucket(self, pos: tuple[int, int]) -> tuple[int, int]:
+        return pos[0] // self.cell_size, pos[1] // self.cell_size
+
+    def position(self, key: Hashable) -> tuple[int, int]:
+        return self._positions[key]
+
+    def insert(self, key: Hashable, pos: tuple[int, int]) -> None:
+        if key in self._positions:
+            raise ValueError(f"Key already indexed: {key}")
+        self._positions[key] = pos
+        self._buckets.setdefault(self._bucket(pos), set()).add(key)
+        self._cells.setdefault(pos, set()).add(key)
+
+    def remove(self, key: Hashable) -> None:
+        pos = self._positions.pop(key)
+        self._discard(self._buckets, self._bucket(pos), key)
+        self._discard(self._cells, pos, key)
+
+    def move(self, key: Hashable, pos: tuple[int, int]) -> None:
+        old = self._positions[key]
+        if old == pos:
+            return
+        self._positions[key] = pos
+        self._discard(self._cells, old, key)
+        self._cells.setdefault(pos, set()).add(key)
+        old_bucket, new_bucket = self._bucket(old), self._bucket(pos)
+        if old_bucket != new_bucket:
+            self._discard(self._buckets, old_bucket, key)
+            self._buckets.setdefault(new_bucket, set()).add(key)
+
+    @staticmethod
+    def _discard(index: dict[tuple[int, int], set[Hashable]], slot: tuple[int, int], key: Hashable) -> None:
+        keys = index.get(slot)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del index[slot]
+
+    def at(self, pos: tuple[int, int]) -> set[Hashable]:
+        return self._cells.get(pos, set())
+
+    def query(self, pos: tuple[int, int], radius: int) -> list[Hashable]:
+        """Keys within Chebyshev distance ``radius`` of ``pos``."""
+
+        x, y = pos
+        min_bx, min_by = self._bucket((x - radius, y - radius))
+        max_bx, max_by = self._bucket((x + radius, y + radius))
+        found: list[Hashable] = []
+        for by in range(min_by, max_by + 1):
+            for bx in range(min_bx, max_bx + 1):
+                for key in self._buckets.get((bx, by), ()):
+                    kx, ky = self._positions[key]
+                    if abs(kx - x) <= radius and abs(ky - y) <= radius:
+                        found.append(key)
+        return found
+
+    def nearest(self, pos: tuple[int, int], k: int, radius: int) -> list[Hashable]:
+        """Up to ``k`` keys within ``radius``, closest (Manhattan, then key) first."""
+
+        x, y = pos
+        keys = self.query(pos, radius)
+        keys.sort(key=lambda key: (abs(self._positions[key][0] - x) + abs(self._positions[key][1] - y), str(key)))
+        return keys[:k]
@@ -0,0 +1,49 @@
+"""Positions of every tile type in a grid, kept current by ``World.set_tile``."""
+from __future__ import annotations
+
+import numpy as np
+
+from src.core.types import TileType
+from src.env.encoding import TILE_CODES
+
+
+class TileIndex:
+    """Maps each ``TileType`` to the set of ``(x, y)`` cells holding it.
+
+    Built once from the grid in O(W*H); afterwards ``move`` keeps it in sync in
+    O(1) per mutated tile, so "where are the doors" / "is any door open" queries
+    cost O(k) / O(1). ``positions`` returns cells in row-major order, matching a
+    ``for y: for x:`` scan of the grid. ``codes`` mirrors the grid as ``int16``
+    ``TILE_CODES`` for array kernels.
+    """
+
+    def __init__(self, tiles: np.ndarray) -> None:
+        self.tiles = tiles
+        self._cells: dict[TileType, set[tuple[int, int]]] = {}
+        self._ordered: dict[TileType, list[tuple[int, int]]] = {}
+        self.codes = np.empty(tiles.shape, dtype=np.int16)
+        width = tiles.shape[1]
+        codes = self.codes.reshape(-1)
+        for flat, tile in enumerate(tiles.flat):
+            self._cells.setdefault(tile, set()).add((flat % width, flat // width))
+            codes[flat] = TILE_CODES[tile]
+
+    def positions(self, tile: TileType) -> list[tuple[int, int]]:
+        ordered = self._ordered.get(tile)
+        if ordered is None:
+            ordered = sorted(self._cells.get(tile, ()), key=lambda pos: (pos[1], pos[0]))
+            self._ordered[tile] = ordered
+        return list(ordered)
+
+    def count(self, tile: TileType) -> int:
+        return len(self._cells.get(tile, ()))
+
+    def contains(self, tile: TileType) -> bool:
+        return bool(self._cells.get(tile))
+
+    def move(self, pos: tuple[int, int], old: TileType, new: TileType) -> None:
+        self._cells.get(old, set()).discard(pos)
+        self._cells.setdefault(new, set()).add(pos)
+        self.codes[pos[1], pos[0]] = TILE_CODES[new]
+        self._ordered.pop(old, None)
+        self._ordered.pop(new, None)
@@ -5,7 +5,7 @@ from typing import Any, Callable
 
 from src.core.events import Event
 from src.core.types import Facing, TileType
-from src.env import rules
+from src.env import items, rules
 
 
 @dataclass
@@ -164,7 +164,7 @@ def jump(world, actor_id: str) -> ToolResult:
 
 def precheck_use(world, actor_id: str, target: tuple[int, int]) -> ToolResult:
     actor = world.get_actor(actor_id)
-    if world.hand_item is None:
+    if actor.hand_item is None:
         return _result(False, error_code="no_item")
     if not world.in_bounds(target):
         return _result(False, error_code="out_of_bounds")
@@ -177,16 +177,28 @@ def use(world, actor_id: str, target: tuple[int, int]) -> ToolResult:
     precheck = precheck_use(world, actor_id, target)
     if not precheck.ok:
         return precheck
-    return _result(True)
+    actor = world.get_actor(actor_id)
+    item = actor.hand_item
+    x, y = target
+    if items.key_opens(item, world.tiles[y][x]):
+        world.set_tile(target, TileType.DOOR_OPEN)
+        return _result(True, delta={"item_id": item.item_id, "door": target}, events=[Event("door_opened", {"x": x, "y": y, "item_id": item.item_id})])
+    if items.is_consumable(item):
+        effects = items.apply_item_effects(actor, item)
+        items.release_hand(actor)
+        return _result(True, delta={"item_id": item.item_id, **effects}, events=[Event("item_used", {"item_id": item.item_id, "actor_id": actor_id})])
+    return _result(True, delta={"item_id": item.item_id})
 
 
 def precheck_pickup(world, actor_id: str, item_id: str) -> ToolResult:
-    if world.hand_item is not None:
+    actor = world.get_actor(actor_id)
+    if not items.can_carry(actor):
         return _result(False, error_code="hand_full")
-    item = rules.find_item_by_id(world.items, item_id)
+    item = rules.find_item_by_id(world, item_id)
     if item is None:
         return _result(False, error_code="no_item")
-    actor = world.get_actor(actor_id)
+    if not item.props.pickupable:
+        return _result(False, error_code="not_pickupable")
     if not rules.is_adjacent(actor.pos.as_int(), item.pos.as_int()):
         return _result(False, error_code="not_adjacent")
     return _result(True)
@@ -196,13 +208,16 @@ def pickup(world, actor_id: str, item_id: str) -> ToolResult:
     precheck = precheck_pickup(world, actor_id, item_id)
     if not precheck.ok:
         return precheck
-    return _result(True)
+    item = world.take_item(item_id)
+    slot = items.carry(world.get_actor(actor_id), item)
+    return _result(True, delta={"item_id": item_id, "slot": slot}, events=[Event("item_picked_up", {"item_id": item_id, "actor_id": actor_id})])
 
 
 def precheck_drop(world, actor_id: str, item_id: str) -> ToolResult:
-    if world.hand_item is None:
+    hand_item = world.get_actor(actor_id).hand_item
+    if hand_item is None:
         return _result(False, error_code="no_item")
-    if getattr(world.hand_item, "item_id", None) != item_id:
+    if hand_item.item_id != item_id:
         return _result(False, error_code="not_in_hand")
     return _result(True)
 
@@ -211,7 +226,11 @@ def drop(world, actor_id: str, item_id: str) -> ToolResult:
     precheck = precheck_drop(world, actor_id, item_id)
     if not precheck.ok:
         return precheck
-    return _result(True)
+    actor = world.get_actor(actor_id)
+    item = items.release_hand(actor)
+    pos = actor.pos.as_int()
+    world.place_item(item, pos)
+    return _result(True, delta={"item_id": item_id, "pos": pos}, events=[Event("item_dropped", {"item_id": item_id, "actor_id": actor_id})])
 
 
 def precheck_attack(world, actor_id: str, target: tuple[int, int]) -> ToolResult:
@@ -227,7 +246,15 @@ def attack(world, actor_id: str, target: tuple[int, int]) -> ToolResult:
     precheck = precheck_attack(world, actor_id, target)
     if not precheck.ok:
         return precheck
-    return _result(True)
+    enemy = world.enemy_at(target)
+    if enemy is None:
+        return _result(True, delta={"hit": None})
+    actor = world.get_actor(actor_id)
+    weapon = actor.hand_item
+    bonus = weapon.props.damage if weapon is not None and weapon.props.weapon_like else 0
+    damage = rules.combat_damage(actor.atk + bonus, enemy.defense)
+    events = world.damage_enemy(enemy.enemy_id, damage, actor_id)
+    return _result(True, delta={"hit": enemy.enemy_id, "damage": damage}, events=events)
 
 
 def precheck_break_tile(world, actor_id: str, x: int, y: int) -> ToolResult:
@@ -245,7 +272,7 @@ def break_tile(world, actor_id: str, x: int, y: int) -> ToolResult:
     precheck = precheck_break_tile(world, actor_id, x, y)
     if not precheck.ok:
         return precheck
-    world.tiles[y][x] = TileType.EMPTY
+    world.set_tile((x, y), TileType.EMPTY)
     return _result(True, events=[Event("tile_broken", {"x": x, "y": y})])
 
 
@@ -278,28 +305,49 @@ def ask_human(world, question_text: str) -> ToolResult:
 
 
 def precheck_pickup_adjacent(world, actor_id: str) -> ToolResult:
-    if world.hand_item is not None:
+    actor = world.get_actor(actor_id)
+    if not items.can_carry(actor):
         return _result(False, error_code="hand_full")
+    if not world.items_adjacent(actor.pos.as_int()):
+        return _result(False, error_code="no_item")
+    return _result(True)
+
+
+def pickup_adjacent(world, actor_id: str) -> ToolResult:
+    precheck = precheck_pickup_adjacent(world, actor_id)
+    if not precheck.ok:
+        return precheck
     actor = world.get_actor(actor_id)
-    for item in world.items:
-        if rules.is_adjacent(actor.pos.as_int(), item.pos.as_int()):
-            return _result(True)
-    return _result(False, error_code="no_item")
+    facing = _adjacent_pos(world, actor_id)
+    nearby = world.items_adjacent(actor.pos.as_int())
+    target = next((item for item in nearby if item.pos.as_int() == facing), nearby[0])
+    return pickup(world, actor_id, target.item_id)
 
 
 def precheck_drop_hand(world, actor_id: str) -> ToolResult:
-    if world.hand_item is None:
+    if world.get_actor(actor_id).hand_item is None:
         return _result(False, error_code="no_item")
     return _result(True)
 
 
+def drop_hand(world, actor_id: str) -> ToolResult:
+    precheck = precheck_drop_hand(world, actor_id)
+    if not precheck.ok:
+        return precheck
+    return drop(world, actor_id, world.get_actor(actor_id).hand_item.item_id)
+
+
 def precheck_use_adjacent(world, actor_id: str) -> ToolResult:
-    if world.hand_item is None:
+    if world.get_actor(actor_id).hand_item is None:
         return _result(False, error_code="no_item")
     target = _adjacent_pos(world, actor_id)
     return precheck_use(world, actor_id, target)
 
 
+def use_adjacent(world, actor_id: str) -> ToolResult:
+    return use(world, actor_id, _adjacent_pos(world, actor_id))
+
+
 def precheck_attack_adjacent(world, actor_id: str) -> ToolResult:
     target = _adjacent_pos(world, actor_id)
     return precheck_attack(world, actor_id, target)
@@ -321,6 +369,9 @@ TOOL_REGISTRY: dict[str, Callable[..., ToolResult]] = {
     "use": use,
     "pickup": pickup,
     "drop": drop,
+    "pickup_adjacent": pickup_adjacent,
+    "drop_hand": drop_hand,
+    "use_adjacent": use_adjacent,
     "attack": attack,
     "break_tile": break_tile,
     "inspect": inspect,
@@ -3,6 +3,7 @@ from __future__ import annotations
 import pygame
 
 from src.config import ControlsConfig
+from src.env import rules
 from src.env.tools import break_tile, inspect, jump, move
 
 
@@ -16,6 +17,31 @@ def _key_codes(names: list[str]) -> set[int]:
     return codes
 
 
+HUMAN_COMMANDS = ("move_W", "move_E", "jump", "break", "inspect")
+
+
+def apply_human_command(world, actor_id: str, command: str) -> None:
+    """Apply one keyboard command to ``world``; shared by live input and episode replay."""
+
+    actor = world.get_actor(actor_id)
+    if rules.is_defeated(actor):
+        return
+    if command == "move_W":
+        move(world, actor.entity_id, "W")
+    elif command == "move_E":
+        move(world, actor.entity_id, "E")
+    elif command == "jump":
+        jump(world, actor.entity_id)
+    elif command == "break":
+        dx = 1 if actor.facing.value == "E" else -1
+        break_tile(world, actor.entity_id, int(actor.pos.x + dx), int(actor.pos.y))
+    elif command == "inspect":
+        dx = 1 if actor.facing.value == "E" else -1
+        inspect(world, actor.entity_id, int(actor.pos.x + dx), int(actor.pos.y))
+    else:
+        raise ValueError(f"Unknown human command: {command}")
+
+
 class KeyboardController:
     def __init__(self, world, controls: ControlsConfig, target_id: str = "human") -> None:
         self.world = world
@@ -29,19 +55,25 @@ class KeyboardController:
     def set_target(self, target_id: str) -> None:
         self.target_id = target_id
 
-    def handle_event(self, event: pygame.event.Event) -> None:
+    def command_for_key(self, key: int) -> str | None:
+        if key in self._left_keys:
+            return "move_W"
+        if key in self._right_keys:
+            return "move_E"
+        if key in self._jump_keys:
+            return "jump"
+        if key in self._break_keys:
+            return "break"
+        if key in self._inspect_keys:
+            return "inspect"
+        return None
+
+    def handle_event(self, event: pygame.event.Event) -> str | None:
+        """Apply a key press to the target actor and return the command it mapped to."""
+
         if event.type != pygame.KEYDOWN:
-            return
-        actor = self.world.get_actor(self.target_id)
-        if event.key in self._left_keys:
-            move(self.world, actor.entity_id, "W")
-        elif event.key in self._right_keys:
-            move(self.world, actor.entity_id, "E")
-        elif event.key in self._jump_keys:
-            jump(self.world, actor.entity_id)
-        elif event.key in self._break_keys:
-            dx = 1 if actor.facing.value == "E" else -1
-            break_tile(self.world, actor.entity_id, int(actor.pos.x + dx), int(actor.pos.y))
-        elif event.key in self._inspect_keys:
-            dx = 1 if actor.facing.value == "E" else -1
-            inspect(self.world, actor.entity_id, int(actor.pos.x + dx), int(actor.pos.y))
+            return None
+        command = self.command_for_key(event.key)
+        if command is not None:
+            apply_human_command(self.world, self.target_id, command)
+        return command
@@ -0,0 +1,232 @@
+"""Single-writer log aggregation for parallel trainers: workers enqueue rows, one writer batches inserts."""
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import queue as queue_module
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import create_engine, event, insert
+
+from src.config import LoggingConfig
+from src.logging.db import ROW_MODELS, DBLogger
+from src.logging.migrations import migrate
+from src.logging.schema import Episode
+
+# Queue messages (plain tuples so they pickle cheaply):
+#   ("episode", worker_id, local_id, episode_columns)
+#   ("row", worker_id, table, row)            row["episode_id"] holds the local id
+#   ("flush",)                                commit whatever is pending now
+#   None                                      drain, commit and exit
+
+
+class QueueDBLogger(DBLogger):
+    """``DBLogger`` drop-in that ships rows to a ``LogAggregator`` instead of opening SQLite.
+
+    ``episode_id`` is a per-worker sequence number; the aggregator maps
+    ``(worker_id, episode_id)`` to the real database id when it writes the batch.
+    """
+
+    def __init__(self, queue: Any, worker_id: str) -> None:
+        self.queue = queue
+        self.worker_id = worker_id
+        self.engine = None
+        self.episode_id: int | None = None
+        self.tick = 0
+        self._sequence = 0
+
+    def start_episode(
+        self,
+        preset: str,
+        seed: int,
+        mode: str,
+        started_at: str,
+        world_hash: str | None = None,
+        curriculum_stage: str | None = None,
+        stage_transition_reason: str | None = None,
+        episode_id: int | None = None,
+        worker_id: str | None = None,
+    ) -> None:
+        self._sequence += 1
+        columns = {
+            "id": episode_id,
+            "preset": preset,
+            "seed": seed,
+            "mode": mode,
+            "started_at": started_at,
+            "world_hash": world_hash,
+            "curriculum_stage": curriculum_stage,
+            "stage_transition_reason": stage_transition_reason,
+            "worker_id": worker_id or self.worker_id,
+        }
+        self.queue.put(("episode", self.worker_id, self._sequence, columns))
+        self.episode_id = self._sequence
+        self.tick = 0
+
+    def _emit(self, table: str, row: dict[str, Any]) -> None:
+        self.queue.put(("row", self.worker_id, table, row))
+
+    def flush(self) -> None:
+        """Ask the writer to commit everything queued so far (e.g. at a checkpoint)."""
+
+        self.queue.put(("flush",))
+
+
+class _BatchWriter:
+    """Owns the SQLite connection on the writer side and commits one transaction per batch."""
+
+    def __init__(self, db_path: Path) -> None:
+        self.engine = create_engine(f"sqlite:///{db_path}", connect_args={"timeout": 30})
+        event.listen(self.engine, "connect", _sqlite_wal)
+        migrate(self.engine)
+        self.episode_ids: dict[tuple[str, int], int] = {}
+        self.pending: list[tuple] = []
+        self.written = 0
+        self.dropped = 0
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        rows: dict[str, list[dict[str, Any]]] = {}
+        with self.engine.begin() as connection:
+            for message in self.pending:
+                if message[0] == "episode":
+                    _, worker_id, local_id, columns = message
+                    if columns.get("id") is None:
+                        columns = {key: value for key, value in columns.items() if key != "id"}
+                    result = connection.execute(insert(Episode.__table__).values(**columns))
+                    self.episode_ids[(worker_id, local_id)] = int(result.inserted_primary_key[0])
+                    continue
+                _, worker_id, table, row = message
+                db_id = self.episode_ids.get((worker_id, row["episode_id"]))
+                if db_id is None or table not in ROW_MODELS:
+                    self.dropped += 1
+                    continue
+                rows.setdefault(table, []).append({**row, "episode_id": db_id})
+            for table, batch in rows.items():
+                connection.execute(insert(ROW_MODELS[table].__table__), batch)
+                self.written += len(batch)
+        self.pending.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self.engine.dispose()
+
+
+def _sqlite_wal(dbapi_connection, _record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def _raise_exit(_signum, _frame) -> None:
+    raise SystemExit(0)
+
+
+def _writer_loop(queue: Any, db_path: Path, batch_size: int, flush_interval: float, install_signals: bool) -> None:
+    if install_signals:
+        # Turn SIGTERM into SystemExit so the ``finally`` below still commits the open batch.
+        signal.signal(signal.SIGTERM, _raise_exit)
+    writer = _BatchWriter(db_path)
+    deadline = time.monotonic() + flush_interval
+    try:
+        while True:
+            try:
+                message = queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue_module.Empty:
+                message = ("flush",)
+            if message is None:
+                return
+            if message[0] != "flush":
+                writer.pending.append(message)
+            if message[0] == "flush" or len(writer.pending) >= batch_size or time.monotonic() >= deadline:
+                writer.flush()
+                deadline = time.monotonic() + flush_interval
+    finally:
+        while True:
+            try:
+                message = queue.get_nowait()
+            except (queue_module.Empty, OSError, ValueError):
+                break
+            if message is not None and message[0] != "flush":
+                writer.pending.append(message)
+        writer.close()
+
+
+class LogAggregator:
+    """One writer (process, or thread with ``inline=True``) fed by any number of ``QueueDBLogger`` clients.
+
+    Rows are committed every ``batch_size`` records or ``flush_interval`` seconds,
+    whichever comes first, in a single transaction per batch. ``stop`` (or a
+    SIGTERM to the writer process) drains the queue and commits before exiting, so
+    a crashed worker loses nothing it had already enqueued. ``inline`` keeps
+    everything in-process for tests and single-process runs.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        inline: bool = False,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(0.01, float(flush_interval))
+        self.inline = inline
+        if inline:
+            self.queue: Any = queue_module.Queue()
+        else:
+            self.queue = mp.get_context().Queue()
+        self._writer: threading.Thread | mp.process.BaseProcess | None = None
+
+    @classmethod
+    def from_config(cls, config: LoggingConfig, inline: bool = False) -> LogAggregator:
+        if config.partition_dir:
+            raise ValueError("LogAggregator writes a single database; unset logging.partition_dir")
+        return cls(
+            Path(config.db_path),
+            batch_size=config.aggregator_batch_size,
+            flush_interval=config.aggregator_flush_interval,
+            inline=inline,
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._writer is not None and self._writer.is_alive()
+
+    def start(self) -> LogAggregator:
+        if self.running:
+            return self
+        args = (self.queue, self.db_path, self.batch_size, self.flush_interval, not self.inline)
+        if self.inline:
+            self._writer = threading.Thread(target=_writer_loop, args=args, name="atlas-log-writer", daemon=True)
+        else:
+            self._writer = mp.get_context().Process(target=_writer_loop, args=args, name="atlas-log-writer", daemon=True)
+        self._writer.start()
+        return self
+
+    def client(self, worker_id: str | None = None) -> QueueDBLogger:
+        return QueueDBLogger(self.queue, worker_id or f"pid{os.getpid()}")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        if self._writer is None:
+            return
+        if self._writer.is_alive():
+            self.queue.put(None)
+            self._writer.join(timeout)
+        if isinstance(self._writer, mp.process.BaseProcess) and self._writer.is_alive():
+            self._writer.terminate()
+            self._writer.join(timeout)
+        self._writer = None
+
+    def __enter__(self) -> LogAggregator:
+        return self.start()
+
+    def __exit__(self, *_exc) -> None:
+        self.stop()
@@ -0,0 +1,375 @@
+"""Columnar export of step/event logs: typed NumPy row groups plus a manifest, with optional Parquet."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+from sqlalchemy import create_engine, select
+
+from src.logging.partitions import resolve_db_paths
+from src.logging.schema import Episode, Event, Step
+
+COLUMNAR_VERSION = 2
+MANIFEST_NAME = "manifest.json"
+
+REWARD_TERMS = ("mode", "progress", "explore", "preference", "shaping", "death", "step_cost", "total", "safety_penalty", "exp_gain")
+
+# (column, dtype, path into info_json, default when missing)
+INFO_FIELDS: tuple[tuple[str, str, tuple[str, str], Any], ...] = (
+    ("tool_safety_rejected", "bool", ("tool_safety", "rejected"), False),
+    ("tool_safety_strict", "bool", ("tool_safety", "strict"), False),
+    ("progression_level", "int16", ("progression", "level"), 0),
+    ("progression_exp", "int32", ("progression", "exp"), 0),
+    ("progression_exp_gained", "int32", ("progression", "exp_gained"), 0),
+    ("progression_levels_gained", "int16", ("progression", "levels_gained"), 0),
+    ("transform_atlas_timer", "int16", ("transform", "atlas_timer"), 0),
+    ("transform_human_timer", "int16", ("transform", "human_timer"), 0),
+    ("fly_atlas_can_fly", "bool", ("fly", "atlas_can_fly"), False),
+    ("fly_atlas_timer", "int16", ("fly", "atlas_timer"), 0),
+    ("fly_human_can_fly", "bool", ("fly", "human_can_fly"), False),
+    ("fly_human_timer", "int16", ("fly", "human_timer"), 0),
+)
+
+# String columns stored as int16 codes into a per-table category list (-1 = missing).
+CATEGORY_FIELDS: tuple[tuple[str, tuple[str, str]], ...] = (
+    ("tool_safety_rejection_code", ("tool_safety", "rejection_code")),
+    ("transform_atlas_state", ("transform", "atlas_state")),
+    ("transform_human_state", ("transform", "human_state")),
+)
+
+STEP_SCHEMA: dict[str, str] = {
+    "episode_id": "int64",
+    "tick": "int32",
+    "mode": "category",
+    "action": "int16",
+    "reward": "float32",
+    "done": "bool",
+    **{f"reward_{term}": "float32" for term in REWARD_TERMS},
+    **{name: dtype for name, dtype, _path, _default in INFO_FIELDS},
+    **{name: "category" for name, _path in CATEGORY_FIELDS},
+}
+
+EVENT_SCHEMA: dict[str, str] = {"episode_id": "int64", "tick": "int32", "mode": "category", "type": "category"}
+
+
+def _lookup(info: dict[str, Any], path: tuple[str, str]) -> Any:
+    section = info.get(path[0])
+    return section.get(path[1]) if isinstance(section, dict) else None
+
+
+def flatten_step(
+    episode_id: int,
+    tick: int,
+    mode: str | None,
+    action: int | None,
+    reward: float | None,
+    done: bool | None,
+    reward_terms_json: str | None,
+    info_json: str | None,
+) -> dict[str, Any]:
+    """One ``steps`` row as a flat dict of scalars keyed by ``STEP_SCHEMA`` column."""
+
+    info = json.loads(info_json) if info_json else {}
+    terms = json.loads(reward_terms_json) if reward_terms_json else info.get("reward_terms") or {}
+    row: dict[str, Any] = {
+        "episode_id": episode_id,
+        "tick": tick,
+        "mode": mode,
+        "action": action if action is not None else -1,
+        "reward": reward if reward is not None else 0.0,
+        "done": bool(done),
+    }
+    for term in REWARD_TERMS:
+        row[f"reward_{term}"] = float(terms.get(term, 0.0) or 0.0)
+    for name, _dtype, path, default in INFO_FIELDS:
+        value = _lookup(info, path)
+        row[name] = default if value is None else value
+    for name, path in CATEGORY_FIELDS:
+        row[name] = _lookup(info, path)
+    return row
+
+
+class _TableWriter:
+    """Buffers rows column-wise and writes one row group every ``row_group_size`` rows."""
+
+    def __init__(self, out_dir: Path, table: str, schema: dict[str, str], row_group_size: int, file_format: str) -> None:
+        self.out_dir = out_dir
+        self.table = table
+        self.schema = schema
+        self.row_group_size = max(1, int(row_group_size))
+        self.file_format = file_format
+        self.categories: dict[str, list[str]] = {name: [] for name, dtype in schema.items() if dtype == "category"}
+        self._codes: dict[str, dict[str, int]] = {name: {} for name in self.categories}
+        self.columns: dict[str, list[Any]] = {name: [] for name in schema}
+        self.row_groups: list[dict[str, Any]] = []
+        self.rows = 0
+        self._parquet = None
+
+    def _code(self, column: str, value: Any) -> int:
+        if value is None:
+            return -1
+        codes = self._codes[column]
+        key = str(value)
+        if key not in codes:
+            codes[key] = len(self.categories[column])
+            self.categories[column].append(key)
+        return codes[key]
+
+    def append(self, row: dict[str, Any]) -> None:
+        for name, dtype in self.schema.items():
+            value = row[name]
+            self.columns[name].append(self._code(name, value) if dtype == "category" else value)
+        if len(self.columns["episode_id"]) >= self.row_group_size:
+            self.flush()
+
+    def _arrays(self) -> dict[str, np.ndarray]:
+        return {
+            name: np.asarray(values, dtype=np.int16 if self.schema[name] == "category" else self.schema[name])
+            for name, values in self.columns.items()
+        }
+
+    def flush(self) -> None:
+        count = len(self.columns["episode_id"])
+        if count == 0:
+            return
+        arrays = self._arrays()
+        index = len(self.row_groups)
+        mode_codes = np.unique(arrays["mode"])
+        group = {
+            "index": index,
+            "rows": count,
+            "episode_min": int(arrays["episode_id"].min()),
+            "episode_max": int(arrays["episode_id"].max()),
+            "episodes": np.unique(arrays["episode_id"]).tolist(),
+            "modes": [self.categories["mode"][code] for code in mode_codes if code >= 0],
+            "tick_min": int(arrays["tick"].min()),
+            "tick_max": int(arrays["tick"].max()),
+        }
+        if self.file_format == "parquet":
+            self._write_parquet(arrays)
+        else:
+            for name, array in arrays.items():
+                np.save(self.out_dir / f"{self.table}.rg{index:05d}.{name}.npy", array)
+        self.row_groups.append(group)
+        self.rows += count
+        self.columns = {name: [] for name in self.schema}
+
+    def _write_parquet(self, arrays: dict[str, np.ndarray]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        fields = {}
+        for name, array in arrays.items():
+            if self.schema[name] == "category":
+                fields[name] = pa.DictionaryArray.from_arrays(
+                    pa.array(array, mask=array < 0, type=pa.int16()), pa.array(self.categories[name], type=pa.string())
+                )
+            else:
+                fields[name] = pa.array(array)
+        table = pa.table(fields)
+        if self._parquet is None:
+            self._parquet = pq.ParquetWriter(self.out_dir / f"{self.table}.parquet", table.schema)
+        self._parquet.write_table(table)
+
+    def close(self) -> dict[str, Any]:
+        self.flush()
+        if self._parquet is not None:
+            self._parquet.close()
+        return {
+            "schema": self.schema,
+            "categories": self.categories,
+            "rows": self.rows,
+            "row_groups": self.row_groups,
+        }
+
+
+def _filtered(query, episode_ids: Sequence[int] | None, mode: str | None, episode_column):
+    if mode is not None:
+        query = query.where(Episode.mode == mode)
+    if episode_ids is not None:
+        query = query.where(episode_column.in_(list(episode_ids)))
+    return query
+
+
+def _stream(db_path: Path, query, chunk_size: int) -> Iterable[tuple]:
+    engine = create_engine(f"sqlite:///{db_path}")
+    try:
+        with engine.connect() as connection:
+            yield from connection.execution_options(stream_results=True, yield_per=chunk_size).execute(query)
+    finally:
+        engine.dispose()
+
+
+def export_columnar(
+    db_path: Path,
+    out_dir: Path,
+    *,
+    episode_ids: Sequence[int] | None = None,
+    mode: str | None = None,
+    row_group_size: int = 65536,
+    file_format: str = "npy",
+    include_events: bool = True,
+    chunk_size: int = 2000,
+) -> dict[str, Any]:
+    """Flatten steps (and events) into typed columns under ``out_dir``; returns the manifest.
+
+    ``file_format="npy"`` writes one ``.npy`` per column per row group, loadable with
+    ``np.load(mmap_mode="r")``; ``"parquet"`` writes ``steps.parquet``/``events.parquet``
+    and needs ``pyarrow``. Either way ``manifest.json`` records per-row-group
+    episode/mode/tick statistics that ``load_columnar`` uses to skip row groups.
+    """
+
+    if file_format not in ("npy", "parquet"):
+        raise ValueError(f"Unsupported columnar format: {file_format}")
+    if file_format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as exc:
+            raise RuntimeError("Parquet export requires the 'pyarrow' package") from exc
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    steps = _TableWriter(out_dir, "steps", STEP_SCHEMA, row_group_size, file_format)
+    events = _TableWriter(out_dir, "events", EVENT_SCHEMA, row_group_size, file_format) if include_events else None
+    step_query = _filtered(
+        select(
+            Step.episode_id,
+            Step.tick,
+            Episode.mode,
+            Step.action_int,
+            Step.reward_float,
+            Step.done_bool,
+            Step.reward_terms_json,
+            Step.info_json,
+        ).join(Episode, Episode.id == Step.episode_id),
+        episode_ids,
+        mode,
+        Step.episode_id,
+    ).order_by(Step.episode_id, Step.tick)
+    event_query = _filtered(
+        select(Event.episode_id, Event.tick, Episode.mode, Event.type).join(Episode, Episode.id == Event.episode_id),
+        episode_ids,
+        mode,
+        Event.episode_id,
+    ).order_by(Event.episode_id, Event.tick)
+    for partition in resolve_db_paths(db_path, episode_ids=episode_ids, mode=mode):
+        for row in _stream(partition, step_query, chunk_size):
+            steps.append(flatten_step(*row))
+        if events is not None:
+            for episode_id, tick, episode_mode, event_type in _stream(partition, event_query, chunk_size):
+                events.append({"episode_id": episode_id, "tick": tick, "mode": episode_mode, "type": event_type})
+    tables = {"steps": steps.close()}
+    if events is not None:
+        tables["events"] = events.close()
+    manifest = {"version": COLUMNAR_VERSION, "format": file_format, "tables": tables}
+    (out_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def read_manifest(path: Path) -> dict[str, Any]:
+    manifest_path = Path(path) / MANIFEST_NAME
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"Columnar manifest not found: {manifest_path}")
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if manifest.get("version") != COLUMNAR_VERSION:
+        raise ValueError(f"Unsupported columnar export version: {manifest.get('version')}")
+    return manifest
+
+
+def _group_matches(group: dict[str, Any], episode_ids: set[int] | None, mode: str | None) -> bool:
+    if mode is not None and mode not in group["modes"]:
+        return False
+    if episode_ids is not None:
+        if not any(group["episode_min"] <= episode <= group["episode_max"] for episode in episode_ids):
+            return False
+        return not episode_ids.isdisjoint(group["episodes"])
+    return True
+
+
+def load_columnar(
+    path: Path,
+    table: str = "steps",
+    *,
+    columns: Sequence[str] | None = None,
+    episode_ids: Sequence[int] | None = None,
+    mode: str | None = None,
+    decode_categories: bool = False,
+) -> dict[str, np.ndarray]:
+    """Load selected columns as NumPy arrays, skipping row groups the filters rule out.
+
+    Category columns come back as int16 codes (``-1`` = missing) unless
+    ``decode_categories`` is set; the code tables live in the manifest.
+    """
+
+    path = Path(path)
+    manifest = read_manifest(path)
+    if table not in manifest["tables"]:
+        raise ValueError(f"Table '{table}' not in export (have {sorted(manifest['tables'])})")
+    meta = manifest["tables"][table]
+    schema: dict[str, str] = meta["schema"]
+    wanted = list(columns) if columns is not None else list(schema)
+    unknown = [name for name in wanted if name not in schema]
+    if unknown:
+        raise ValueError(f"Unknown columns for '{table}': {unknown}")
+    if manifest["format"] == "parquet":
+        return _load_parquet(path, table, meta, wanted, episode_ids, mode, decode_categories)
+
+    selected_ids = {int(episode) for episode in episode_ids} if episode_ids is not None else None
+    mode_code = meta["categories"]["mode"].index(mode) if mode in meta["categories"]["mode"] else -2
+    needed = set(wanted) | ({"episode_id"} if selected_ids is not None else set()) | ({"mode"} if mode is not None else set())
+    parts: dict[str, list[np.ndarray]] = {name: [] for name in wanted}
+    for group in meta["row_groups"]:
+        if not _group_matches(group, selected_ids, mode):
+            continue
+        arrays = {
+            name: np.load(path / f"{table}.rg{group['index']:05d}.{name}.npy", mmap_mode="r") for name in needed
+        }
+        mask = np.ones(group["rows"], dtype=bool)
+        if selected_ids is not None:
+            mask &= np.isin(arrays["episode_id"], list(selected_ids))
+        if mode is not None:
+            mask &= arrays["mode"] == mode_code
+        for name in wanted:
+            parts[name].append(np.asarray(arrays[name][mask]))
+    result = {}
+    for name in wanted:
+        dtype = np.int16 if schema[name] == "category" else np.dtype(schema[name])
+        result[name] = np.concatenate(parts[name]) if parts[name] else np.zeros(0, dtype=dtype)
+        if decode_categories and schema[name] == "category":
+            lookup = np.array(meta["categories"][name] + [None], dtype=object)
+            result[name] = lookup[result[name]]
+    return result
+
+
+def _load_parquet(
+    path: Path,
+    table: str,
+    meta: dict[str, Any],
+    wanted: list[str],
+    episode_ids: Sequence[int] | None,
+    mode: str | None,
+    decode_categories: bool,
+) -> dict[str, np.ndarray]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise RuntimeError("Reading a Parquet export requires the 'pyarrow' package") from exc
+    filters = []
+    if episode_ids is not None:
+        filters.append(("episode_id", "in", [int(episode) for episode in episode_ids]))
+    if mode is not None:
+        filters.append(("mode", "=", mode))
+    data = pq.read_table(path / f"{table}.parquet", columns=wanted, filters=filters or None)
+    result = {}
+    for name in wanted:
+        column = data.column(name).combine_chunks()
+        if meta["schema"][name] == "category":
+            if decode_categories:
+                result[name] = np.array(column.to_pylist(), dtype=object)
+            else:
+                codes = {value: idx for idx, value in enumerate(meta["categories"][name])}
+                result[name] = np.array([codes.get(value, -1) for value in column.to_pylist()], dtype=np.int16)
+        else:
+            result[name] = column.to_numpy(zero_copy_only=False)
+    return result
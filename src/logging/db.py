@@ -4,37 +4,36 @@ import json
 from pathlib import Path
 from typing import Any
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
 
-from src.logging.schema import Base, Episode, Event, HumanAction, HumanFeedback, ReplayBufferStat, Step
+from src.logging.migrations import migrate
+from src.logging.schema import Episode, Event, HumanAction, HumanFeedback, ReplayBufferStat, Step
+
+
+ROW_MODELS = {
+    "steps": Step,
+    "events": Event,
+    "human_actions": HumanAction,
+    "human_feedback": HumanFeedback,
+    "replay_buffer_stats": ReplayBufferStat,
+}
 
 
 class DBLogger:
+    """Writes episodes and per-tick records to SQLite.
+
+    Every ``log_*`` method builds a plain row dict (JSON already encoded) and hands
+    it to ``_emit``; subclasses override ``_emit``/``start_episode`` to ship rows
+    elsewhere, e.g. ``QueueDBLogger`` in ``src.logging.aggregator``.
+    """
+
     def __init__(self, path: Path) -> None:
         self.engine = create_engine(f"sqlite:///{path}")
-        Base.metadata.create_all(self.engine)
-        self._ensure_episode_columns()
+        migrate(self.engine)
         self.episode_id: int | None = None
         self.tick = 0
 
-    def _ensure_episode_columns(self) -> None:
-        if self.engine.dialect.name != "sqlite":
-            return
-        with self.engine.begin() as connection:
-            result = connection.execute(text("PRAGMA table_info(episodes)"))
-            existing = {row[1] for row in result}
-            columns = {
-                "world_hash": "VARCHAR(64)",
-                "curriculum_stage": "VARCHAR(64)",
-                "stage_transition_reason": "TEXT",
-            }
-            for column, column_type in columns.items():
-                if column not in existing:
-                    connection.execute(
-                        text(f"ALTER TABLE episodes ADD COLUMN {column} {column_type}")
-                    )
-
     def start_episode(
         self,
         preset: str,
@@ -44,9 +43,12 @@ class DBLogger:
         world_hash: str | None = None,
         curriculum_stage: str | None = None,
         stage_transition_reason: str | None = None,
+        episode_id: int | None = None,
+        worker_id: str | None = None,
     ) -> None:
         with Session(self.engine) as session:
             episode = Episode(
+                id=episode_id,
                 preset=preset,
                 seed=seed,
                 mode=mode,
@@ -54,12 +56,21 @@ class DBLogger:
                 world_hash=world_hash,
                 curriculum_stage=curriculum_stage,
                 stage_transition_reason=stage_transition_reason,
+                worker_id=worker_id,
             )
             session.add(episode)
             session.commit()
             self.episode_id = episode.id
             self.tick = 0
 
+    def _emit(self, table: str, row: dict[str, Any]) -> None:
+        with Session(self.engine) as session:
+            session.add(ROW_MODELS[table](**row))
+            session.commit()
+
+    def _row(self, **columns: Any) -> dict[str, Any]:
+        return {"episode_id": self.episode_id, "tick": self.tick, **columns}
+
     def log_step(
         self,
         obs: dict[str, Any],
@@ -71,10 +82,9 @@ class DBLogger:
     ) -> None:
         if self.episode_id is None:
             return
-        with Session(self.engine) as session:
-            step = Step(
-                episode_id=self.episode_id,
-                tick=self.tick,
+        self._emit(
+            "steps",
+            self._row(
                 obs_json=json.dumps(obs, default=str),
                 action_int=action,
                 action_json=json.dumps({"action": action}),
@@ -82,24 +92,14 @@ class DBLogger:
                 reward_terms_json=json.dumps(reward_terms, default=str) if reward_terms is not None else None,
                 done_bool=done,
                 info_json=json.dumps(info, default=str),
-            )
-            session.add(step)
-            session.commit()
+            ),
+        )
         self.tick += 1
 
     def log_event(self, event_type: str, payload: dict[str, Any]) -> None:
         if self.episode_id is None:
             return
-        with Session(self.engine) as session:
-            event = Event(
-                episode_id=self.episode_id,
-                tick=self.tick,
-                type=event_type,
-                payload_json=json.dumps(payload, default=str),
-            )
-            session.add(event)
-            session.commit()
-
+        self._emit("events", self._row(type=event_type, payload_json=json.dumps(payload, default=str)))
 
     def log_human_feedback(
         self,
@@ -111,45 +111,33 @@ class DBLogger:
     ) -> None:
         if self.episode_id is None:
             return
-        with Session(self.engine) as session:
-            row = HumanFeedback(
-                episode_id=self.episode_id,
-                tick=self.tick,
+        self._emit(
+            "human_feedback",
+            self._row(
                 target=target,
                 msg_type=msg_type,
                 score=int(score),
                 correction_text=correction_text,
                 state_features_json=json.dumps(state_features or []),
-            )
-            session.add(row)
-            session.commit()
+            ),
+        )
 
     def log_replay_buffer_stats(self, stats: dict[str, Any]) -> None:
         if self.episode_id is None:
             return
-        with Session(self.engine) as session:
-            row = ReplayBufferStat(
-                episode_id=self.episode_id,
-                tick=self.tick,
+        self._emit(
+            "replay_buffer_stats",
+            self._row(
                 total_transitions=int(stats.get("total_transitions", 0)),
                 sample_entropy=float(stats.get("sample_entropy", 0.0)),
                 mode_coverage_json=json.dumps(stats.get("mode_coverage", {}), default=str),
-            )
-            session.add(row)
-            session.commit()
+            ),
+        )
 
     def log_human_action(self, obs: dict[str, Any], action: int) -> None:
         if self.episode_id is None:
             return
-        with Session(self.engine) as session:
-            row = HumanAction(
-                episode_id=self.episode_id,
-                tick=self.tick,
-                action_int=int(action),
-                obs_json=json.dumps(obs, default=str),
-            )
-            session.add(row)
-            session.commit()
+        self._emit("human_actions", self._row(action_int=int(action), obs_json=json.dumps(obs, default=str)))
 
 
 def write_eval_trend_report(rows: list[dict[str, Any]], json_path: Path, csv_path: Path) -> None:
@@ -0,0 +1,140 @@
+"""In-place SQLite schema migrations and a small query benchmark for the Atlas log DB."""
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+
+from src.logging.schema import Base
+
+SCHEMA_VERSION = 3
+
+# Columns added to ``episodes`` after the first release (schema version 1);
+# ``worker_id`` arrived with the multi-process log aggregator (version 3).
+EPISODE_COLUMNS = {
+    "world_hash": "VARCHAR(64)",
+    "curriculum_stage": "VARCHAR(64)",
+    "stage_transition_reason": "TEXT",
+    "worker_id": "VARCHAR(64)",
+}
+
+BENCHMARK_QUERIES = {
+    "steps_for_episode": "SELECT tick, action_int, reward_float FROM steps WHERE episode_id = :episode ORDER BY tick",
+    "steps_tick_window": "SELECT COUNT(*) FROM steps WHERE episode_id = :episode AND tick BETWEEN 10 AND 60",
+    "transitions_join_mode": (
+        "SELECT steps.action_int, episodes.mode FROM steps JOIN episodes ON steps.episode_id = episodes.id "
+        "WHERE episodes.mode = :mode"
+    ),
+    "events_by_type": "SELECT COUNT(*) FROM events WHERE type = :event_type AND episode_id = :episode",
+    "episodes_by_mode": "SELECT id FROM episodes WHERE mode = :mode",
+    "feedback_for_episode": "SELECT score FROM human_feedback WHERE episode_id = :episode ORDER BY tick",
+}
+
+
+def _query_tables(sql: str) -> list[str]:
+    words = sql.replace(",", " ").split()
+    return [words[idx + 1] for idx, word in enumerate(words[:-1]) if word in ("FROM", "JOIN")]
+
+
+def schema_version(connection: Connection) -> int:
+    return int(connection.execute(text("PRAGMA user_version")).scalar() or 0)
+
+
+def _add_episode_columns(connection: Connection) -> list[str]:
+    existing = {row[1] for row in connection.execute(text("PRAGMA table_info(episodes)"))}
+    applied = []
+    for column, column_type in EPISODE_COLUMNS.items():
+        if column not in existing:
+            connection.execute(text(f"ALTER TABLE episodes ADD COLUMN {column} {column_type}"))
+            applied.append(f"add column episodes.{column}")
+    return applied
+
+
+def _create_indexes(connection: Connection) -> list[str]:
+    existing = {row[0] for row in connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))}
+    applied = []
+    for table in Base.metadata.sorted_tables:
+        for index in sorted(table.indexes, key=lambda idx: idx.name):
+            if index.name not in existing:
+                index.create(connection, checkfirst=True)
+                applied.append(f"create index {index.name}")
+    if applied:
+        connection.execute(text("ANALYZE"))
+    return applied
+
+
+def migrate(engine: Engine) -> list[str]:
+    """Bring a log database up to ``SCHEMA_VERSION``; returns the steps that were applied.
+
+    Idempotent: tables come from ``Base.metadata``, missing columns are added with
+    ``ALTER TABLE`` and indexes declared on the models are created if absent.
+    Foreign keys only apply to newly created tables because SQLite cannot add
+    them to existing ones.
+    """
+
+    Base.metadata.create_all(engine)
+    if engine.dialect.name != "sqlite":
+        return []
+    with engine.begin() as connection:
+        applied = _add_episode_columns(connection)
+        applied += _create_indexes(connection)
+        if schema_version(connection) < SCHEMA_VERSION:
+            connection.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
+            applied.append(f"user_version -> {SCHEMA_VERSION}")
+    return applied
+
+
+def migrate_database(db_path: Path) -> list[str]:
+    engine = create_engine(f"sqlite:///{db_path}")
+    try:
+        return migrate(engine)
+    finally:
+        engine.dispose()
+
+
+def _table_names(connection: Connection) -> set[str]:
+    return {row[0] for row in connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))}
+
+
+def _benchmark_params(connection: Connection, tables: set[str]) -> dict[str, Any]:
+    def first(sql: str, table: str) -> Any:
+        return connection.execute(text(sql)).scalar() if table in tables else None
+
+    episode = first("SELECT episode_id FROM steps GROUP BY episode_id ORDER BY COUNT(*) DESC LIMIT 1", "steps")
+    mode = first("SELECT mode FROM episodes ORDER BY id DESC LIMIT 1", "episodes")
+    event_type = first("SELECT type FROM events LIMIT 1", "events")
+    return {"episode": episode or 0, "mode": mode or "", "event_type": event_type or ""}
+
+
+def benchmark_queries(db_path: Path, repeats: int = 5) -> list[dict[str, Any]]:
+    """Time the common dashboard/loader queries and report whether SQLite uses an index."""
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    rows = []
+    try:
+        with engine.connect() as connection:
+            tables = _table_names(connection)
+            params = _benchmark_params(connection, tables)
+            for name, sql in BENCHMARK_QUERIES.items():
+                if not all(table in tables for table in _query_tables(sql)):
+                    continue
+                plan = " | ".join(str(row[-1]) for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params))
+                samples = []
+                for _ in range(max(1, repeats)):
+                    started = time.perf_counter()
+                    connection.execute(text(sql), params).fetchall()
+                    samples.append(time.perf_counter() - started)
+                rows.append(
+                    {
+                        "query": name,
+                        "best_ms": min(samples) * 1000.0,
+                        "uses_index": "USING INDEX" in plan or "USING COVERING INDEX" in plan,
+                        "plan": plan,
+                    }
+                )
+    finally:
+        engine.dispose()
+    return rows
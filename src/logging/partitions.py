@@ -0,0 +1,226 @@
+"""Partitioned log storage: one SQLite file per day / N episodes / size, indexed by a catalog DB."""
+from __future__ import annotations
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+from sqlalchemy import Column, Integer, String, create_engine, select, text
+from sqlalchemy.orm import Session, declarative_base
+
+from src.config import LoggingConfig
+from src.logging.db import DBLogger
+
+CATALOG_NAME = "catalog.db"
+
+CatalogBase = declarative_base()
+
+
+class CatalogEpisode(CatalogBase):
+    __tablename__ = "catalog_episodes"
+    id = Column(Integer, primary_key=True)
+    partition = Column(String(128), index=True)
+    preset = Column(String(64))
+    seed = Column(Integer)
+    mode = Column(String(64), index=True)
+    started_at = Column(String(64))
+    writer_id = Column(String(64))
+
+
+class CatalogPartition(CatalogBase):
+    __tablename__ = "catalog_partitions"
+    name = Column(String(128), primary_key=True)
+    created_at = Column(String(64))
+    writer_id = Column(String(64))
+
+
+def _catalog_engine(root: Path):
+    root.mkdir(parents=True, exist_ok=True)
+    engine = create_engine(f"sqlite:///{root / CATALOG_NAME}", connect_args={"timeout": 30})
+    CatalogBase.metadata.create_all(engine)
+    return engine
+
+
+def is_partitioned(path: Path) -> bool:
+    return Path(path).is_dir() and (Path(path) / CATALOG_NAME).exists()
+
+
+class PartitionedDBLogger(DBLogger):
+    """``DBLogger`` that rotates to a new SQLite file by day, episode count or file size.
+
+    Episode ids are allocated by the catalog, so they are unique across partitions
+    and writers. Every writer (``writer_id``) gets its own partition files, so
+    parallel trainers never contend for the same SQLite write lock; only the
+    one-row catalog insert per episode is shared.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        rotation: str = "daily",
+        episodes_per_partition: int = 100,
+        max_partition_mb: float = 256.0,
+        writer_id: str | None = None,
+    ) -> None:
+        if rotation not in ("daily", "episodes", "size"):
+            raise ValueError(f"Unknown partition rotation: {rotation}")
+        self.root = Path(root)
+        self.rotation = rotation
+        self.episodes_per_partition = max(1, int(episodes_per_partition))
+        self.max_partition_bytes = int(max_partition_mb * 1024 * 1024)
+        self.writer_id = writer_id or f"pid{os.getpid()}"
+        self.catalog = _catalog_engine(self.root)
+        self.partition_path: Path | None = None
+        self._partition_day = ""
+        self._partition_episodes = 0
+        self._sequence = 0
+        self.engine = None
+        self.episode_id = None
+        self.tick = 0
+
+    def _should_rotate(self, day: str) -> bool:
+        if self.partition_path is None:
+            return True
+        if self.rotation == "daily":
+            return day != self._partition_day
+        if self.rotation == "episodes":
+            return self._partition_episodes >= self.episodes_per_partition
+        return self.partition_path.exists() and self.partition_path.stat().st_size >= self.max_partition_bytes
+
+    def _rotate(self, day: str) -> None:
+        if self.engine is not None:
+            self.engine.dispose()
+        while True:
+            self._sequence += 1
+            name = f"atlas-{day}-{self.writer_id}-{self._sequence:04d}.db"
+            if not (self.root / name).exists():
+                break
+        self.partition_path = self.root / name
+        super().__init__(self.partition_path)
+        self._partition_day = day
+        self._partition_episodes = 0
+        with Session(self.catalog) as session:
+            session.add(CatalogPartition(name=name, created_at=datetime.utcnow().isoformat(), writer_id=self.writer_id))
+            session.commit()
+
+    def start_episode(
+        self,
+        preset: str,
+        seed: int,
+        mode: str,
+        started_at: str,
+        world_hash: str | None = None,
+        curriculum_stage: str | None = None,
+        stage_transition_reason: str | None = None,
+        episode_id: int | None = None,
+        worker_id: str | None = None,
+    ) -> None:
+        day = datetime.utcnow().strftime("%Y%m%d")
+        if self._should_rotate(day):
+            self._rotate(day)
+        assert self.partition_path is not None
+        with Session(self.catalog) as session:
+            entry = CatalogEpisode(
+                partition=self.partition_path.name,
+                preset=preset,
+                seed=seed,
+                mode=mode,
+                started_at=started_at,
+                writer_id=self.writer_id,
+            )
+            session.add(entry)
+            session.commit()
+            global_id = entry.id
+        super().start_episode(
+            preset,
+            seed,
+            mode,
+            started_at,
+            world_hash=world_hash,
+            curriculum_stage=curriculum_stage,
+            stage_transition_reason=stage_transition_reason,
+            episode_id=global_id,
+            worker_id=worker_id or self.writer_id,
+        )
+        self._partition_episodes += 1
+
+
+def open_db_logger(config: LoggingConfig, writer_id: str | None = None) -> DBLogger:
+    if config.partition_dir:
+        return PartitionedDBLogger(
+            Path(config.partition_dir),
+            rotation=config.rotation,
+            episodes_per_partition=config.episodes_per_partition,
+            max_partition_mb=config.max_partition_mb,
+            writer_id=writer_id,
+        )
+    return DBLogger(Path(config.db_path))
+
+
+def partition_paths(
+    root: Path,
+    *,
+    episode_ids: Sequence[int] | None = None,
+    mode: str | None = None,
+) -> list[Path]:
+    """Partition files holding the selected episodes, in creation order."""
+
+    engine = _catalog_engine(Path(root))
+    try:
+        with Session(engine) as session:
+            query = select(CatalogEpisode.partition).distinct()
+            if episode_ids is not None:
+                query = query.where(CatalogEpisode.id.in_(list(episode_ids)))
+            if mode is not None:
+                query = query.where(CatalogEpisode.mode == mode)
+            selected = set(session.execute(query).scalars())
+            ordered = session.execute(select(CatalogPartition.name).order_by(CatalogPartition.created_at)).scalars()
+            names = [name for name in ordered if name in selected]
+    finally:
+        engine.dispose()
+    return [Path(root) / name for name in names if (Path(root) / name).exists()]
+
+
+def resolve_db_paths(path: Path, *, episode_ids: Sequence[int] | None = None, mode: str | None = None) -> list[Path]:
+    """A plain DB file resolves to itself; a partition root resolves through its catalog."""
+
+    path = Path(path)
+    if is_partitioned(path):
+        return partition_paths(path, episode_ids=episode_ids, mode=mode)
+    return [path]
+
+
+def query_partitions(
+    root: Path,
+    sql: str,
+    params: dict[str, Any] | None = None,
+    *,
+    episode_ids: Sequence[int] | None = None,
+    mode: str | None = None,
+) -> Iterator[tuple]:
+    """Run ``sql`` against every matching partition and yield the concatenated rows."""
+
+    for partition in resolve_db_paths(root, episode_ids=episode_ids, mode=mode):
+        engine = create_engine(f"sqlite:///{partition}")
+        try:
+            with engine.connect() as connection:
+                for row in connection.execute(text(sql), params or {}):
+                    yield tuple(row)
+        finally:
+            engine.dispose()
+
+
+def delete_partition(root: Path, name: str) -> int:
+    """Drop one partition file and its catalog rows; returns the number of episodes removed."""
+
+    engine = _catalog_engine(Path(root))
+    try:
+        with Session(engine) as session:
+            removed = session.query(CatalogEpisode).filter(CatalogEpisode.partition == name).delete()
+            session.query(CatalogPartition).filter(CatalogPartition.name == name).delete()
+            session.commit()
+    finally:
+        engine.dispose()
+    (Path(root) / name).unlink(missing_ok=True)
+    return int(removed)
@@ -0,0 +1,239 @@
+"""Compact episode recordings (seed + actions) and a deterministic, hash-checked replayer."""
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import numpy as np
+
+from src.config import AtlasConfig
+from src.env.grid_env import GridEnv
+from src.env.modes import create_mode
+from src.env.world_gen import world_snapshot_hash
+from src.human.input_keyboard import apply_human_command
+
+RECORD_VERSION = 2
+
+
+def state_hash(env: GridEnv) -> str:
+    """Hash of everything an action sequence can change.
+
+    Covers tiles, actors (with hand and inventory item ids), enemies, floor
+    items, the flag and the step counter.
+    """
+
+    world = env.world
+    actors = []
+    for actor in (world.atlas, world.human):
+        actors.append(
+            [
+                round(float(actor.pos.x), 6),
+                round(float(actor.pos.y), 6),
+                round(float(actor.vel.y), 6),
+                actor.hp,
+                actor.level,
+                actor.exp,
+                actor.facing.value,
+                actor.transform_state,
+                bool(actor.can_fly),
+                actor.hand_item.item_id if actor.hand_item is not None else None,
+                [item.item_id for item in actor.inventory],
+            ]
+        )
+    enemies = sorted([enemy.enemy_id, *enemy.pos.as_int(), enemy.hp] for enemy in world.enemies)
+    items = sorted([item.item_id, *item.pos.as_int()] for item in world.items)
+    payload = json.dumps(
+        {
+            "tiles": world_snapshot_hash(world.tiles),
+            "actors": actors,
+            "enemies": enemies,
+            "items": items,
+            "flag": bool(world.atlas_has_flag),
+            "steps": env._steps,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _encode_actions(actions: list[int]) -> str:
+    return base64.b64encode(zlib.compress(np.asarray(actions, dtype=np.uint8).tobytes(), 9)).decode("ascii")
+
+
+def _decode_actions(blob: str) -> list[int]:
+    return np.frombuffer(zlib.decompress(base64.b64decode(blob)), dtype=np.uint8).astype(int).tolist()
+
+
+@dataclass
+class EpisodeRecord:
+    preset: str
+    seed: int
+    mode: str
+    mode_params: dict[str, Any] = field(default_factory=dict)
+    world_hash: str = ""
+    actions: list[int] = field(default_factory=list)
+    # (step index, actor id, command): applied before the agent action with that index.
+    human_inputs: list[tuple[int, str, str]] = field(default_factory=list)
+    # (step count, state hash) captured after that many agent steps.
+    checkpoints: list[tuple[int, str]] = field(default_factory=list)
+    done: bool = False
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "version": RECORD_VERSION,
+            "preset": self.preset,
+            "seed": self.seed,
+            "mode": self.mode,
+            "mode_params": self.mode_params,
+            "world_hash": self.world_hash,
+            "actions": _encode_actions(self.actions),
+            "steps": len(self.actions),
+            "human_inputs": [list(item) for item in self.human_inputs],
+            "checkpoints": [list(item) for item in self.checkpoints],
+            "done": self.done,
+        }
+
+    @classmethod
+    def from_json(cls, payload: dict[str, Any]) -> EpisodeRecord:
+        version = payload.get("version")
+        if version != RECORD_VERSION:
+            raise ValueError(f"Unsupported episode record version: {version}")
+        return cls(
+            preset=payload["preset"],
+            seed=int(payload["seed"]),
+            mode=payload["mode"],
+            mode_params=dict(payload.get("mode_params") or {}),
+            world_hash=payload.get("world_hash", ""),
+            actions=_decode_actions(payload["actions"]),
+            human_inputs=[(int(idx), str(actor), str(cmd)) for idx, actor, cmd in payload.get("human_inputs", [])],
+            checkpoints=[(int(idx), str(digest)) for idx, digest in payload.get("checkpoints", [])],
+            done=bool(payload.get("done", False)),
+        )
+
+
+def append_record(path: Path, record: EpisodeRecord) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(record.to_json(), separators=(",", ":")) + "\n")
+
+
+def iter_records(path: Path) -> Iterator[EpisodeRecord]:
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield EpisodeRecord.from_json(json.loads(line))
+
+
+class EpisodeRecorder:
+    """Captures one episode at a time from a live ``GridEnv``.
+
+    Call ``begin`` right after ``env.reset()``, ``record_human_input`` for every
+    keyboard command applied to the world and ``record_step`` after each
+    ``env.step``. A state hash is stored every ``checkpoint_interval`` steps.
+    """
+
+    def __init__(self, env: GridEnv, checkpoint_interval: int = 50, out_path: Path | None = None) -> None:
+        self.env = env
+        self.checkpoint_interval = max(1, int(checkpoint_interval))
+        self.out_path = out_path
+        self.current: EpisodeRecord | None = None
+
+    def begin(self) -> EpisodeRecord:
+        if self.current is not None and self.current.actions:
+            self.finish()
+        self.current = EpisodeRecord(
+            preset=self.env.preset,
+            seed=int(self.env.seed_value),
+            mode=self.env.mode.name,
+            mode_params=dict(self.env.mode_params),
+            world_hash=self.env.world_hash,
+        )
+        return self.current
+
+    def record_human_input(self, actor_id: str, command: str) -> None:
+        if self.current is not None:
+            self.current.human_inputs.append((len(self.current.actions), actor_id, command))
+
+    def record_step(self, action: int, done: bool = False) -> None:
+        if self.current is None:
+            return
+        self.current.actions.append(int(action))
+        steps = len(self.current.actions)
+        if done or steps % self.checkpoint_interval == 0:
+            self.current.checkpoints.append((steps, state_hash(self.env)))
+        self.current.done = bool(done)
+
+    def finish(self) -> EpisodeRecord | None:
+        record, self.current = self.current, None
+        if record is not None and self.out_path is not None:
+            append_record(self.out_path, record)
+        return record
+
+
+@dataclass
+class ReplayResult:
+    steps: int
+    checkpoints_verified: int
+    mismatches: list[str] = field(default_factory=list)
+    done: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+
+def replay_record(
+    record: EpisodeRecord,
+    config: AtlasConfig,
+    *,
+    strict: bool = False,
+    on_step: Callable[[GridEnv, dict[str, Any]], None] | None = None,
+) -> ReplayResult:
+    """Re-simulate ``record`` with no rendering and compare state hashes at each checkpoint.
+
+    ``on_step(env, obs)`` is called after every step so callers can regenerate
+    observations or frames on demand. With ``strict=True`` the first mismatch raises.
+    """
+
+    env = GridEnv(config, preset=record.preset, seed=record.seed)
+    env.mode = create_mode(record.mode, record.mode_params)
+    env.mode_params = dict(record.mode_params)
+    env.reset(seed=record.seed)
+    result = ReplayResult(steps=0, checkpoints_verified=0)
+
+    def mismatch(message: str) -> None:
+        if strict:
+            raise ValueError(message)
+        result.mismatches.append(message)
+
+    if record.world_hash and env.world_hash != record.world_hash:
+        mismatch(f"world hash mismatch: recorded {record.world_hash}, replayed {env.world_hash}")
+    expected = dict(record.checkpoints)
+    human_inputs = sorted(record.human_inputs, key=lambda item: item[0])
+    next_input = 0
+    done = False
+    for index, action in enumerate(record.actions):
+        while next_input < len(human_inputs) and human_inputs[next_input][0] <= index:
+            _, actor_id, command = human_inputs[next_input]
+            apply_human_command(env.world, actor_id, command)
+            next_input += 1
+        obs, _reward, done, _truncated, _info = env.step(int(action))
+        result.steps += 1
+        if on_step is not None:
+            on_step(env, obs)
+        digest = expected.get(result.steps)
+        if digest is not None:
+            replayed = state_hash(env)
+            if replayed != digest:
+                mismatch(f"state hash mismatch at step {result.steps}: recorded {digest}, replayed {replayed}")
+            else:
+                result.checkpoints_verified += 1
+    result.done = bool(done)
+    if record.done and not done:
+        mismatch("recorded episode ended but replay did not")
+    return result
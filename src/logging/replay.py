@@ -1,31 +1,207 @@
 from __future__ import annotations
 
+import gzip
+import io
 import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import IO, Sequence
 
 from sqlalchemy import create_engine, select
 from sqlalchemy.orm import Session
 
-from src.logging.schema import Step
+from src.logging.partitions import resolve_db_paths
+from src.logging.schema import Episode, Step
 
 
-def export_steps(db_path: Path, out_path: Path) -> None:
+EXPORT_COLUMNS = (
+    Step.episode_id,
+    Step.tick,
+    Step.obs_json,
+    Step.action_int,
+    Step.reward_float,
+    Step.done_bool,
+    Step.info_json,
+)
+
+
+JSONL_SUFFIXES = (".jsonl", ".jsonl.gz", ".jsonl.zst")
+
+
+def _compression_for(path: Path) -> str | None:
+    return {".gz": "gzip", ".zst": "zstd"}.get(path.suffix.lower())
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise RuntimeError("zstd export requires the 'zstandard' package") from exc
+    return zstandard
+
+
+def is_jsonl_export(path: Path) -> bool:
+    """Whether ``path`` is a JSONL export: ``.jsonl``, ``.jsonl.gz`` or ``.jsonl.zst``."""
+
+    return "".join(Path(path).suffixes[-2:]).lower().endswith(JSONL_SUFFIXES)
+
+
+def open_export(path: Path) -> IO[str]:
+    """Open a JSONL export for reading, decompressing by suffix like ``_open_export`` compresses."""
+
+    path = Path(path)
+    compression = _compression_for(path)
+    if compression == "gzip":
+        return gzip.open(path, "rt", encoding="utf-8")
+    if compression == "zstd":
+        raw = path.open("rb")
+        return io.TextIOWrapper(_zstandard().ZstdDecompressor().stream_reader(raw, closefd=True), encoding="utf-8")
+    return path.open("r", encoding="utf-8")
+
+
+def _open_export(out_path: Path, compression: str | None) -> IO[str]:
+    if compression is None:
+        compression = _compression_for(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    if compression == "gzip":
+        return gzip.open(out_path, "wt", encoding="utf-8", compresslevel=6)
+    if compression == "zstd":
+        raw = out_path.open("wb")
+        return io.TextIOWrapper(_zstandard().ZstdCompressor(level=3).stream_writer(raw, closefd=True), encoding="utf-8")
+    if compression not in (None, "none"):
+        raise ValueError(f"Unsupported compression: {compression}")
+    return out_path.open("w", encoding="utf-8")
+
+
+def _steps_query(
+    episode_ids: Sequence[int] | None = None,
+    mode: str | None = None,
+    tick_range: tuple[int | None, int | None] | None = None,
+):
+    query = select(*EXPORT_COLUMNS)
+    if mode is not None:
+        query = query.join(Episode, Episode.id == Step.episode_id).where(Episode.mode == mode)
+    if episode_ids is not None:
+        query = query.where(Step.episode_id.in_(list(episode_ids)))
+    if tick_range is not None:
+        low, high = tick_range
+        if low is not None:
+            query = query.where(Step.tick >= low)
+        if high is not None:
+            query = query.where(Step.tick < high)
+    return query.order_by(Step.episode_id, Step.tick)
+
+
+def export_steps(
+    db_path: Path,
+    out_path: Path,
+    *,
+    episode_ids: Sequence[int] | None = None,
+    mode: str | None = None,
+    tick_range: tuple[int | None, int | None] | None = None,
+    compression: str | None = None,
+    chunk_size: int = 1000,
+) -> int:
+    """Stream steps to JSONL without materialising the table; returns the number of rows written.
+
+    Rows are fetched ``chunk_size`` at a time as plain column tuples. ``tick_range``
+    is half-open ``[low, high)``; compression defaults from the suffix (``.gz``, ``.zst``).
+    """
+
+    written = 0
+    with _open_export(out_path, compression) as handle:
+        for partition in resolve_db_paths(db_path, episode_ids=episode_ids, mode=mode):
+            written += _write_steps(handle, partition, _steps_query(episode_ids, mode, tick_range), chunk_size)
+    return written
+
+
+def _write_steps(handle: IO[str], db_path: Path, query, chunk_size: int) -> int:
     engine = create_engine(f"sqlite:///{db_path}")
-    with Session(engine) as session:
-        steps = session.execute(select(Step)).scalars().all()
-    with out_path.open("w", encoding="utf-8") as handle:
-        for step in steps:
-            handle.write(
-                json.dumps(
-                    {
-                        "episode_id": step.episode_id,
-                        "tick": step.tick,
-                        "obs": step.obs_json,
-                        "action": step.action_int,
-                        "reward": step.reward_float,
-                        "done": step.done_bool,
-                        "info": step.info_json,
-                    }
+    written = 0
+    try:
+        with engine.connect() as connection:
+            result = connection.execution_options(stream_results=True, yield_per=chunk_size).execute(query)
+            for episode_id, tick, obs_json, action, reward, done, info_json in result:
+                handle.write(
+                    json.dumps(
+                        {
+                            "episode_id": episode_id,
+                            "tick": tick,
+                            "obs": obs_json,
+                            "action": action,
+                            "reward": reward,
+                            "done": done,
+                            "info": info_json,
+                        }
+                    )
+                    + "\n"
                 )
-                + "\n"
-            )
+                written += 1
+    finally:
+        engine.dispose()
+    return written
+
+
+def _export_episode_shard(args: tuple[Path, Path, int, tuple[int | None, int | None] | None, str | None]) -> tuple[int, int]:
+    db_path, out_path, episode_id, tick_range, compression = args
+    return episode_id, export_steps(db_path, out_path, episode_ids=[episode_id], tick_range=tick_range, compression=compression)
+
+
+def export_steps_sharded(
+    db_path: Path,
+    out_dir: Path,
+    *,
+    episode_ids: Sequence[int] | None = None,
+    mode: str | None = None,
+    tick_range: tuple[int | None, int | None] | None = None,
+    compression: str | None = None,
+    workers: int = 4,
+) -> dict[int, Path]:
+    """Export one JSONL shard per episode, in parallel worker processes."""
+
+    selected: list[int] = []
+    for partition in resolve_db_paths(db_path, episode_ids=episode_ids, mode=mode):
+        engine = create_engine(f"sqlite:///{partition}")
+        try:
+            with Session(engine) as session:
+                query = select(Episode.id).order_by(Episode.id)
+                if mode is not None:
+                    query = query.where(Episode.mode == mode)
+                if episode_ids is not None:
+                    query = query.where(Episode.id.in_(list(episode_ids)))
+                selected.extend(session.execute(query).scalars())
+        finally:
+            engine.dispose()
+    suffix = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}.get(compression or "", ".jsonl")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = [(db_path, out_dir / f"episode_{episode_id:06d}{suffix}", episode_id, tick_range, compression) for episode_id in selected]
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            _export_episode_shard(job)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_export_episode_shard, jobs))
+    return {job[2]: job[1] for job in jobs}
+
+
+def load_episode_actions(db_path: Path, episode_id: int | None = None) -> tuple[dict, list[int]]:
+    """Return the episode header (preset, seed, mode) and its logged actions in tick order.
+
+    Without ``episode_id`` the most recent episode is used.
+    """
+
+    partitions = resolve_db_paths(db_path, episode_ids=[episode_id] if episode_id is not None else None)
+    if not partitions:
+        raise ValueError(f"No episode found in {db_path} (episode_id={episode_id})")
+    engine = create_engine(f"sqlite:///{partitions[-1]}")
+    with Session(engine) as session:
+        query = select(Episode)
+        query = query.where(Episode.id == episode_id) if episode_id is not None else query.order_by(Episode.id.desc())
+        episode = session.execute(query.limit(1)).scalars().first()
+        if episode is None:
+            raise ValueError(f"No episode found in {db_path} (episode_id={episode_id})")
+        actions = session.execute(
+            select(Step.action_int).where(Step.episode_id == episode.id).order_by(Step.tick)
+        ).scalars().all()
+        header = {"id": episode.id, "preset": episode.preset, "seed": episode.seed, "mode": episode.mode}
+    return header, [int(action) for action in actions]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Boolean, Column, Float, Integer, String, Text
+from sqlalchemy import Boolean, Column, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
@@ -16,12 +16,15 @@ class Episode(Base):
     started_at = Column(String(64))
     curriculum_stage = Column(String(64))
     stage_transition_reason = Column(Text)
+    worker_id = Column(String(64))
+
+    __table_args__ = (Index("ix_episodes_mode", "mode"),)
 
 
 class Step(Base):
     __tablename__ = "steps"
     id = Column(Integer, primary_key=True)
-    episode_id = Column(Integer)
+    episode_id = Column(Integer, ForeignKey("episodes.id"))
     tick = Column(Integer)
     obs_json = Column(Text)
     action_int = Column(Integer)
@@ -31,39 +34,50 @@ class Step(Base):
     done_bool = Column(Boolean)
     info_json = Column(Text)
 
+    __table_args__ = (Index("ix_steps_episode_tick", "episode_id", "tick"),)
+
 
 class Event(Base):
     __tablename__ = "events"
     id = Column(Integer, primary_key=True)
-    episode_id = Column(Integer)
+    episode_id = Column(Integer, ForeignKey("episodes.id"))
     tick = Column(Integer)
     type = Column(String(64))
     payload_json = Column(Text)
 
+    __table_args__ = (
+        Index("ix_events_episode_tick", "episode_id", "tick"),
+        Index("ix_events_type_episode", "type", "episode_id"),
+    )
+
 
 class HumanAction(Base):
     __tablename__ = "human_actions"
     id = Column(Integer, primary_key=True)
-    episode_id = Column(Integer)
+    episode_id = Column(Integer, ForeignKey("episodes.id"))
     tick = Column(Integer)
     action_int = Column(Integer)
     obs_json = Column(Text)
 
+    __table_args__ = (Index("ix_human_actions_episode_tick", "episode_id", "tick"),)
+
 
 class AtlasMessage(Base):
     __tablename__ = "atlas_messages"
     id = Column(Integer, primary_key=True)
-    episode_id = Column(Integer)
+    episode_id = Column(Integer, ForeignKey("episodes.id"))
     tick = Column(Integer)
     msg_type = Column(String(64))
     text = Column(Text)
     metadata_json = Column(Text)
 
+    __table_args__ = (Index("ix_atlas_messages_episode_tick", "episode_id", "tick"),)
+
 
 class HumanFeedback(Base):
     __tablename__ = "human_feedback"
     id = Column(Integer, primary_key=True)
-    episode_id = Column(Integer)
+    episode_id = Column(Integer, ForeignKey("episodes.id"))
     tick = Column(Integer)
     target = Column(String(64))
     msg_type = Column(String(64))
@@ -71,12 +85,16 @@ class HumanFeedback(Base):
     correction_text = Column(Text)
     state_features_json = Column(Text)
 
+    __table_args__ = (Index("ix_human_feedback_episode_tick", "episode_id", "tick"),)
+
 
 class ReplayBufferStat(Base):
     __tablename__ = "replay_buffer_stats"
     id = Column(Integer, primary_key=True)
-    episode_id = Column(Integer)
+    episode_id = Column(Integer, ForeignKey("episodes.id"))
     tick = Column(Integer)
     total_transitions = Column(Integer)
     sample_entropy = Column(Float)
     mode_coverage_json = Column(Text)
+
+    __table_args__ = (Index("ix_replay_buffer_stats_episode_tick", "episode_id", "tick"),)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import threading
 from datetime import datetime
 from pathlib import Path
 
@@ -11,22 +12,40 @@ from dotenv import load_dotenv
 
 from src.agent.trainer import AtlasTrainer
 from src.config import DEFAULT_CONFIG_PATH, load_config
+from src.core.timebase import LoopScheduler
 from src.console import Console
 from src.env.grid_env import GridEnv
 from src.env import encoding
 from src.human.input_keyboard import KeyboardController
 from src.human.chat_ui import format_action_choices, parse_human_action_choice
 from src.agent.preference_reward import extract_state_features, parse_scored_feedback
-from src.agent.offline_rl import load_offline_transitions
-from src.logging.db import DBLogger, write_eval_trend_report, write_offline_comparison_report
-from src.logging.replay import export_steps
+from src.agent.offline_rl import stream_offline_transitions
+from src.logging.db import write_eval_trend_report, write_offline_comparison_report
+from src.logging.partitions import open_db_logger
+from src.logging.migrations import benchmark_queries, migrate_database
+from src.logging.recording import EpisodeRecorder, iter_records, replay_record
+from src.logging.columnar import export_columnar
+from src.logging.replay import export_steps, export_steps_sharded, load_episode_actions
+from src.render.frame_capture import FrameRenderer, open_frame_writer
 from src.render.renderer import Renderer
 from src.eval.harness import DeterministicEvalHarness
-from src.runtime.inference import export_policy_artifact, load_runtime_policy
+from src.runtime.fast_path import benchmark_predict_latency
+from src.runtime.inference import export_policy_artifact, load_artifact_model, load_runtime_policy
+from src.runtime.server import load_inference_server
+from src.runtime.worker import PolicyWorker
+
+
+NOOP_ACTION = 0
 
 
 class AtlasGame:
-    def __init__(self, config_path: Path | None = None, strict_safety: bool = False) -> None:
+    def __init__(
+        self,
+        config_path: Path | None = None,
+        strict_safety: bool = False,
+        fast_inference: bool = False,
+        record_path: Path | None = None,
+    ) -> None:
         self.config = load_config(config_path)
         self.env = GridEnv(self.config, strict_safety=strict_safety)
         self.console = Console()
@@ -47,7 +66,9 @@ class AtlasGame:
         self.console_keys: set[int] = set()
         self.trainer = AtlasTrainer(self.config, Path("checkpoints"))
         self.trainer.load(self.env)
-        self.db = DBLogger(Path("atlas.db"))
+        if fast_inference:
+            self.trainer.enable_fast_inference()
+        self.db = open_db_logger(self.config.logging)
         self.db.start_episode(
             self.env.preset,
             self.env.seed_value,
@@ -57,6 +78,15 @@ class AtlasGame:
         )
         self.recurrent_state = None
         self.episode_start = True
+        self.episode_index = 0
+        self.obs: dict = {}
+        self.pending_action: int | None = None
+        # The last agent decision, still absorbing the reward of the filler NOOP steps that follow it.
+        self.open_transition: dict | None = None
+        # Its ``steps`` row extras: the last step's info and the folded reward terms.
+        self.open_log: dict | None = None
+        self.policy_worker: PolicyWorker | None = None
+        self.recorder = EpisodeRecorder(self.env, out_path=record_path) if record_path else None
         self.last_stuck_state = False
         self.last_uncertainty = 0.0
 
@@ -81,26 +111,38 @@ class AtlasGame:
         progression = self.trainer.snapshot_progression(self.env.world.atlas)
         self.env.preset = preset
         self.env.seed_value = seed
-        self.env.reset(seed=seed)
+        obs, _ = self.env.reset(seed=seed)
         self.trainer.restore_progression(self.env.world.atlas, progression)
         self.keyboard.world = self.env.world
+        self._begin_episode(obs)
 
     def reset_episode(self) -> None:
-        self.env.reset()
+        obs, _ = self.env.reset()
         self.keyboard.world = self.env.world
-        self.episode_start = True
+        self._begin_episode(obs)
         self.trainer.reset_dagger()
 
     def set_seed(self, seed: int) -> None:
         progression = self.trainer.snapshot_progression(self.env.world.atlas)
         self.config.training.seed = seed
         self.env.seed_value = seed
-        self.env.reset(seed=seed)
+        obs, _ = self.env.reset(seed=seed)
         self.trainer.restore_progression(self.env.world.atlas, progression)
         self.keyboard.world = self.env.world
-        self.episode_start = True
+        self._begin_episode(obs)
         self.trainer.reset_dagger()
 
+    def _begin_episode(self, obs: dict) -> None:
+        # Bumping the index makes any in-flight worker prediction for the old episode stale.
+        self.obs = obs
+        self.episode_start = True
+        self.episode_index += 1
+        self.pending_action = None
+        self.open_transition = None
+        self.open_log = None
+        if self.recorder is not None:
+            self.recorder.begin()
+
     def save(self) -> None:
         self.trainer.save()
         save_payload = {
@@ -162,6 +204,143 @@ class AtlasGame:
         self.env.world.messages.append(("Atlas", f"Preference gespeichert: {score:+d} für '{text_for_model}'."))
         return True
 
+    def _simulation_active(self) -> bool:
+        return not self.ai_paused and not self.waiting_for_response
+
+    def _agent_tick(self) -> None:
+        if self.policy_worker is not None:
+            if not self.policy_worker.busy:
+                self.policy_worker.submit(self.obs, self.recurrent_state, self.episode_start, tag=self.episode_index)
+            return
+        action, self.recurrent_state = self.trainer.predict(self.obs, state=self.recurrent_state, mask=self.episode_start)
+        self.pending_action = int(action)
+        self.episode_start = False
+
+    def _collect_policy_result(self) -> None:
+        if self.policy_worker is None:
+            return
+        result = self.policy_worker.poll()
+        if result is None:
+            return
+        action, state, tag = result
+        if tag != self.episode_index:
+            return
+        self.recurrent_state = state
+        self.pending_action = int(action)
+        self.episode_start = False
+
+    def _env_tick(self) -> None:
+        agent_action = self.pending_action
+        self.pending_action = None
+        action = NOOP_ACTION if agent_action is None else agent_action
+        current_obs = self.obs
+        action_name = encoding.ACTION_MEANINGS.get(int(action), f"Action {int(action)}")
+        predicted_preference = self.trainer.preference_reward(current_obs, action_name)
+        obs, reward, done, _, info = self.env.step(int(action), preference_reward=predicted_preference)
+        self.obs = obs
+        if self.recorder is not None:
+            self.recorder.record_step(int(action), done=bool(done))
+        self.last_reward_terms = info.get("reward_terms", {})
+        if agent_action is not None:
+            self._flush_transition()
+            self.open_transition = {
+                "mode_name": self.env.mode.name,
+                "obs": current_obs,
+                "action": int(action),
+                "reward": float(reward),
+                "next_obs": obs,
+                "done": bool(done),
+            }
+            self.open_log = {"info": info, "reward_terms": dict(self.last_reward_terms)}
+        elif self.open_transition is not None:
+            self.open_transition["reward"] += float(reward)
+            self.open_transition["next_obs"] = obs
+            self.open_transition["done"] = bool(done)
+            self.open_log["info"] = info
+            folded = self.open_log["reward_terms"]
+            for name, value in self.last_reward_terms.items():
+                folded[name] = folded.get(name, 0.0) + float(value)
+        if done:
+            self._flush_transition()
+        if agent_action is not None:
+            self.last_action_name = action_name
+            progress_signal = float(self.last_reward_terms.get("progress", 0.0))
+            atlas_pos = (int(self.env.world.atlas.pos.x), int(self.env.world.atlas.pos.y))
+            self.last_stuck_state = self.trainer.update_stuck_state(atlas_pos, progress_signal, done=bool(done))
+            action_mask = obs.get("action_mask")
+            if action_mask is not None:
+                valid_actions = int(action_mask.sum())
+                if valid_actions > 0:
+                    uniform_probs = [1.0 / valid_actions if allowed else 0.0 for allowed in action_mask]
+                    self.last_uncertainty = self.trainer.dagger.entropy_from_probs(uniform_probs)
+                else:
+                    self.last_uncertainty = 0.0
+            if self.ai_mode == "query" and self.trainer.should_query_human(stuck=self.last_stuck_state, uncertainty=self.last_uncertainty):
+                self._request_dagger_action(obs)
+        self.subgoal_text = self.trainer.update_goals(self.env.mode.name, self.env.mode.info())
+        if done:
+            obs, _ = self.env.reset()
+            self.keyboard.world = self.env.world
+            self._begin_episode(obs)
+
+    def _flush_transition(self) -> None:
+        """Log the open agent transition, with its folded filler rewards, and hand it to the trainer.
+
+        One ``steps`` row per agent decision: the observation it was taken on, the
+        reward summed over the filler NOOP steps that followed, and the final ``done``.
+        """
+
+        transition = self.open_transition
+        if transition is None:
+            return
+        log = self.open_log
+        self.db.log_step(
+            transition["obs"],
+            transition["action"],
+            transition["reward"],
+            transition["done"],
+            log["info"],
+            log["reward_terms"],
+        )
+        if self.db.tick % 100 == 0:
+            self.db.log_replay_buffer_stats(self.trainer.replay_buffer_stats())
+        self.trainer.record_transition(**transition)
+        self.open_transition = None
+        self.open_log = None
+
+    def _start_loop(self, threaded_inference: bool) -> None:
+        obs, _ = self.env.reset()
+        self._begin_episode(obs)
+        self.trainer.reset_dagger()
+        self.subgoal_text = self.trainer.update_goals(self.env.mode.name, self.env.mode.info())
+        self.policy_worker = PolicyWorker(self.trainer.predict) if threaded_inference else None
+
+    def _stop_loop(self) -> None:
+        self._flush_transition()
+        if self.recorder is not None:
+            self.recorder.finish()
+        if self.policy_worker is not None:
+            self.policy_worker.close()
+            self.policy_worker = None
+
+    def run_headless(self, steps: int) -> None:
+        """Run agent and env ticks with no window and no sleeping, keeping the configured rate ratio."""
+
+        timing = self.config.timing
+        scheduler = LoopScheduler({"agent": timing.agent_step_hz, "env": timing.env_step_hz}, headless=True)
+        self._start_loop(threaded_inference=False)
+        env_steps = 0
+        while env_steps < steps:
+            due = scheduler.tick()
+            if due["agent"] and self._simulation_active():
+                self._agent_tick()
+            for _ in range(due["env"]):
+                if env_steps >= steps:
+                    break
+                self._env_tick()
+                env_steps += 1
+        self._stop_loop()
+
     def run(self) -> None:
         pygame.init()
         self.console_keys = self._console_key_codes()
@@ -170,13 +349,14 @@ class AtlasGame:
         height = self.config.world.height
         surface = self._create_display(width, height, tile_size)
         pygame.display.set_caption("Atlas RL Grid")
-        clock = pygame.time.Clock()
         self.renderer = Renderer(tile_size, width, height)
+        timing = self.config.timing
+        scheduler = LoopScheduler(
+            {"agent": timing.agent_step_hz, "env": timing.env_step_hz, "render": self.config.rendering.fps}
+        )
 
         running = True
-        obs, _ = self.env.reset()
-        self.trainer.reset_dagger()
-        self.subgoal_text = self.trainer.update_goals(self.env.mode.name, self.env.mode.info())
+        self._start_loop(threaded_inference=timing.threaded_inference)
         while running:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -192,20 +372,20 @@ class AtlasGame:
                     elif self.chat_active:
                         if self.waiting_for_response:
                             self.chat_active = False
-                            self._handle_human_query_response(obs)
+                            self._handle_human_query_response(self.obs)
                         else:
                             message = self.chat_buffer.strip()
                             if message:
                                 self.env.world.messages.append(("Human", message))
                                 if self.env.world.pending_question:
                                     self.env.world.pending_question = False
-                                self._handle_preference_feedback(obs, message)
+                                self._handle_preference_feedback(self.obs, message)
                             self.chat_buffer = ""
                             self.chat_active = False
                     else:
                         self.chat_active = not self.chat_active
                         if not self.chat_active and self.waiting_for_response:
-                            self._handle_human_query_response(obs)
+                            self._handle_human_query_response(self.obs)
                 elif event.type == pygame.KEYDOWN and event.key == pygame.K_TAB:
                     self.ai_paused = not self.ai_paused
                 elif event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
@@ -238,7 +418,9 @@ class AtlasGame:
                                 demo_obs = self.env._obs()
                                 self.db.log_human_action(demo_obs, action)
                                 self.trainer.record_human_action(demo_obs, action)
-                        self.keyboard.handle_event(event)
+                        command = self.keyboard.handle_event(event)
+                        if command is not None and self.recorder is not None:
+                            self.recorder.record_human_input(self.keyboard.target_id, command)
                 elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     if self.console.active:
                         mouse_x, mouse_y = event.pos
@@ -249,77 +431,53 @@ class AtlasGame:
                             grid_y = mouse_y // tile_size
                             self.console.last_message = self.env.world.describe_at((grid_x, grid_y))
 
-            if not self.ai_paused and not self.waiting_for_response:
-                action, self.recurrent_state = self.trainer.predict(obs, state=self.recurrent_state, mask=self.episode_start)
-                current_obs = obs
-                action_name = encoding.ACTION_MEANINGS.get(int(action), f"Action {int(action)}")
-                predicted_preference = self.trainer.preference_reward(current_obs, action_name)
-                obs, reward, done, _, info = self.env.step(int(action), preference_reward=predicted_preference)
-                self.trainer.record_transition(
-                    mode_name=self.env.mode.name,
-                    obs=current_obs,
-                    action=int(action),
-                    reward=float(reward),
-                    next_obs=obs,
-                    done=bool(done),
-                )
-                self.last_action_name = action_name
-                self.last_reward_terms = info.get("reward_terms", {})
-                progress_signal = float(self.last_reward_terms.get("progress", 0.0))
-                atlas_pos = (int(self.env.world.atlas.pos.x), int(self.env.world.atlas.pos.y))
-                self.last_stuck_state = self.trainer.update_stuck_state(atlas_pos, progress_signal, done=bool(done))
-                action_mask = obs.get("action_mask")
-                if action_mask is not None:
-                    valid_actions = int(action_mask.sum())
-                    if valid_actions > 0:
-                        uniform_probs = [1.0 / valid_actions if allowed else 0.0 for allowed in action_mask]
-                        self.last_uncertainty = self.trainer.dagger.entropy_from_probs(uniform_probs)
-                    else:
-                        self.last_uncertainty = 0.0
-                if self.ai_mode == "query" and self.trainer.should_query_human(stuck=self.last_stuck_state, uncertainty=self.last_uncertainty):
-                    self._request_dagger_action(obs)
-                self.subgoal_text = self.trainer.update_goals(self.env.mode.name, self.env.mode.info())
-                self.db.log_step(obs, int(action), float(reward), bool(done), info, self.last_reward_terms)
-                if self.db.tick % 100 == 0:
-                    self.db.log_replay_buffer_stats(self.trainer.replay_buffer_stats())
-                self.episode_start = done
-                if done:
-                    obs, _ = self.env.reset()
-                    self.keyboard.world = self.env.world
-
-            if self.renderer:
-                self.renderer.render(
-                    surface,
-                    self.env.world,
-                    self.env.mode.name,
-                    self.env.world.messages,
-                    goal_text=self.goal_text,
-                    ai_mode=self.ai_mode,
-                    waiting_for_response=self.waiting_for_response,
-                    debug_hud=self.show_debug_hud,
-                    last_action=self.last_action_name,
-                    reward_terms=self.last_reward_terms,
-                    subgoal_text=self.subgoal_text,
-                    mode_info=self.env.mode.info(),
-                )
-                font = self.renderer.font
-                ui = self.renderer.ui
-                max_text_width = surface.get_width() - 8
-                chat_bottom = self.renderer.last_chat_bottom
-                if self.console.active:
-                    input_y = max(chat_bottom + 6, self.config.world.height * tile_size + 70)
-                    ui.draw_wrapped_text(surface, "> " + self.console.buffer, (4, input_y), max_text_width, (200, 200, 200))
-                    if self.console.last_message:
-                        output_y = input_y + font.get_linesize() * 2
-                        ui.draw_wrapped_text(surface, self.console.last_message, (4, output_y), max_text_width, (120, 200, 120))
-                if self.chat_active:
-                    input_y = max(chat_bottom + 6, self.config.world.height * tile_size + 50)
-                    ui.draw_wrapped_text(surface, "Chat: " + self.chat_buffer, (4, input_y), max_text_width, (200, 200, 200))
-
-            pygame.display.flip()
-            clock.tick(self.config.rendering.fps)
+            due = scheduler.tick()
+            self._collect_policy_result()
+            if self._simulation_active():
+                if due["agent"]:
+                    self._agent_tick()
+                for _ in range(due["env"]):
+                    self._env_tick()
+                    if not self._simulation_active():
+                        break
+
+            if due["render"] and self.renderer:
+                pygame.display.update(self._render_frame(surface))
+            scheduler.sleep_until_next()
+        self._stop_loop()
         pygame.quit()
 
+    def _render_frame(self, surface: pygame.Surface) -> list[pygame.Rect]:
+        tile_size = self.config.rendering.tile_size
+        rects = self.renderer.render(
+            surface,
+            self.env.world,
+            self.env.mode.name,
+            self.env.world.messages,
+            goal_text=self.goal_text,
+            ai_mode=self.ai_mode,
+            waiting_for_response=self.waiting_for_response,
+            debug_hud=self.show_debug_hud,
+            last_action=self.last_action_name,
+            reward_terms=self.last_reward_terms,
+            subgoal_text=self.subgoal_text,
+            mode_info=self.env.mode.info(),
+        )
+        font = self.renderer.font
+        ui = self.renderer.ui
+        max_text_width = surface.get_width() - 8
+        chat_bottom = self.renderer.last_chat_bottom
+        if self.console.active:
+            input_y = max(chat_bottom + 6, self.config.world.height * tile_size + 70)
+            ui.draw_wrapped_text(surface, "> " + self.console.buffer, (4, input_y), max_text_width, (200, 200, 200))
+            if self.console.last_message:
+                output_y = input_y + font.get_linesize() * 2
+                ui.draw_wrapped_text(surface, self.console.last_message, (4, output_y), max_text_width, (120, 200, 120))
+        if self.chat_active:
+            input_y = max(chat_bottom + 6, self.config.world.height * tile_size + 50)
+            ui.draw_wrapped_text(surface, "Chat: " + self.chat_buffer, (4, input_y), max_text_width, (200, 200, 200))
+        return rects
+
     def _console_key_codes(self) -> set[int]:
         keys: set[int] = set()
         for name in self.config.controls.console:
@@ -346,10 +504,10 @@ def _apply_curriculum_stage(env: GridEnv, trainer: AtlasTrainer) -> None:
 
 def train_headless(config_path: Path | None, steps: int) -> None:
     config = load_config(config_path)
-    env = GridEnv(config)
+    env = GridEnv(config, lean_info=config.training.lean_info)
     trainer = AtlasTrainer(config, Path("checkpoints"))
     trainer.load(env)
-    db = DBLogger(Path("atlas.db"))
+    db = open_db_logger(config.logging)
 
     chunk_steps = max(2000, min(5000, steps // 4 if steps > 0 else 2000))
     remaining = steps
@@ -407,8 +565,115 @@ def resume_training(config_path: Path | None, steps: int) -> None:
     train_headless(config_path, steps)
 
 
-def export_replay(db_path: Path, out_path: Path) -> None:
-    export_steps(db_path, out_path)
+def export_replay(
+    db_path: Path,
+    out_path: Path,
+    episode_ids: list[int] | None = None,
+    mode: str | None = None,
+    tick_range: tuple[int | None, int | None] | None = None,
+    compression: str | None = None,
+    workers: int = 1,
+) -> None:
+    filters = {"episode_ids": episode_ids, "mode": mode, "tick_range": tick_range, "compression": compression}
+    if workers > 1:
+        shards = export_steps_sharded(db_path, out_path, workers=workers, **filters)
+        print(f"Exported {len(shards)} episode shards to {out_path}")
+        return
+    rows = export_steps(db_path, out_path, **filters)
+    print(f"Exported {rows} steps to {out_path}")
+
+
+def run_export_columnar(
+    db_path: Path,
+    out_dir: Path,
+    episode_ids: list[int] | None = None,
+    mode: str | None = None,
+    row_group_size: int = 65536,
+    file_format: str = "npy",
+) -> None:
+    manifest = export_columnar(
+        db_path, out_dir, episode_ids=episode_ids, mode=mode, row_group_size=row_group_size, file_format=file_format
+    )
+    for table, meta in manifest["tables"].items():
+        print(f"{table}: {meta['rows']} rows in {len(meta['row_groups'])} row groups")
+    print(f"Columnar export written to {out_dir}")
+
+
+def run_db_migrate(db_path: Path, benchmark: bool = False, out_path: Path = Path("reports/db_queries.json")) -> None:
+    """Migrate a log DB in place; with ``benchmark`` time the common queries before and after."""
+
+    if not db_path.exists():
+        raise FileNotFoundError(f"Database not found: {db_path}")
+    before = benchmark_queries(db_path) if benchmark else None
+    applied = migrate_database(db_path)
+    print("\n".join(f"  {step}" for step in applied) if applied else "  already up to date")
+    if before is None:
+        return
+    before_by_query = {row["query"]: row for row in before}
+    rows = []
+    for new in benchmark_queries(db_path):
+        old = before_by_query.get(new["query"])
+        if old is None:
+            continue
+        rows.append(
+            {
+                "query": old["query"],
+                "before_ms": old["best_ms"],
+                "after_ms": new["best_ms"],
+                "index_before": old["uses_index"],
+                "index_after": new["uses_index"],
+            }
+        )
+        print(f"{old['query']:>24}: {old['best_ms']:.3f}ms -> {new['best_ms']:.3f}ms")
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps({"applied": applied, "rows": rows}, indent=2), encoding="utf-8")
+    print(f"Query benchmark report: {out_path}")
+
+
+def run_replay(config_path: Path | None, record_path: Path, index: int | None = None, strict: bool = False) -> bool:
+    config = load_config(config_path)
+    all_ok = True
+    for idx, record in enumerate(iter_records(record_path)):
+        if index is not None and idx != index:
+            continue
+        result = replay_record(record, config, strict=strict)
+        status = "ok" if result.ok else "MISMATCH"
+        print(
+            f"[{idx}] {record.preset}/{record.mode} seed={record.seed} steps={result.steps} "
+            f"checkpoints={result.checkpoints_verified}/{len(record.checkpoints)} {status}"
+        )
+        for message in result.mismatches:
+            print(f"    {message}")
+        all_ok = all_ok and result.ok
+    return all_ok
+
+
+def run_render_episode(
+    config_path: Path | None,
+    db_path: Path,
+    out_path: Path,
+    episode_id: int | None = None,
+    tile_size: int = 8,
+) -> int:
+    """Re-simulate a logged episode from its preset, seed, mode and actions and encode its frames offscreen."""
+
+    config = load_config(config_path)
+    header, actions = load_episode_actions(db_path, episode_id)
+    env = GridEnv(config, preset=header["preset"] or "floating_islands", seed=header["seed"])
+    env.reset(seed=header["seed"])
+    if header["mode"]:
+        env.set_mode(header["mode"])
+    renderer = FrameRenderer(tile_size)
+    with open_frame_writer(out_path, fps=config.timing.env_step_hz) as writer:
+        writer.write(renderer.render(env.world))
+        for action in actions:
+            _obs, _reward, done, _truncated, _info = env.step(action)
+            writer.write(renderer.render(env.world))
+            if done:
+                env.reset()
+        frames = writer.frames
+    print(f"Rendered {frames} frames of episode {header['id']} to {out_path}")
+    return frames
 
 
 
@@ -421,10 +686,19 @@ def run_policy_export(config_path: Path | None, checkpoint: Path, out_dir: Path)
     print(f"Policy artifact exported: {manifest_path}")
 
 
-def run_inference(config_path: Path | None, artifact_dir: Path, steps: int = 100) -> None:
+def run_inference(
+    config_path: Path | None,
+    artifact_dir: Path,
+    steps: int = 100,
+    fast_path: bool = False,
+    torch_threads: int | None = 1,
+    traced: bool = False,
+) -> None:
     config = load_config(config_path)
     env = GridEnv(config)
     runtime = load_runtime_policy(artifact_dir, env)
+    if fast_path:
+        runtime.enable_fast_path(num_threads=torch_threads, traced=traced)
     obs, _ = env.reset(seed=config.training.seed)
     for _ in range(steps):
         action = runtime.predict(obs, deterministic=True)
@@ -434,12 +708,73 @@ def run_inference(config_path: Path | None, artifact_dir: Path, steps: int = 100
             obs, _ = env.reset(seed=config.training.seed)
     print(f"Inference run completed for {steps} steps.")
 
+
+def run_multi_session_inference(
+    config_path: Path | None,
+    artifact_dir: Path,
+    steps: int = 100,
+    sessions: int = 4,
+    max_batch_wait_ms: float = 2.0,
+) -> None:
+    config = load_config(config_path)
+    envs = [GridEnv(config) for _ in range(sessions)]
+    server = load_inference_server(artifact_dir, envs[0], max_batch_size=sessions, max_batch_wait_ms=max_batch_wait_ms)
+
+    def _client(index: int) -> None:
+        env = envs[index]
+        policy = server.session(f"client-{index}")
+        obs, _ = env.reset(seed=config.training.seed + index)
+        for _ in range(steps):
+            action = policy.predict(obs, deterministic=True)
+            obs, _reward, done, _truncated, _info = env.step(action)
+            if done:
+                policy.mark_episode_done()
+                obs, _ = env.reset(seed=config.training.seed + index)
+
+    with server:
+        threads = [threading.Thread(target=_client, args=(idx,)) for idx in range(sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = server.stats()
+    print(f"Inference run completed for {sessions} sessions x {steps} steps.")
+    print(json.dumps(stats, indent=2))
+
+def run_inference_benchmark(
+    config_path: Path | None,
+    artifact_dir: Path,
+    iterations: int = 500,
+    torch_threads: int | None = 1,
+    out_path: Path = Path("reports/inference_latency.json"),
+) -> None:
+    config = load_config(config_path)
+    env = GridEnv(config)
+    model = load_artifact_model(artifact_dir, env)
+    observations = []
+    obs, _ = env.reset(seed=config.training.seed)
+    for _ in range(64):
+        observations.append(obs)
+        obs, _reward, done, _truncated, _info = env.step(int(env.action_space.sample()))
+        if done:
+            obs, _ = env.reset(seed=config.training.seed)
+    rows = benchmark_predict_latency(model, observations, iterations=iterations, num_threads=torch_threads)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps({"rows": rows}, indent=2), encoding="utf-8")
+    for row in rows:
+        print(f"{row['path']:>18}: p50={row['p50_ms']:.3f}ms p99={row['p99_ms']:.3f}ms")
+    print(f"Inference latency report: {out_path}")
+
+
 def run_offline_finetune(
     config_path: Path | None,
     data_path: Path,
     steps: int,
     algorithm: str,
     checkpoint: Path | None = None,
+    shuffle_buffer: int = 4096,
+    chunk_size: int = 1024,
+    parse_workers: int = 0,
 ) -> None:
     config = load_config(config_path)
     env = GridEnv(config)
@@ -447,8 +782,8 @@ def run_offline_finetune(
     trainer.load(env)
     if checkpoint is not None and checkpoint.exists():
         trainer.model = RecurrentPPO.load(checkpoint, env=env)
-    transitions = load_offline_transitions(data_path)
-    if not transitions:
+    transitions = stream_offline_transitions(data_path, chunk_size=chunk_size, parse_workers=parse_workers)
+    if transitions.is_empty():
         raise RuntimeError(f"No offline transitions found in {data_path}")
 
     harness = DeterministicEvalHarness(config, Path("checkpoints"))
@@ -461,6 +796,7 @@ def run_offline_finetune(
         transitions=transitions,
         total_steps=steps,
         algorithm=algorithm,
+        shuffle_buffer_size=shuffle_buffer,
     )
     trainer.save()
 
@@ -487,7 +823,7 @@ def run_offline_finetune(
 
     report_path = Path("reports/offline_vs_online.json")
     write_offline_comparison_report(comparison_rows, report_path)
-    print(f"Offline fine-tuning complete with {len(transitions)} transitions. Report: {report_path}")
+    print(f"Offline fine-tuning complete with {transitions.reward_stats.count} transitions streamed. Report: {report_path}")
 
 
 def run_eval(config_path: Path | None, checkpoint_paths: list[Path] | None = None) -> None:
@@ -516,6 +852,10 @@ def main() -> None:
     subparsers = parser.add_subparsers(dest="command")
 
     run_cmd = subparsers.add_parser("run")
+    run_cmd.add_argument("--fast-inference", action="store_true", help="Use the torch inference fast path for Atlas.")
+    run_cmd.add_argument("--headless", action="store_true", help="Simulate without a window as fast as possible.")
+    run_cmd.add_argument("--steps", type=int, default=1000, help="Env steps to simulate with --headless.")
+    run_cmd.add_argument("--record", type=Path, default=None, help="Append compact episode recordings to this JSONL file.")
     run_cmd.set_defaults(command="run")
 
     train_cmd = subparsers.add_parser("train")
@@ -526,11 +866,41 @@ def main() -> None:
 
     export_cmd = subparsers.add_parser("export")
     export_cmd.add_argument("--db", type=Path, default=Path("atlas.db"))
-    export_cmd.add_argument("--out", type=Path, default=Path("replay.jsonl"))
+    export_cmd.add_argument("--out", type=Path, default=Path("replay.jsonl"), help="Output file, or directory with --workers > 1.")
+    export_cmd.add_argument("--episode", type=int, nargs="*", default=None)
+    export_cmd.add_argument("--mode", default=None)
+    export_cmd.add_argument("--tick-min", type=int, default=None)
+    export_cmd.add_argument("--tick-max", type=int, default=None, help="Exclusive upper tick bound.")
+    export_cmd.add_argument("--compression", choices=["none", "gzip", "zstd"], default=None)
+    export_cmd.add_argument("--workers", type=int, default=1, help="Write one shard per episode using N processes.")
+
+    migrate_cmd = subparsers.add_parser("db-migrate")
+    migrate_cmd.add_argument("--db", type=Path, default=Path("atlas.db"))
+    migrate_cmd.add_argument("--benchmark", action="store_true", help="Time common queries before and after migrating.")
+    migrate_cmd.add_argument("--out", type=Path, default=Path("reports/db_queries.json"))
+
+    replay_cmd = subparsers.add_parser("replay")
+    replay_cmd.add_argument("--record", type=Path, required=True)
+    replay_cmd.add_argument("--index", type=int, default=None, help="Replay only this record (0-based).")
+    replay_cmd.add_argument("--strict", action="store_true", help="Stop at the first hash mismatch.")
+
+    render_cmd = subparsers.add_parser("render-episode")
+    render_cmd.add_argument("--db", type=Path, default=Path("atlas.db"))
+    render_cmd.add_argument("--episode", type=int, default=None, help="Episode id (default: latest).")
+    render_cmd.add_argument("--out", type=Path, default=Path("reports/frames"), help="Directory for PNGs or a .rgb raw video file.")
+    render_cmd.add_argument("--tile-size", type=int, default=8)
 
     eval_cmd = subparsers.add_parser("eval")
     eval_cmd.add_argument("--checkpoints", nargs="*", type=Path, default=None)
 
+    columnar_cmd = subparsers.add_parser("export-columnar")
+    columnar_cmd.add_argument("--db", type=Path, default=Path("atlas.db"))
+    columnar_cmd.add_argument("--out", type=Path, default=Path("exports/columnar"))
+    columnar_cmd.add_argument("--episode", type=int, nargs="*", default=None)
+    columnar_cmd.add_argument("--mode", default=None)
+    columnar_cmd.add_argument("--row-group-size", type=int, default=65536)
+    columnar_cmd.add_argument("--format", choices=["npy", "parquet"], default="npy")
+
     export_policy_cmd = subparsers.add_parser("export-policy")
     export_policy_cmd.add_argument("--checkpoint", type=Path, default=Path("checkpoints/atlas_model.zip"))
     export_policy_cmd.add_argument("--out-dir", type=Path, default=Path("runtime_artifacts/latest"))
@@ -538,12 +908,26 @@ def main() -> None:
     infer_cmd = subparsers.add_parser("infer")
     infer_cmd.add_argument("--artifact-dir", type=Path, default=Path("runtime_artifacts/latest"))
     infer_cmd.add_argument("--steps", type=int, default=100)
+    infer_cmd.add_argument("--sessions", type=int, default=1, help="Concurrent sessions served by one batched policy.")
+    infer_cmd.add_argument("--batch-wait-ms", type=float, default=2.0)
+    infer_cmd.add_argument("--fast-path", action="store_true", help="Use the torch inference fast path.")
+    infer_cmd.add_argument("--traced", action="store_true", help="TorchScript-trace the actor (implies --fast-path).")
+    infer_cmd.add_argument("--torch-threads", type=int, default=1)
+
+    bench_infer_cmd = subparsers.add_parser("bench-infer")
+    bench_infer_cmd.add_argument("--artifact-dir", type=Path, default=Path("runtime_artifacts/latest"))
+    bench_infer_cmd.add_argument("--iterations", type=int, default=500)
+    bench_infer_cmd.add_argument("--torch-threads", type=int, default=1)
+    bench_infer_cmd.add_argument("--out", type=Path, default=Path("reports/inference_latency.json"))
 
     offline_cmd = subparsers.add_parser("offline-finetune")
     offline_cmd.add_argument("--data", type=Path, default=Path("atlas.db"))
     offline_cmd.add_argument("--steps", type=int, default=10000)
     offline_cmd.add_argument("--algorithm", type=str, choices=["iql", "cql"], default="iql")
     offline_cmd.add_argument("--checkpoint", type=Path, default=None)
+    offline_cmd.add_argument("--shuffle-buffer", type=int, default=4096, help="Transitions held for shuffling (1 = log order).")
+    offline_cmd.add_argument("--chunk-size", type=int, default=1024, help="Rows read per chunk.")
+    offline_cmd.add_argument("--parse-workers", type=int, default=0, help="Processes decoding observation JSON.")
 
     args = parser.parse_args()
     if args.command == "train":
@@ -551,17 +935,59 @@ def main() -> None:
     elif args.command == "resume":
         resume_training(args.config, args.steps)
     elif args.command == "export":
-        export_replay(args.db, args.out)
+        tick_range = None
+        if args.tick_min is not None or args.tick_max is not None:
+            tick_range = (args.tick_min, args.tick_max)
+        export_replay(args.db, args.out, args.episode, args.mode, tick_range, args.compression, args.workers)
+    elif args.command == "export-columnar":
+        run_export_columnar(args.db, args.out, args.episode, args.mode, args.row_group_size, args.format)
+    elif args.command == "db-migrate":
+        run_db_migrate(args.db, args.benchmark, args.out)
+    elif args.command == "replay":
+        if not run_replay(args.config, args.record, args.index, args.strict):
+            raise SystemExit(1)
+    elif args.command == "render-episode":
+        run_render_episode(args.config, args.db, args.out, args.episode, args.tile_size)
     elif args.command == "eval":
         run_eval(args.config, args.checkpoints)
     elif args.command == "export-policy":
         run_policy_export(args.config, args.checkpoint, args.out_dir)
     elif args.command == "infer":
-        run_inference(args.config, args.artifact_dir, args.steps)
+        if args.sessions > 1:
+            run_multi_session_inference(args.config, args.artifact_dir, args.steps, args.sessions, args.batch_wait_ms)
+        else:
+            run_inference(
+                args.config,
+                args.artifact_dir,
+                args.steps,
+                fast_path=bool(args.fast_path or args.traced),
+                torch_threads=args.torch_threads,
+                traced=bool(args.traced),
+            )
+    elif args.command == "bench-infer":
+        run_inference_benchmark(args.config, args.artifact_dir, args.iterations, args.torch_threads, args.out)
     elif args.command == "offline-finetune":
-        run_offline_finetune(args.config, args.data, args.steps, args.algorithm, args.checkpoint)
+        run_offline_finetune(
+            args.config,
+            args.data,
+            args.steps,
+            args.algorithm,
+            args.checkpoint,
+            args.shuffle_buffer,
+            args.chunk_size,
+            args.parse_workers,
+        )
     else:
-        AtlasGame(args.config, strict_safety=bool(args.strict_safety)).run()
+        game = AtlasGame(
+            args.config,
+            strict_safety=bool(args.strict_safety),
+            fast_inference=bool(getattr(args, "fast_inference", False)),
+            record_path=getattr(args, "record", None),
+        )
+        if getattr(args, "headless", False):
+            game.run_headless(args.steps)
+        else:
+            game.run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,184 @@
+"""Offscreen NumPy rendering of worlds and streaming frame encoders (no display needed)."""
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pygame
+
+from src.core.types import TileType
+from src.env.encoding import TILE_CODES
+from src.render.sprite_db import SpriteDB, world_sprites
+
+BACKGROUND_RGB = (10, 10, 20)
+
+
+class FrameRenderer:
+    """Renders ``World`` states to ``(H, W, 3)`` uint8 arrays without pygame display.
+
+    Tiles are drawn by indexing a palette with the tile-code grid and upscaling with
+    ``np.repeat``; items, enemies and characters (``world_sprites``) are
+    alpha-composited from sprites baked once by ``SpriteDB``. Colors match the
+    interactive ``Renderer``.
+    """
+
+    def __init__(self, tile_size: int = 8) -> None:
+        self.tile_size = int(tile_size)
+        self.sprite_db = SpriteDB(self.tile_size)
+        self.palette = np.array([self.sprite_db.tile_color(tile) for tile in TileType], dtype=np.uint8)
+        self._sprites: dict[tuple, tuple[np.ndarray, np.ndarray]] = {}
+        # The cached grid's world and tile array are held (and compared with ``is``) so a new
+        # world can never alias them the way a recycled ``id()`` could.
+        self._codes_world = None
+        self._codes_tiles: np.ndarray | None = None
+        self._codes_version = -1
+        self._codes: np.ndarray | None = None
+
+    def tile_codes(self, world) -> np.ndarray:
+        version = int(getattr(world, "tile_version", 0))
+        if (
+            self._codes is None
+            or world is not self._codes_world
+            or world.tiles is not self._codes_tiles
+            or version != self._codes_version
+        ):
+            self._codes = np.fromiter((TILE_CODES[tile] for tile in world.tiles.flat), dtype=np.int16, count=world.tiles.size)
+            self._codes = self._codes.reshape(world.tiles.shape)
+            self._codes_world = world
+            self._codes_tiles = world.tiles
+            self._codes_version = version
+        return self._codes
+
+    def _sprite_arrays(self, kind: str, color: tuple[int, int, int], transform_state: str | None) -> tuple[np.ndarray, np.ndarray]:
+        key = (kind, tuple(color), transform_state)
+        arrays = self._sprites.get(key)
+        if arrays is None:
+            sprite = self.sprite_db.sprite(kind, color, transform_state)
+            rgb = pygame.surfarray.array3d(sprite).transpose(1, 0, 2).astype(np.float32)
+            alpha = pygame.surfarray.array_alpha(sprite).T.astype(np.float32)[..., None] / 255.0
+            arrays = (rgb, alpha)
+            self._sprites[key] = arrays
+        return arrays
+
+    def _composite(self, frame: np.ndarray, kind: str, color: tuple[int, int, int], x: int, y: int, transform_state: str | None) -> None:
+        rgb, alpha = self._sprite_arrays(kind, color, transform_state)
+        x0 = x * self.tile_size
+        y0 = y * self.tile_size
+        height, width = frame.shape[:2]
+        if x0 < 0 or y0 < 0 or x0 + self.tile_size > width or y0 + self.tile_size > height:
+            return
+        region = frame[y0 : y0 + self.tile_size, x0 : x0 + self.tile_size].astype(np.float32)
+        blended = rgb * alpha + region * (1.0 - alpha)
+        frame[y0 : y0 + self.tile_size, x0 : x0 + self.tile_size] = blended.astype(np.uint8)
+
+    def render(self, world) -> np.ndarray:
+        frame = self.palette[self.tile_codes(world)]
+        frame = np.repeat(np.repeat(frame, self.tile_size, axis=0), self.tile_size, axis=1)
+        for spec in world_sprites(world):
+            self._composite(frame, *spec)
+        return frame
+
+    def render_batch(self, worlds: Iterable) -> np.ndarray:
+        frames = [self.render(world) for world in worlds]
+        if not frames:
+            return np.zeros((0, 0, 0, 3), dtype=np.uint8)
+        return np.stack(frames)
+
+
+def encode_png(frame: np.ndarray, compress_level: int = 6) -> bytes:
+    """Encode an ``(H, W, 3)`` uint8 array as an RGB PNG using only zlib."""
+
+    if frame.ndim != 3 or frame.shape[2] != 3:
+        raise ValueError(f"expected an (H, W, 3) frame, got shape {frame.shape}")
+    height, width = frame.shape[:2]
+    rows = np.empty((height, width * 3 + 1), dtype=np.uint8)
+    rows[:, 0] = 0
+    rows[:, 1:] = np.ascontiguousarray(frame, dtype=np.uint8).reshape(height, width * 3)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(rows.tobytes(), compress_level))
+        + chunk(b"IEND", b"")
+    )
+
+
+class PngSequenceWriter:
+    """Writes frames as ``frame_000000.png``, ``frame_000001.png``, ... into a directory."""
+
+    def __init__(self, out_dir: Path, fps: int = 30, compress_level: int = 6) -> None:
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.fps = int(fps)
+        self.compress_level = int(compress_level)
+        self.frames = 0
+
+    def write(self, frame: np.ndarray) -> None:
+        path = self.out_dir / f"frame_{self.frames:06d}.png"
+        path.write_bytes(encode_png(frame, self.compress_level))
+        self.frames += 1
+
+    def close(self) -> None:
+        meta = {"format": "png_sequence", "fps": self.fps, "frames": self.frames, "pattern": "frame_%06d.png"}
+        (self.out_dir / "sequence.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+    def __enter__(self) -> PngSequenceWriter:
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+
+class RawVideoWriter:
+    """Streams frames as raw ``rgb24`` video with a JSON sidecar describing the stream.
+
+    The output plays with e.g.
+    ``ffmpeg -f rawvideo -pix_fmt rgb24 -s WxH -r FPS -i episode.rgb episode.mp4``.
+    """
+
+    def __init__(self, path: Path, fps: int = 30) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fps = int(fps)
+        self.frames = 0
+        self.shape: tuple[int, int] | None = None
+        self._handle = self.path.open("wb")
+
+    def write(self, frame: np.ndarray) -> None:
+        if self.shape is None:
+            self.shape = (int(frame.shape[0]), int(frame.shape[1]))
+        elif frame.shape[:2] != self.shape:
+            raise ValueError(f"frame shape {frame.shape[:2]} does not match stream shape {self.shape}")
+        self._handle.write(np.ascontiguousarray(frame, dtype=np.uint8).tobytes())
+        self.frames += 1
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self._handle.close()
+        height, width = self.shape or (0, 0)
+        meta = {"format": "rawvideo", "pix_fmt": "rgb24", "width": width, "height": height, "fps": self.fps, "frames": self.frames}
+        self.path.with_suffix(self.path.suffix + ".json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+    def __enter__(self) -> RawVideoWriter:
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+
+def open_frame_writer(out_path: Path, fps: int = 30) -> PngSequenceWriter | RawVideoWriter:
+    """Pick an encoder from the output path: ``.rgb``/``.raw`` files stream raw video, anything else is a PNG directory."""
+
+    out_path = Path(out_path)
+    if out_path.suffix in {".rgb", ".raw"}:
+        return RawVideoWriter(out_path, fps=fps)
+    return PngSequenceWriter(out_path, fps=fps)
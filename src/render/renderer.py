@@ -3,11 +3,23 @@ from __future__ import annotations
 from typing import Any
 
 import pygame
-from src.render.sprite_db import SpriteDB
+from src.render.sprite_db import SpriteDB, world_sprites
 from src.render.ui_overlays import UIOverlays
 
 
+BACKGROUND_COLOR = (10, 10, 20)
+
+
 class Renderer:
+    """Draws the world from a cached tile layer and reports the rects that changed.
+
+    The tile layer is rebuilt only when the world object, the target surface or the
+    tile size changes; otherwise just the tiles in ``world.dirty_tiles`` are redrawn
+    into it. Each frame restores the layer under the previous sprite (items, enemies,
+    characters) and debug HUD positions, blits the sprites at their new cells and
+    repaints the HUD strip below the grid.
+    """
+
     def __init__(self, tile_size: int, width: int, height: int):
         self.tile_size = tile_size
         self.width = width
@@ -16,6 +28,53 @@ class Renderer:
         self.font = pygame.font.SysFont("Consolas", 16)
         self.ui = UIOverlays(self.font)
         self.last_chat_bottom = 0
+        self._tile_layer: pygame.Surface | None = None
+        self._layer_world = None
+        self._layer_surface: pygame.Surface | None = None
+        self._layer_surface_size: tuple[int, int] = (0, 0)
+        self._actor_rects: list[pygame.Rect] = []
+        self._debug_rect: pygame.Rect | None = None
+
+    def set_tile_size(self, tile_size: int) -> None:
+        self.tile_size = tile_size
+        self.sprite_db.set_tile_size(tile_size)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Force a full redraw on the next frame."""
+
+        self._tile_layer = None
+
+    def _tile_rect(self, x: int, y: int) -> pygame.Rect:
+        return pygame.Rect(x * self.tile_size, y * self.tile_size, self.tile_size, self.tile_size)
+
+    def _rebuild_tile_layer(self, world) -> None:
+        rows, cols = world.tiles.shape
+        layer = pygame.Surface((cols * self.tile_size, rows * self.tile_size))
+        layer.fill(BACKGROUND_COLOR)
+        for y in range(rows):
+            for x in range(cols):
+                self.sprite_db.draw_tile(layer, world.tiles[y, x], x * self.tile_size, y * self.tile_size)
+        world.consume_dirty_tiles()
+        self._tile_layer = layer
+        self._layer_world = world
+
+    def _needs_full_redraw(self, surface: pygame.Surface, world) -> bool:
+        return (
+            self._tile_layer is None
+            or self._layer_world is not world
+            or self._layer_surface is not surface
+            or self._layer_surface_size != surface.get_size()
+            or self._tile_layer.get_width() != world.tiles.shape[1] * self.tile_size
+            or self._tile_layer.get_height() != world.tiles.shape[0] * self.tile_size
+        )
+
+    def _restore(self, surface: pygame.Surface, rect: pygame.Rect) -> pygame.Rect:
+        assert self._tile_layer is not None
+        clipped = rect.clip(self._tile_layer.get_rect())
+        if clipped.width and clipped.height:
+            surface.blit(self._tile_layer, clipped.topleft, clipped)
+        return clipped
 
     def render(
         self,
@@ -31,21 +90,42 @@ class Renderer:
         reward_terms: dict[str, float] | None = None,
         subgoal_text: str = "",
         mode_info: dict[str, Any] | None = None,
-    ) -> None:
-        surface.fill((10, 10, 20))
+    ) -> list[pygame.Rect]:
+        """Render one frame and return the screen rects that changed, for ``pygame.display.update``."""
+
         max_text_width = surface.get_width() - 8
-        for y in range(world.tiles.shape[0]):
-            for x in range(world.tiles.shape[1]):
-                tile = world.tiles[y, x]
-                self.sprite_db.draw_tile(surface, tile, x * self.tile_size, y * self.tile_size)
+        dirty_rects: list[pygame.Rect] = []
+        full_redraw = self._needs_full_redraw(surface, world)
+        if full_redraw:
+            self._rebuild_tile_layer(world)
+            self._layer_surface = surface
+            self._layer_surface_size = surface.get_size()
+            surface.fill(BACKGROUND_COLOR)
+            surface.blit(self._tile_layer, (0, 0))
+        else:
+            for x, y in world.consume_dirty_tiles():
+                rect = self._tile_rect(x, y)
+                self.sprite_db.draw_tile(self._tile_layer, world.tiles[y, x], rect.x, rect.y)
+                dirty_rects.append(self._restore(surface, rect))
+            for rect in self._actor_rects:
+                dirty_rects.append(self._restore(surface, rect))
+            if self._debug_rect is not None:
+                dirty_rects.append(self._restore(surface, self._debug_rect))
+                self._debug_rect = None
+
         atlas = world.atlas
-        human = world.human
-        atlas_color = (180, 80, 220) if atlas.transform_state else (50, 200, 255)
-        human_color = (220, 140, 70) if human.transform_state else (200, 200, 50)
-        self.sprite_db.draw_character(surface, atlas_color, int(atlas.pos.x) * self.tile_size, int(atlas.pos.y) * self.tile_size)
-        self.sprite_db.draw_character(surface, human_color, int(human.pos.x) * self.tile_size, int(human.pos.y) * self.tile_size)
+        self._actor_rects = []
+        for kind, color, x, y, transform_state in world_sprites(world):
+            rect = self._tile_rect(x, y)
+            surface.blit(self.sprite_db.sprite(kind, color, transform_state), rect.topleft)
+            self._actor_rects.append(rect)
+        dirty_rects.extend(self._actor_rects)
 
-        hud_y = self.height * self.tile_size + 4
+        grid_bottom = self.height * self.tile_size
+        hud_rect = pygame.Rect(0, grid_bottom, surface.get_width(), max(0, surface.get_height() - grid_bottom))
+        surface.fill(BACKGROUND_COLOR, hud_rect)
+        dirty_rects.append(hud_rect)
+        hud_y = grid_bottom + 4
         offset = self.ui.draw_wrapped_text(surface, f"Mode: {mode_name}", (4, hud_y), max_text_width)
         if mode_info:
             objective = mode_info.get("objective") or ""
@@ -145,6 +225,11 @@ class Renderer:
                 )
             else:
                 terms_line = "Reward: (no data yet)"
-            self.ui.draw_wrapped_text(surface, terms_line, (debug_x, debug_y), debug_width, (160, 220, 160))
+            debug_y += self.ui.draw_wrapped_text(surface, terms_line, (debug_x, debug_y), debug_width, (160, 220, 160))
+            self._debug_rect = pygame.Rect(0, 0, self.width * self.tile_size, debug_y)
+            dirty_rects.append(self._debug_rect)
 
         # TODO: Add animations for movement and combat.
+        if full_redraw:
+            return [surface.get_rect()]
+        return dirty_rects
@@ -1,16 +1,109 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Hashable, Optional, Tuple
 
 import pygame
 
 from src.core.types import TileType
 
+ATLAS_COLOR = (50, 200, 255)
+ATLAS_TRANSFORMED_COLOR = (180, 80, 220)
+HUMAN_COLOR = (200, 200, 50)
+HUMAN_TRANSFORMED_COLOR = (220, 140, 70)
+AGENT_COLOR = (70, 150, 230)
+AGENT_TRANSFORMED_COLOR = (150, 90, 200)
+ENEMY_COLOR = (200, 50, 60)
+ITEM_COLOR = (240, 200, 80)
+
+# One sprite to draw over the tiles: ``(kind, color, x, y, transform_state)``, ``kind`` "item" or "character".
+SpriteSpec = Tuple[str, Tuple[int, int, int], int, int, Optional[str]]
+
+
+def world_sprites(world) -> list[SpriteSpec]:
+    """Everything drawn over the tile layer, back to front: floor items, enemies, extra agents, Atlas, the human."""
+
+    sprites: list[SpriteSpec] = [("item", ITEM_COLOR, int(item.pos.x), int(item.pos.y), None) for item in world.items]
+    sprites.extend(("character", ENEMY_COLOR, int(enemy.pos.x), int(enemy.pos.y), None) for enemy in world.enemies)
+    for agent in world.agents.values():
+        color = AGENT_TRANSFORMED_COLOR if agent.transform_state else AGENT_COLOR
+        sprites.append(("character", color, int(agent.pos.x), int(agent.pos.y), agent.transform_state))
+    atlas, human = world.atlas, world.human
+    atlas_color = ATLAS_TRANSFORMED_COLOR if atlas.transform_state else ATLAS_COLOR
+    human_color = HUMAN_TRANSFORMED_COLOR if human.transform_state else HUMAN_COLOR
+    sprites.append(("character", atlas_color, int(atlas.pos.x), int(atlas.pos.y), atlas.transform_state))
+    sprites.append(("character", human_color, int(human.pos.x), int(human.pos.y), human.transform_state))
+    return sprites
+
 
 @dataclass
 class SpriteDB:
+    """Tile and character sprites, baked once per ``tile_size`` and reused every frame.
+
+    Character silhouettes live in an LRU cache keyed by ``(color, tile_size,
+    transform_state)`` bounded by ``max_cached_sprites``. Tile sprites are pre-baked
+    solid squares unless a texture atlas supplies a frame for that tile.
+    """
+
     tile_size: int
+    max_cached_sprites: int = 128
+    _character_cache: OrderedDict = field(default_factory=OrderedDict, init=False, repr=False)
+    _tile_cache: dict = field(default_factory=dict, init=False, repr=False)
+    _atlases: list = field(default_factory=list, init=False, repr=False)
+
+    def set_tile_size(self, tile_size: int) -> None:
+        if tile_size == self.tile_size:
+            return
+        self.tile_size = tile_size
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._character_cache.clear()
+        self._tile_cache.clear()
+
+    def cache_info(self) -> dict[str, int]:
+        return {
+            "characters": len(self._character_cache),
+            "tiles": len(self._tile_cache),
+            "atlases": len(self._atlases),
+        }
+
+    def register_atlas(
+        self,
+        image: pygame.Surface,
+        frame_size: int,
+        frames: dict[Hashable, Tuple[int, int]],
+    ) -> None:
+        """Use frames of a texture atlas (``key -> (column, row)``) as tile sprites.
+
+        Frames are cut and scaled to ``tile_size`` lazily, so a later
+        ``set_tile_size`` re-scales them from the source image.
+        """
+
+        self._atlases.append((image, int(frame_size), dict(frames)))
+        for key in frames:
+            self._tile_cache.pop(key, None)
+
+    def _atlas_frame(self, key: Hashable) -> pygame.Surface | None:
+        for image, frame_size, frames in reversed(self._atlases):
+            if key in frames:
+                column, row = frames[key]
+                frame = image.subsurface(pygame.Rect(column * frame_size, row * frame_size, frame_size, frame_size))
+                if frame_size != self.tile_size:
+                    return pygame.transform.scale(frame, (self.tile_size, self.tile_size))
+                return frame.copy()
+        return None
+
+    def tile_sprite(self, tile: TileType) -> pygame.Surface:
+        sprite = self._tile_cache.get(tile)
+        if sprite is None:
+            sprite = self._atlas_frame(tile)
+            if sprite is None:
+                sprite = pygame.Surface((self.tile_size, self.tile_size))
+                sprite.fill(self.tile_color(tile))
+            self._tile_cache[tile] = sprite
+        return sprite
 
     def tile_color(self, tile: TileType) -> Tuple[int, int, int]:
         mapping = {
@@ -30,8 +123,7 @@ class SpriteDB:
         return mapping.get(tile, (255, 0, 255))
 
     def draw_tile(self, surface: pygame.Surface, tile: TileType, x: int, y: int) -> None:
-        rect = pygame.Rect(x, y, self.tile_size, self.tile_size)
-        pygame.draw.rect(surface, self.tile_color(tile), rect)
+        surface.blit(self.tile_sprite(tile), (x, y))
 
     def _scale_rect(self, x: int, y: int, w: int, h: int) -> pygame.Rect:
         sx = x * self.tile_size // 32
@@ -44,7 +136,50 @@ class SpriteDB:
     def _shade(color: Tuple[int, int, int], delta: int) -> Tuple[int, int, int]:
         return tuple(max(0, min(255, c + delta)) for c in color)
 
-    def draw_character(self, surface: pygame.Surface, color: Tuple[int, int, int], x: int, y: int) -> None:
+    def character_sprite(self, color: Tuple[int, int, int], transform_state: str | None = None) -> pygame.Surface:
+        key = (tuple(color), self.tile_size, transform_state)
+        sprite = self._character_cache.get(key)
+        if sprite is not None:
+            self._character_cache.move_to_end(key)
+            return sprite
+        sprite = self._bake_character(color)
+        self._character_cache[key] = sprite
+        while len(self._character_cache) > self.max_cached_sprites:
+            self._character_cache.popitem(last=False)
+        return sprite
+
+    def draw_character(
+        self,
+        surface: pygame.Surface,
+        color: Tuple[int, int, int],
+        x: int,
+        y: int,
+        transform_state: str | None = None,
+    ) -> None:
+        surface.blit(self.character_sprite(color, transform_state), (x, y))
+
+    def item_sprite(self, color: Tuple[int, int, int]) -> pygame.Surface:
+        key = ("item", tuple(color), self.tile_size)
+        sprite = self._character_cache.get(key)
+        if sprite is not None:
+            self._character_cache.move_to_end(key)
+            return sprite
+        sprite = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA)
+        pygame.draw.rect(sprite, self._shade(color, -45), self._scale_rect(9, 17, 14, 12))
+        pygame.draw.rect(sprite, color, self._scale_rect(10, 18, 12, 10))
+        self._character_cache[key] = sprite
+        while len(self._character_cache) > self.max_cached_sprites:
+            self._character_cache.popitem(last=False)
+        return sprite
+
+    def sprite(self, kind: str, color: Tuple[int, int, int], transform_state: str | None = None) -> pygame.Surface:
+        """The sprite for a ``world_sprites`` entry."""
+
+        if kind == "item":
+            return self.item_sprite(color)
+        return self.character_sprite(color, transform_state)
+
+    def _bake_character(self, color: Tuple[int, int, int]) -> pygame.Surface:
         """Draw a stylized 32x32 humanoid silhouette instead of a solid block.
 
         The full visual footprint always stays within one 32x32 sprite slot
@@ -80,5 +215,4 @@ class SpriteDB:
 
         # Face detail.
         pygame.draw.rect(sprite, (22, 22, 22), self._scale_rect(14, 7, 4, 1))
-
-        surface.blit(sprite, (x, y))
+        return sprite
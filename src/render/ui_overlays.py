@@ -1,15 +1,45 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+
 import pygame
 
 
 class UIOverlays:
-    def __init__(self, font: pygame.font.Font):
+    """HUD text drawing with an LRU cache of wrapped, rendered lines.
+
+    Entries are keyed by ``(text, color, max_width)`` and hold the rendered line
+    surfaces, so unchanged HUD text costs one blit per line per frame. Changing the
+    font through ``set_font`` drops the cache.
+    """
+
+    def __init__(self, font: pygame.font.Font, max_cached_blocks: int = 256):
+        self.font = font
+        self.max_cached_blocks = max_cached_blocks
+        self._blocks: OrderedDict[tuple, list[pygame.Surface]] = OrderedDict()
+
+    def set_font(self, font: pygame.font.Font) -> None:
         self.font = font
+        self._blocks.clear()
+
+    def cache_size(self) -> int:
+        return len(self._blocks)
+
+    def _rendered_lines(self, text: str, color, max_width: int | None) -> list[pygame.Surface]:
+        key = (text, tuple(color), max_width)
+        lines = self._blocks.get(key)
+        if lines is not None:
+            self._blocks.move_to_end(key)
+            return lines
+        wrapped = [text] if max_width is None else self.wrap_text(text, max_width)
+        lines = [self.font.render(line, True, color) for line in wrapped]
+        self._blocks[key] = lines
+        while len(self._blocks) > self.max_cached_blocks:
+            self._blocks.popitem(last=False)
+        return lines
 
     def draw_text(self, surface: pygame.Surface, text: str, pos: tuple[int, int], color=(240, 240, 240)) -> None:
-        render = self.font.render(text, True, color)
-        surface.blit(render, pos)
+        surface.blit(self._rendered_lines(text, color, None)[0], pos)
 
     def wrap_text(self, text: str, max_width: int) -> list[str]:
         if not text:
@@ -51,10 +81,9 @@ class UIOverlays:
         max_width: int,
         color=(240, 240, 240),
     ) -> int:
-        lines = self.wrap_text(text, max_width)
+        lines = self._rendered_lines(text, color, max_width)
         x, y = pos
         line_height = self.font.get_linesize()
-        for idx, line in enumerate(lines):
-            render = self.font.render(line, True, color)
+        for idx, render in enumerate(lines):
             surface.blit(render, (x, y + idx * line_height))
         return len(lines) * line_height
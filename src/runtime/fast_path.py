@@ -0,0 +1,141 @@
+"""Low-overhead torch inference path for recurrent Atlas policies."""
+from __future__ import annotations
+
+import time
+import warnings
+from typing import Any
+
+import gymnasium as gym
+import numpy as np
+import torch
+from stable_baselines3.common.preprocessing import preprocess_obs
+from torch import nn
+
+
+class _ActorModule(nn.Module):
+    """Single-step actor: features -> LSTM -> actor MLP -> action logits."""
+
+    def __init__(self, policy, keys: list[str]) -> None:
+        super().__init__()
+        self.policy = policy
+        self.keys = keys
+
+    def forward(self, *inputs: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        *obs_tensors, hidden, cell, episode_start = inputs
+        obs = dict(zip(self.keys, obs_tensors))
+        preprocessed = preprocess_obs(obs, self.policy.observation_space, normalize_images=self.policy.normalize_images)
+        features = self.policy.pi_features_extractor(preprocessed)
+        keep = (1.0 - episode_start).view(1, -1, 1)
+        lstm_out, (next_hidden, next_cell) = self.policy.lstm_actor(features.unsqueeze(0), (hidden * keep, cell * keep))
+        latent = self.policy.mlp_extractor.forward_actor(lstm_out.squeeze(0))
+        return self.policy.action_net(latent), next_hidden, next_cell
+
+
+class FastPolicyRunner:
+    """Predicts actions without SB3's per-call observation conversion and space checks.
+
+    Observations are copied into tensors allocated once, the forward pass runs under
+    ``torch.inference_mode`` and the recurrent state stays a pair of torch tensors
+    between calls. With ``traced=True`` the actor is compiled with TorchScript.
+    """
+
+    def __init__(self, model, *, num_threads: int | None = 1, traced: bool = False) -> None:
+        policy = model.policy
+        if not isinstance(policy.action_space, gym.spaces.Discrete):
+            raise ValueError("FastPolicyRunner supports discrete action spaces only")
+        if not isinstance(policy.observation_space, gym.spaces.Dict):
+            raise ValueError("FastPolicyRunner expects a Dict observation space")
+        if num_threads:
+            torch.set_num_threads(int(num_threads))
+        policy.set_training_mode(False)
+        self.policy = policy
+        self.device = policy.device
+        self.keys = list(policy.observation_space.spaces.keys())
+        self._obs_buffers = [self._alloc(space) for space in policy.observation_space.spaces.values()]
+        self._state_shape = tuple(policy.lstm_hidden_state_shape)
+        self._episode_start = torch.zeros((1,), dtype=torch.float32, device=self.device)
+        self._zero_state = (
+            torch.zeros(self._state_shape, dtype=torch.float32, device=self.device),
+            torch.zeros(self._state_shape, dtype=torch.float32, device=self.device),
+        )
+        self.actor: Any = _ActorModule(policy, self.keys)
+        self.traced = bool(traced)
+        if self.traced:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                with torch.inference_mode(False), torch.no_grad():
+                    example = (*self._obs_buffers, *self._zero_state, self._episode_start)
+                    self.actor = torch.jit.trace(self.actor, example, check_trace=False)
+
+    def _alloc(self, space: gym.Space) -> torch.Tensor:
+        if isinstance(space, gym.spaces.Discrete):
+            return torch.zeros((1,), dtype=torch.long, device=self.device)
+        return torch.zeros((1, *space.shape), dtype=torch.float32, device=self.device)
+
+    def predict(self, obs: dict[str, Any], state: Any = None, episode_start: bool = False, deterministic: bool = True):
+        with torch.inference_mode():
+            for key, buffer in zip(self.keys, self._obs_buffers):
+                buffer.copy_(torch.as_tensor(np.asarray(obs[key])).reshape(buffer.shape))
+            self._episode_start.fill_(1.0 if bool(np.any(episode_start)) else 0.0)
+            hidden, cell = self._coerce_state(state)
+            logits, next_hidden, next_cell = self.actor(*self._obs_buffers, hidden, cell, self._episode_start)
+            if deterministic:
+                action = int(torch.argmax(logits, dim=1)[0])
+            else:
+                action = int(torch.distributions.Categorical(logits=logits).sample()[0])
+        return action, (next_hidden, next_cell)
+
+    def _coerce_state(self, state: Any) -> tuple[torch.Tensor, torch.Tensor]:
+        if state is None:
+            return self._zero_state
+        hidden, cell = state
+        if not isinstance(hidden, torch.Tensor):
+            hidden = torch.as_tensor(np.asarray(hidden), dtype=torch.float32, device=self.device)
+            cell = torch.as_tensor(np.asarray(cell), dtype=torch.float32, device=self.device)
+        return hidden, cell
+
+
+def _latency_row(name: str, samples: list[float]) -> dict[str, Any]:
+    values = np.asarray(samples, dtype=np.float64) * 1000.0
+    return {
+        "path": name,
+        "calls": int(values.size),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "mean_ms": float(values.mean()),
+    }
+
+
+def benchmark_predict_latency(
+    model,
+    observations: list[dict[str, Any]],
+    *,
+    iterations: int = 500,
+    num_threads: int | None = 1,
+    warmup: int = 20,
+) -> list[dict[str, Any]]:
+    """Compare per-call predict latency of SB3 ``model.predict`` against the fast paths."""
+
+    if not observations:
+        raise ValueError("benchmark_predict_latency requires at least one observation")
+
+    def _sb3(obs, state, start):
+        return model.predict(obs, state=state, episode_start=np.array([start]), deterministic=True)
+
+    runners = {
+        "sb3_predict": _sb3,
+        "fast_path": FastPolicyRunner(model, num_threads=num_threads).predict,
+        "fast_path_traced": FastPolicyRunner(model, num_threads=num_threads, traced=True).predict,
+    }
+    rows = []
+    for name, predict in runners.items():
+        state = None
+        samples: list[float] = []
+        for idx in range(warmup + iterations):
+            obs = observations[idx % len(observations)]
+            started = time.perf_counter()
+            _action, state = predict(obs, state, idx == 0)
+            if idx >= warmup:
+                samples.append(time.perf_counter() - started)
+        rows.append(_latency_row(name, samples))
+    return rows
@@ -9,7 +9,8 @@ from typing import Any
 
 from sb3_contrib import RecurrentPPO
 
-from src.agent.policy import observation_schema_signature, schema_hash
+from src.agent.policy import env_observation_schema, schema_hash
+from src.runtime.fast_path import FastPolicyRunner
 
 ARTIFACT_VERSION = "1"
 MANIFEST_FILE = "manifest.json"
@@ -21,8 +22,23 @@ class RuntimePolicy:
     model: RecurrentPPO
     recurrent_state: Any = None
     episode_start: bool = True
+    fast_path: FastPolicyRunner | None = None
+
+    def enable_fast_path(self, num_threads: int | None = 1, traced: bool = False) -> None:
+        self.fast_path = FastPolicyRunner(self.model, num_threads=num_threads, traced=traced)
+        self.recurrent_state = None
+        self.episode_start = True
 
     def predict(self, obs: dict[str, Any], deterministic: bool = True):
+        if self.fast_path is not None:
+            action, self.recurrent_state = self.fast_path.predict(
+                obs,
+                state=self.recurrent_state,
+                episode_start=self.episode_start,
+                deterministic=deterministic,
+            )
+            self.episode_start = False
+            return action
         action, next_state = self.model.predict(
             obs,
             state=self.recurrent_state,
@@ -46,7 +62,7 @@ def export_policy_artifact(model_path: Path, env, out_dir: Path) -> Path:
     exported_model_path = out_dir / MODEL_FILE
     shutil.copy2(model_path, exported_model_path)
 
-    obs_schema = observation_schema_signature(env.observation_space)
+    obs_schema = env_observation_schema(env)
     manifest = {
         "artifact_version": ARTIFACT_VERSION,
         "created_at": datetime.now(timezone.utc).isoformat(),
@@ -61,7 +77,7 @@ def export_policy_artifact(model_path: Path, env, out_dir: Path) -> Path:
 
 
 
-def load_runtime_policy(artifact_dir: Path, env) -> RuntimePolicy:
+def load_artifact_model(artifact_dir: Path, env) -> RecurrentPPO:
     manifest_path = artifact_dir / MANIFEST_FILE
     model_path = artifact_dir / MODEL_FILE
 
@@ -74,14 +90,24 @@ def load_runtime_policy(artifact_dir: Path, env) -> RuntimePolicy:
     expected_schema = manifest.get("observation_schema")
     expected_hash = manifest.get("observation_schema_hash")
 
-    runtime_schema = observation_schema_signature(env.observation_space)
+    runtime_schema = env_observation_schema(env)
     runtime_hash = schema_hash(runtime_schema)
 
+    expected_version = (expected_schema or {}).get("version")
+    runtime_version = runtime_schema.get("version")
+    if expected_version != runtime_version:
+        raise ValueError(
+            "Observation schema mismatch for runtime inference: "
+            f"artifact schema version {expected_version}, runtime schema version {runtime_version}; re-export the policy."
+        )
     if expected_schema != runtime_schema or expected_hash != runtime_hash:
         raise ValueError(
             "Observation schema mismatch for runtime inference: "
             f"artifact_hash={expected_hash}, runtime_hash={runtime_hash}."
         )
 
-    model = RecurrentPPO.load(model_path, env=env)
-    return RuntimePolicy(model=model)
+    return RecurrentPPO.load(model_path, env=env)
+
+
+def load_runtime_policy(artifact_dir: Path, env) -> RuntimePolicy:
+    return RuntimePolicy(model=load_artifact_model(artifact_dir, env))
@@ -0,0 +1,298 @@
+"""Multi-session batched inference service for exported Atlas policies."""
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.runtime.inference import load_artifact_model
+
+DEFAULT_LATENCY_BUCKETS_MS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0, 250.0, 1000.0)
+
+
+@dataclass
+class LatencyHistogram:
+    bucket_bounds_ms: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS_MS
+    max_samples: int = 4096
+    counts: list[int] = field(init=False)
+    total: int = field(default=0, init=False)
+    sum_ms: float = field(default=0.0, init=False)
+
+    def __post_init__(self) -> None:
+        self.counts = [0] * (len(self.bucket_bounds_ms) + 1)
+        self._samples: deque[float] = deque(maxlen=self.max_samples)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        value_ms = float(seconds) * 1000.0
+        with self._lock:
+            self.counts[bisect_left(self.bucket_bounds_ms, value_ms)] += 1
+            self.total += 1
+            self.sum_ms += value_ms
+            self._samples.append(value_ms)
+
+    def percentile(self, q: float) -> float:
+        with self._lock:
+            if not self._samples:
+                return 0.0
+            return float(np.percentile(np.fromiter(self._samples, dtype=np.float64), q))
+
+    def snapshot(self) -> dict[str, Any]:
+        buckets = {f"le_{bound:g}ms": count for bound, count in zip(self.bucket_bounds_ms, self.counts)}
+        buckets["inf"] = self.counts[-1]
+        return {
+            "count": self.total,
+            "mean_ms": self.sum_ms / self.total if self.total else 0.0,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "buckets": buckets,
+        }
+
+
+@dataclass
+class SessionState:
+    recurrent_state: Any = None
+    episode_start: bool = True
+    requests: int = 0
+
+
+@dataclass
+class _PendingRequest:
+    session_id: str
+    obs: dict[str, Any]
+    deterministic: bool
+    future: Future
+    enqueued_at: float
+
+
+class InferenceServer:
+    """Hosts one loaded policy and serves many sessions with per-session LSTM state.
+
+    Concurrent ``predict`` calls are collected into micro-batches: the worker waits at
+    most ``max_batch_wait_ms`` after the first queued request before running one batched
+    forward pass. Requests of the same session are never batched together so the
+    recurrent state always advances in submission order.
+    """
+
+    def __init__(
+        self,
+        model,
+        *,
+        max_batch_size: int = 32,
+        max_batch_wait_ms: float = 2.0,
+        deterministic: bool = True,
+    ) -> None:
+        self.model = model
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_batch_wait = max(0.0, float(max_batch_wait_ms)) / 1000.0
+        self.deterministic = bool(deterministic)
+        self.sessions: dict[str, SessionState] = {}
+        self.latency = LatencyHistogram()
+        self.queue_wait = LatencyHistogram()
+        self.batch_sizes: dict[int, int] = {}
+        self._batch_sizes_lock = threading.Lock()
+        self._queue: queue.Queue[_PendingRequest | None] = queue.Queue()
+        self._carry: deque[_PendingRequest] = deque()
+        self._sessions_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> InferenceServer:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._serve, name="atlas-inference", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def __enter__(self) -> InferenceServer:
+        return self.start()
+
+    def __exit__(self, *_exc) -> None:
+        self.stop()
+
+    def submit(self, session_id: str, obs: dict[str, Any], deterministic: bool | None = None) -> Future:
+        if self._thread is None:
+            raise RuntimeError("InferenceServer is not running; call start() first")
+        future: Future = Future()
+        request = _PendingRequest(
+            session_id=str(session_id),
+            obs=obs,
+            deterministic=self.deterministic if deterministic is None else bool(deterministic),
+            future=future,
+            enqueued_at=time.perf_counter(),
+        )
+        self._queue.put(request)
+        return future
+
+    def predict(self, session_id: str, obs: dict[str, Any], deterministic: bool | None = None, timeout: float | None = None) -> int:
+        return int(self.submit(session_id, obs, deterministic).result(timeout))
+
+    async def predict_async(self, session_id: str, obs: dict[str, Any], deterministic: bool | None = None) -> int:
+        return int(await asyncio.wrap_future(self.submit(session_id, obs, deterministic)))
+
+    def session(self, session_id: str) -> SessionHandle:
+        return SessionHandle(server=self, session_id=str(session_id))
+
+    def mark_episode_done(self, session_id: str) -> None:
+        with self._sessions_lock:
+            state = self.sessions.setdefault(str(session_id), SessionState())
+            state.episode_start = True
+
+    def close_session(self, session_id: str) -> None:
+        with self._sessions_lock:
+            self.sessions.pop(str(session_id), None)
+
+    def stats(self) -> dict[str, Any]:
+        with self._sessions_lock:
+            session_count = len(self.sessions)
+        with self._batch_sizes_lock:
+            batch_sizes = dict(self.batch_sizes)
+        return {
+            "sessions": session_count,
+            "batches": sum(batch_sizes.values()),
+            "batch_sizes": dict(sorted(batch_sizes.items())),
+            "latency": self.latency.snapshot(),
+            "queue_wait": self.queue_wait.snapshot(),
+        }
+
+    def _serve(self) -> None:
+        while True:
+            first = self._carry.popleft() if self._carry else self._queue.get()
+            if first is None:
+                self._fail_pending(RuntimeError("InferenceServer stopped"))
+                return
+            batch = [first]
+            seen = {first.session_id}
+            deadline = first.enqueued_at + self.max_batch_wait
+            stopping = False
+            carried = list(self._carry)
+            self._carry.clear()
+            while len(batch) < self.max_batch_size:
+                if carried:
+                    request = carried.pop(0)
+                else:
+                    remaining = deadline - time.perf_counter()
+                    try:
+                        request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if request is None:
+                    stopping = True
+                    break
+                if request.session_id in seen:
+                    self._carry.append(request)
+                    if len(self._carry) >= self.max_batch_size:
+                        break
+                    continue
+                seen.add(request.session_id)
+                batch.append(request)
+            self._carry.extend(carried)
+            self._run_batch(batch)
+            if stopping:
+                self._fail_pending(RuntimeError("InferenceServer stopped"))
+                return
+
+    def _run_batch(self, batch: list[_PendingRequest]) -> None:
+        groups: dict[bool, list[_PendingRequest]] = {}
+        for request in batch:
+            groups.setdefault(request.deterministic, []).append(request)
+        for deterministic, requests in groups.items():
+            started = time.perf_counter()
+            for request in requests:
+                self.queue_wait.record(started - request.enqueued_at)
+            try:
+                actions = self._forward(requests, deterministic)
+            except Exception as exc:  # propagate model failures to every waiting caller
+                for request in requests:
+                    request.future.set_exception(exc)
+                continue
+            with self._batch_sizes_lock:
+                self.batch_sizes[len(requests)] = self.batch_sizes.get(len(requests), 0) + 1
+            finished = time.perf_counter()
+            for request, action in zip(requests, actions):
+                self.latency.record(finished - request.enqueued_at)
+                request.future.set_result(int(action))
+
+    def _forward(self, requests: list[_PendingRequest], deterministic: bool) -> np.ndarray:
+        with self._sessions_lock:
+            states = [self.sessions.setdefault(request.session_id, SessionState()) for request in requests]
+        keys = requests[0].obs.keys()
+        batch_obs = {key: np.stack([np.asarray(request.obs[key]) for request in requests]) for key in keys}
+        episode_starts = np.array([state.episode_start for state in states], dtype=bool)
+
+        known = next((state.recurrent_state for state in states if state.recurrent_state is not None), None)
+        batch_state = None
+        if known is not None:
+            hidden = [state.recurrent_state or (np.zeros_like(known[0]), np.zeros_like(known[1])) for state in states]
+            batch_state = (
+                np.concatenate([h for h, _ in hidden], axis=1),
+                np.concatenate([c for _, c in hidden], axis=1),
+            )
+
+        actions, next_state = self.model.predict(
+            batch_obs,
+            state=batch_state,
+            episode_start=episode_starts,
+            deterministic=deterministic,
+        )
+        actions = np.asarray(actions).reshape(len(requests), -1)[:, 0]
+        for idx, state in enumerate(states):
+            if next_state is not None:
+                state.recurrent_state = (
+                    np.array(next_state[0][:, idx : idx + 1]),
+                    np.array(next_state[1][:, idx : idx + 1]),
+                )
+            state.episode_start = False
+            state.requests += 1
+        return actions
+
+    def _fail_pending(self, exc: Exception) -> None:
+        while self._carry:
+            self._carry.popleft().future.set_exception(exc)
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if request is not None:
+                request.future.set_exception(exc)
+
+
+@dataclass
+class SessionHandle:
+    """RuntimePolicy-compatible view of one server session."""
+
+    server: InferenceServer
+    session_id: str
+
+    def predict(self, obs: dict[str, Any], deterministic: bool = True) -> int:
+        return self.server.predict(self.session_id, obs, deterministic)
+
+    def mark_episode_done(self) -> None:
+        self.server.mark_episode_done(self.session_id)
+
+
+def load_inference_server(
+    artifact_dir: Path,
+    env,
+    *,
+    max_batch_size: int = 32,
+    max_batch_wait_ms: float = 2.0,
+) -> InferenceServer:
+    model = load_artifact_model(artifact_dir, env)
+    return InferenceServer(model, max_batch_size=max_batch_size, max_batch_wait_ms=max_batch_wait_ms)
@@ -0,0 +1,62 @@
+"""Background policy inference so a slow predict never blocks the frame loop."""
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Any, Callable
+
+
+class PolicyWorker:
+    """Runs ``predict_fn(obs, state, mask)`` on a worker thread, one request at a time.
+
+    ``submit`` is non-blocking and refused while a request is in flight; the frame
+    loop calls ``poll`` each iteration and applies the result once it is ready. The
+    ``tag`` round-trips unchanged so callers can discard results computed for an
+    episode that has since been reset.
+    """
+
+    def __init__(self, predict_fn: Callable[..., tuple[Any, Any]]) -> None:
+        self.predict_fn = predict_fn
+        self._requests: queue.Queue[tuple[dict, Any, bool, Any] | None] = queue.Queue(maxsize=1)
+        self._results: queue.Queue[tuple[Any, Any, Any, BaseException | None]] = queue.Queue()
+        self._busy = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="atlas-policy-worker", daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self) -> bool:
+        return self._busy.is_set()
+
+    def submit(self, obs: dict, state: Any, mask: bool, tag: Any = None) -> bool:
+        if self._busy.is_set():
+            return False
+        self._busy.set()
+        self._requests.put((obs, state, mask, tag))
+        return True
+
+    def poll(self) -> tuple[Any, Any, Any] | None:
+        try:
+            action, state, tag, error = self._results.get_nowait()
+        except queue.Empty:
+            return None
+        if error is not None:
+            raise error
+        return action, state, tag
+
+    def close(self, timeout: float | None = 2.0) -> None:
+        self._requests.put(None)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            obs, state, mask, tag = request
+            try:
+                action, next_state = self.predict_fn(obs, state=state, mask=mask)
+                self._results.put((action, next_state, tag, None))
+            except BaseException as exc:  # surfaced to the frame loop on poll()
+                self._results.put((None, state, tag, exc))
+            finally:
+                self._busy.clear()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.core.actor_table import ActorTable
+from src.core.types import Character, Enemy, Vec2
+from src.env import rules
+
+
+def _characters(count: int) -> list[Character]:
+    return [
+        Character(entity_id=f"a{idx}", display_name=f"A{idx}", pos=Vec2(idx + 0.5, 3.25), vel=Vec2(0, idx * 0.7), can_fly=idx % 3 == 0)
+        for idx in range(count)
+    ]
+
+
+def test_actor_types_are_slotted_and_move_in_place() -> None:
+    actor = _characters(1)[0]
+    assert not hasattr(actor, "__dict__")
+    with pytest.raises(AttributeError):
+        actor.nickname = "x"
+    pos = actor.pos
+    rules.move_character(actor, 1.0, -1.0)
+    assert actor.pos is pos
+    assert actor.pos.as_int() == (1, 2)
+
+
+def test_batched_gravity_matches_per_actor_rules() -> None:
+    actors = _characters(9)
+    expected = _characters(9)
+    can_stand = np.array([idx % 2 == 0 for idx in range(9)])
+    for actor, stand in zip(expected, can_stand):
+        rules.apply_gravity(actor, can_stand=bool(stand))
+
+    table = ActorTable.from_actors(actors)
+    table.apply_gravity(can_stand, rules.GRAVITY, rules.MAX_FALL_SPEED)
+    table.move(0.0, 0.5)
+    table.store(actors)
+
+    assert [actor.vel.y for actor in actors] == pytest.approx([actor.vel.y for actor in expected])
+    assert all(actor.pos.y == 3.75 for actor in actors)
+    assert table.cells().tolist() == [[idx, 3] for idx in range(9)]
+
+
+def test_table_grows_removes_and_skips_missing_attributes() -> None:
+    table = ActorTable(capacity=2)
+    actors = _characters(3)
+    enemy = Enemy(enemy_id="slime", pos=Vec2(4, 4), hp=3, atk=1, exp_value=2, aggro_radius=3)
+    for actor in [*actors, enemy]:
+        table.add(actor)
+    assert len(table) == 4
+    table.remove("a0")
+    assert sorted(table.ids) == ["a1", "a2", "slime"]
+    table["hp"][:] -= 1
+    table.store([enemy, actors[1]])
+    assert enemy.hp == 2 and actors[1].hp == 9
+    assert isinstance(enemy.hp, int)
+    with pytest.raises(ValueError):
+        table.add(enemy)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.config import load_config
+from src.env.grid_env import GridEnv
+from src.logging.columnar import export_columnar, load_columnar, read_manifest
+from src.logging.db import DBLogger
+
+
+def _log_env_episodes(db_path, episodes: int = 3, steps: int = 12) -> None:
+    config = load_config(None)
+    env = GridEnv(config, seed=5)
+    logger = DBLogger(db_path)
+    for episode in range(episodes):
+        mode = "ExitGame" if episode % 2 == 0 else "CaptureTheFlag"
+        env.set_mode(mode)
+        obs, _ = env.reset(seed=5 + episode)
+        logger.start_episode(env.preset, env.seed_value, env.mode.name, "2026-01-01T00:00:00")
+        logger.log_event("episode_start", {"mode": mode})
+        for tick in range(steps):
+            action = tick % 6
+            obs, reward, done, _truncated, info = env.step(action)
+            logger.log_step(obs, action, float(reward), bool(done), info, info["reward_terms"])
+            if done:
+                break
+
+
+def test_columns_are_typed_and_match_logged_info(tmp_path) -> None:
+    db_path = tmp_path / "atlas.db"
+    _log_env_episodes(db_path)
+    manifest = export_columnar(db_path, tmp_path / "cols", row_group_size=8)
+
+    steps = load_columnar(tmp_path / "cols", columns=["episode_id", "reward", "reward_total", "progression_level", "tool_safety_rejected"])
+    assert steps["reward"].dtype == np.float32
+    assert steps["tool_safety_rejected"].dtype == np.bool_
+    assert steps["progression_level"].dtype == np.int16
+    np.testing.assert_allclose(steps["reward"], steps["reward_total"], rtol=1e-5, atol=1e-6)
+    assert len(steps["episode_id"]) == manifest["tables"]["steps"]["rows"]
+    assert len(manifest["tables"]["steps"]["row_groups"]) > 1
+
+    events = load_columnar(tmp_path / "cols", "events", decode_categories=True)
+    assert set(events["type"]) == {"episode_start"}
+
+
+def test_filters_skip_row_groups_and_mask_rows(tmp_path, monkeypatch) -> None:
+    db_path = tmp_path / "atlas.db"
+    _log_env_episodes(db_path)
+    export_columnar(db_path, tmp_path / "cols", row_group_size=12)
+    everything = load_columnar(tmp_path / "cols", columns=["episode_id", "mode"], decode_categories=True)
+
+    opened = []
+    real_load = np.load
+    monkeypatch.setattr(np, "load", lambda path, **kwargs: opened.append(str(path)) or real_load(path, **kwargs))
+    only_second = load_columnar(tmp_path / "cols", columns=["episode_id", "tick"], episode_ids=[2])
+    assert set(only_second["episode_id"].tolist()) == {2}
+    assert only_second["tick"].tolist() == sorted(only_second["tick"].tolist())
+    groups = read_manifest(tmp_path / "cols")["tables"]["steps"]["row_groups"]
+    touched = {path.split(".rg")[1][:5] for path in opened}
+    assert len(touched) == sum(1 for group in groups if 2 in group["episodes"])
+
+    ctf = load_columnar(tmp_path / "cols", columns=["episode_id"], mode="CaptureTheFlag")
+    expected = everything["episode_id"][everything["mode"] == "CaptureTheFlag"]
+    assert ctf["episode_id"].tolist() == expected.tolist()
+
+
+def test_unknown_column_and_parquet_without_pyarrow(tmp_path) -> None:
+    db_path = tmp_path / "atlas.db"
+    _log_env_episodes(db_path, episodes=1, steps=3)
+    export_columnar(db_path, tmp_path / "cols")
+    with pytest.raises(ValueError):
+        load_columnar(tmp_path / "cols", columns=["nope"])
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        with pytest.raises(RuntimeError):
+            export_columnar(db_path, tmp_path / "pq", file_format="parquet")
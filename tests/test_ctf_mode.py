@@ -21,7 +21,7 @@ def test_capture_the_flag_pickup_tick_score_reset() -> None:
     world = World(tiles=tiles, atlas=atlas, human=human)
 
     mode = CaptureTheFlag()
-    info = mode.reset(world, RNG(11)).model_dump()
+    info = mode.reset(world, RNG(11)).to_dict()
     score_zone = info["score_zone"]
     assert score_zone == (2, height - 2)
 
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import sqlite3
+
+from src.logging.db import DBLogger
+from src.logging.migrations import SCHEMA_VERSION, benchmark_queries, migrate_database
+
+
+def _legacy_db(path) -> None:
+    connection = sqlite3.connect(path)
+    connection.executescript(
+        """
+        CREATE TABLE episodes (id INTEGER PRIMARY KEY, preset VARCHAR(64), seed INTEGER, mode VARCHAR(64), started_at VARCHAR(64));
+        CREATE TABLE steps (id INTEGER PRIMARY KEY, episode_id INTEGER, tick INTEGER, obs_json TEXT, action_int INTEGER,
+            action_json TEXT, reward_float FLOAT, reward_terms_json TEXT, done_bool BOOLEAN, info_json TEXT);
+        CREATE TABLE events (id INTEGER PRIMARY KEY, episode_id INTEGER, tick INTEGER, type VARCHAR(64), payload_json TEXT);
+        INSERT INTO episodes (preset, seed, mode, started_at) VALUES ('dungeon_exit', 1, 'ExitGame', 'now');
+        INSERT INTO steps (episode_id, tick, obs_json, action_int, reward_float, done_bool) VALUES (1, 0, '{}', 2, 0.5, 0);
+        INSERT INTO events (episode_id, tick, type, payload_json) VALUES (1, 0, 'tile_broken', '{}');
+        """
+    )
+    connection.commit()
+    connection.close()
+
+
+def _indexes(path) -> set[str]:
+    connection = sqlite3.connect(path)
+    try:
+        return {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    finally:
+        connection.close()
+
+
+def test_legacy_database_is_migrated_in_place_and_idempotently(tmp_path) -> None:
+    db_path = tmp_path / "atlas.db"
+    _legacy_db(db_path)
+    before = {row["query"]: row for row in benchmark_queries(db_path, repeats=1)}
+    assert not before["steps_for_episode"]["uses_index"]
+
+    applied = migrate_database(db_path)
+    assert "add column episodes.world_hash" in applied
+    assert {"ix_steps_episode_tick", "ix_events_type_episode", "ix_episodes_mode"} <= _indexes(db_path)
+    assert migrate_database(db_path) == []
+
+    after = {row["query"]: row for row in benchmark_queries(db_path, repeats=1)}
+    assert after["steps_for_episode"]["uses_index"]
+    assert after["events_by_type"]["uses_index"]
+    connection = sqlite3.connect(db_path)
+    assert connection.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert connection.execute("SELECT COUNT(*) FROM steps").fetchone()[0] == 1
+    connection.close()
+
+
+def test_new_logger_database_has_indexes(tmp_path) -> None:
+    db_path = tmp_path / "fresh.db"
+    DBLogger(db_path).start_episode("dungeon_exit", 1, "ExitGame", "now")
+    assert "ix_human_feedback_episode_tick" in _indexes(db_path)
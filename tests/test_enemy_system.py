@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import numpy as np
+
+from src.config import load_config
+from src.console import Console
+from src.core.types import Character, Enemy, Facing, TileType, Vec2
+from src.env.enemies import ENEMY_ENTITY_TYPE, EnemySystem
+from src.env.grid_env import GridEnv, World, apply_agent_action
+from src.env.multi_agent import MultiAgentGridEnv
+from src.env.rewards import DEATH_PENALTY
+from src.env.spatial_hash import SpatialHash
+
+
+def _open_world(width: int = 30, height: int = 10) -> World:
+    tiles = np.empty((height, width), dtype=object)
+    tiles[:] = TileType.EMPTY
+    tiles[height - 1, :] = TileType.WALL
+    atlas = Character(entity_id="ai_atlas", display_name="Atlas", pos=Vec2(2, height - 2))
+    human = Character(entity_id="human", display_name="Human", pos=Vec2(width - 2, height - 2))
+    return World(tiles=tiles, atlas=atlas, human=human)
+
+
+def _enemy(enemy_id: str, x: int, y: int, **kwargs) -> Enemy:
+    values = {"hp": 3, "atk": 2, "exp_value": 5, "aggro_radius": 5}
+    values.update(kwargs)
+    return Enemy(enemy_id=enemy_id, pos=Vec2(x, y), **values)
+
+
+def test_spatial_hash_matches_brute_force() -> None:
+    rng = np.random.default_rng(0)
+    index = SpatialHash(cell_size=3)
+    points = {}
+    for key in range(300):
+        points[key] = (int(rng.integers(-5, 40)), int(rng.integers(-5, 40)))
+        index.insert(key, points[key])
+    for key in range(0, 300, 3):
+        points[key] = (int(rng.integers(-5, 40)), int(rng.integers(-5, 40)))
+        index.move(key, points[key])
+    for key in range(1, 300, 7):
+        index.remove(key)
+        del points[key]
+
+    for _ in range(50):
+        center = (int(rng.integers(0, 35)), int(rng.integers(0, 35)))
+        radius = int(rng.integers(0, 8))
+        expected = {key for key, (x, y) in points.items() if abs(x - center[0]) <= radius and abs(y - center[1]) <= radius}
+        assert set(index.query(center, radius)) == expected
+        assert index.at(center) == {key for key, pos in points.items() if pos == center}
+
+
+def test_enemy_chases_and_attacks_nearest_actor() -> None:
+    world = _open_world()
+    world.spawn_enemy(_enemy("slime_1", 6, 8))
+    world.spawn_enemy(_enemy("idle", 15, 8))
+
+    world.step_enemies()
+    assert world.enemies[0].pos.as_int() == (5, 8)
+    assert world.enemies[1].pos.as_int() == (15, 8)
+
+    world.step_enemies()
+    assert world.step_enemies() == []
+    assert world.enemy_at((3, 8)).enemy_id == "slime_1"
+    events = world.step_enemies()
+    assert [event.type for event in events] == ["actor_damaged"]
+    assert world.atlas.hp == 8
+    # Attack cooldown: the next tick does no damage.
+    assert world.step_enemies() == []
+
+
+def test_player_attack_defeats_enemy_and_grants_exp() -> None:
+    env = GridEnv(load_config(), preset="dungeon_exit", seed=2)
+    env.reset(seed=2)
+    world = env.world
+    atlas = world.atlas
+    atlas.facing = Facing.EAST
+    atlas.atk = 3
+    x, y = atlas.pos.as_int()
+    world.set_tile((x + 1, y), TileType.EMPTY)
+    world.spawn_enemy(_enemy("bat", x + 1, y, hp=3, exp_value=7, aggro_radius=0))
+
+    _obs, _reward, _done, _trunc, info = env.step(9)
+    assert world.enemies == []
+    assert world.enemy_at((x + 1, y)) is None
+    assert info["reward_terms"]["exp_gain"] == 7.0
+
+
+def test_observation_lists_nearest_enemies() -> None:
+    env = GridEnv(load_config(), preset="dungeon_exit", seed=2)
+    env.reset(seed=2)
+    world = env.world
+    x, y = world.atlas.pos.as_int()
+    world.spawn_enemy(_enemy("far", x + 3, y, aggro_radius=0))
+    world.spawn_enemy(_enemy("near", x - 1, y, aggro_radius=0))
+    world.spawn_enemy(_enemy("outside", x + 40, y, aggro_radius=0))
+
+    # The human stands next to Atlas at spawn, so it ties with "near" and sorts first by type.
+    entities = env._obs()["local_entities"]
+    assert entities[1].tolist() == [ENEMY_ENTITY_TYPE, -1.0, 0.0]
+    assert entities[2].tolist() == [ENEMY_ENTITY_TYPE, 3.0, 0.0]
+    assert entities[3].tolist() == [0.0, 0.0, 0.0]
+
+
+def test_step_only_touches_enemies_near_actors() -> None:
+    world = _open_world(width=400, height=60)
+    for idx in range(500):
+        world.enemies.append(_enemy(f"e{idx:03d}", idx % 400, 50 + idx % 8))
+    system = EnemySystem(world.enemies)
+    before = {enemy.enemy_id: enemy.pos.as_int() for enemy in world.enemies}
+    system.step(world)
+    moved = {enemy.enemy_id for enemy in world.enemies if enemy.pos.as_int() != before[enemy.enemy_id]}
+    assert moved
+    assert all(abs(before[enemy_id][0] - 2) <= 5 or abs(before[enemy_id][0] - 398) <= 5 for enemy_id in moved)
+
+
+def test_console_spawns_enemy() -> None:
+    class FakeGame:
+        def __init__(self) -> None:
+            self.env = type("Env", (), {})()
+            self.env.world = _open_world()
+
+    game = FakeGame()
+    console = Console()
+    assert console.execute(game, "enemy spawn slime 4 8 5 7") == "spawned slime_1 at (4, 8)"
+    assert console.execute(game, "enemy spawn slime 5 8 5 7") == "spawned slime_2 at (5, 8)"
+    assert console.execute(game, "enemy spawn slime 99 8 5 7") == "enemy spawn out of bounds"
+    assert game.env.world.enemy_at((4, 8)).exp_value == 7
+
+
+def test_atlas_killed_by_enemy_ends_episode_with_penalty() -> None:
+    env = GridEnv(load_config(), preset="dungeon_exit", seed=2)
+    env.reset(seed=2)
+    world = env.world
+    atlas = world.atlas
+    atlas.hp = 1
+    x, y = atlas.pos.as_int()
+    world.set_tile((x - 1, y), TileType.EMPTY)
+    world.spawn_enemy(_enemy("brute", x - 1, y, atk=4))
+
+    _obs, reward, done, _trunc, info = env.step(0)
+    assert atlas.hp == 0 and done
+    assert info["reward_terms"]["death"] == -DEATH_PENALTY
+    assert reward < -DEATH_PENALTY + 1.0
+    # A defeated actor's actions are ignored.
+    assert apply_agent_action(world, atlas, 2) == [] and atlas.pos.as_int() == (x, y)
+
+
+def test_defeated_teammate_leaves_the_multi_agent_episode() -> None:
+    env = MultiAgentGridEnv(load_config(), n_agents=2, preset="dungeon_exit", seed=2)
+    env.reset(seed=2)
+    world = env.world
+    mate = world.get_actor("atlas_1")
+    mate.hp = 1
+    x, y = mate.pos.as_int()
+    world.set_tile((x, y - 1), TileType.EMPTY)
+    world.spawn_enemy(_enemy("brute", x, y - 1, atk=4, aggro_radius=1))
+
+    _obs, rewards, terminations, _truncs, infos = env.step({"ai_atlas": 0, "atlas_1": 0})
+    assert terminations == {"ai_atlas": False, "atlas_1": True}
+    assert infos["atlas_1"]["reward_terms"]["death"] == -DEATH_PENALTY
+    assert infos["ai_atlas"]["reward_terms"]["death"] == 0.0
+    assert env.agents == ["ai_atlas"]
+
+
+def test_add_and_remove_through_the_world_keep_the_index_in_sync() -> None:
+    world = _open_world()
+    world.spawn_enemy(_enemy("e1", 2, 4))
+    assert world.enemy_at((2, 4)).enemy_id == "e1"
+    world.spawn_enemy(_enemy("e2", 6, 4))
+    assert world.remove_enemy("e1").enemy_id == "e1"
+    assert [enemy.enemy_id for enemy in world.enemies] == ["e2"]
+    assert world.enemy_at((2, 4)) is None
+    assert world.enemy_at((6, 4)).enemy_id == "e2"
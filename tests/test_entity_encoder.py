@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import gymnasium as gym
+import numpy as np
+import pytest
+
+from src.config import load_config
+from src.core.types import Character, Enemy, TileType, Vec2
+from src.env.encoding import OBSERVATION_SCHEMA_VERSION
+from src.env.entity_encoder import ENTITY_FEATURES, EntityEncoder
+from src.env.grid_env import GridEnv, World
+from src.env.items import make_item
+from src.runtime.inference import export_policy_artifact, load_runtime_policy
+
+
+def _crowded_world(rng: np.random.Generator, size: int = 40) -> World:
+    tiles = np.empty((size, size), dtype=object)
+    tiles[:] = TileType.EMPTY
+    atlas = Character(entity_id="ai_atlas", display_name="Atlas", pos=Vec2(20, 20))
+    human = Character(entity_id="human", display_name="Human", pos=Vec2(float(rng.integers(15, 26)), 20))
+    world = World(tiles=tiles, atlas=atlas, human=human)
+    world.agents = {"atlas_1": Character(entity_id="atlas_1", display_name="A1", pos=Vec2(22.5, 19))}
+    for idx in range(200):
+        pos = Vec2(int(rng.integers(0, size)), int(rng.integers(0, size)))
+        world.spawn_enemy(Enemy(enemy_id=f"e{idx:03d}", pos=pos, hp=int(rng.integers(1, 9)), atk=1, exp_value=1, aggro_radius=3))
+    for idx in range(200):
+        world.spawn_item(make_item("potion", f"i{idx:03d}", (int(rng.integers(0, size)), int(rng.integers(0, size)))))
+    return world
+
+
+def _brute_force(world: World, actor: Character, k: int, radius: int) -> np.ndarray:
+    cx, cy = actor.pos.as_int()
+    rows = []
+    others = [(1 if other is world.human else 3, other.pos, other.hp, 0, "") for other in world.actors() if other is not actor]
+    others += [(4, enemy.pos, enemy.hp, 1, enemy.enemy_id) for enemy in world.enemies]
+    others += [(5, item.pos, 0, 0, item.item_id) for item in world.items]
+    for kind, pos, hp, hostile, ident in others:
+        x, y = pos.as_int()
+        if abs(x - cx) <= radius and abs(y - cy) <= radius:
+            dx, dy = np.float32(pos.x) - np.float32(actor.pos.x), np.float32(pos.y) - np.float32(actor.pos.y)
+            rows.append((abs(dx) + abs(dy), kind, ident, [kind, dx, dy, abs(dx) + abs(dy), hp, hostile]))
+    rows.sort(key=lambda row: row[:3])
+    out = np.zeros((k, len(ENTITY_FEATURES)), dtype=np.float32)
+    for idx, row in enumerate(rows[:k]):
+        out[idx] = row[3]
+    return out
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_encoder_matches_brute_force_nearest(seed: int) -> None:
+    world = _crowded_world(np.random.default_rng(seed))
+    encoder = EntityEncoder(k=6, features=ENTITY_FEATURES, radius=4)
+    np.testing.assert_array_equal(encoder.encode(world, world.atlas), _brute_force(world, world.atlas, 6, 4))
+
+
+def test_encoder_selects_features_and_reuses_output() -> None:
+    world = _crowded_world(np.random.default_rng(3))
+    encoder = EntityEncoder(k=3, features=("dx", "type"), radius=4)
+    out = np.full((3, 2), 99.0, dtype=np.float32)
+    assert encoder.encode(world, world.atlas, out) is out
+    full = _brute_force(world, world.atlas, 3, 4)
+    np.testing.assert_array_equal(out, full[:, [1, 0]])
+
+    world.enemies = []
+    world.items = []
+    world.agents = {}
+    world.human.pos = Vec2(0, 0)
+    encoder.encode(world, world.atlas, out)
+    assert not out.any()
+
+    with pytest.raises(ValueError):
+        EntityEncoder(features=("type", "colour"))
+
+
+def test_env_observation_follows_observation_config() -> None:
+    config = load_config()
+    config.observation.entity_k = 6
+    config.observation.entity_features = ["type", "distance", "hp", "hostile"]
+    env = GridEnv(config, preset="dungeon_exit", seed=1)
+    obs, _info = env.reset(seed=1)
+    assert env.observation_space["local_entities"].shape == (6, 4)
+    assert obs["local_entities"].shape == (6, 4)
+    assert obs["local_entities"][0].tolist() == [1.0, 1.0, 10.0, 0.0]
+    assert env.observation_schema_extras == {
+        "version": OBSERVATION_SCHEMA_VERSION,
+        "entity_features": ["type", "distance", "hp", "hostile"],
+    }
+
+
+def test_env_observations_do_not_alias_across_steps_and_resets() -> None:
+    env = GridEnv(load_config(), preset="dungeon_exit", seed=1)
+    obs, _info = env.reset(seed=1)
+    kept = obs["local_entities"].copy()
+    next_obs, *_ = env.step(2)
+    reset_obs, _info = env.reset(seed=2)
+    assert next_obs["local_entities"] is not obs["local_entities"]
+    assert reset_obs["local_entities"] is not next_obs["local_entities"]
+    np.testing.assert_array_equal(obs["local_entities"], kept)
+
+
+class _Env:
+    def __init__(self, extras: dict | None) -> None:
+        self.observation_space = gym.spaces.Dict({"stats": gym.spaces.Box(low=0, high=1, shape=(3,), dtype=np.float32)})
+        if extras is not None:
+            self.observation_schema_extras = extras
+
+
+def test_artifacts_with_other_schema_version_are_rejected(tmp_path: Path, monkeypatch) -> None:
+    checkpoint = tmp_path / "atlas_model.zip"
+    checkpoint.write_bytes(b"dummy-model-bytes")
+    monkeypatch.setattr("src.runtime.inference.RecurrentPPO.load", lambda *_args, **_kwargs: object())
+
+    old_dir = tmp_path / "old"
+    export_policy_artifact(checkpoint, _Env(None), old_dir)
+    with pytest.raises(ValueError, match="schema version None"):
+        load_runtime_policy(old_dir, _Env({"version": OBSERVATION_SCHEMA_VERSION, "entity_features": ["type"]}))
+
+    new_dir = tmp_path / "new"
+    manifest = export_policy_artifact(checkpoint, _Env({"version": OBSERVATION_SCHEMA_VERSION, "entity_features": ["type"]}), new_dir)
+    assert json.loads(manifest.read_text(encoding="utf-8"))["observation_schema"]["version"] == OBSERVATION_SCHEMA_VERSION
+    load_runtime_policy(new_dir, _Env({"version": OBSERVATION_SCHEMA_VERSION, "entity_features": ["type"]}))
+    with pytest.raises(ValueError, match="Observation schema mismatch"):
+        load_runtime_policy(new_dir, _Env({"version": OBSERVATION_SCHEMA_VERSION, "entity_features": ["dx"]}))
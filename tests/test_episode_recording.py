@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from src.config import DEFAULT_CONFIG_PATH, load_config
+from src.core.types import Enemy, Vec2
+from src.env.grid_env import GridEnv
+from src.env.items import make_item
+from src.human.input_keyboard import apply_human_command
+from src.logging.recording import EpisodeRecorder, iter_records, replay_record, state_hash
+from src.main import AtlasGame
+
+
+def _record_episode(tmp_path, steps: int = 40):
+    config = load_config()
+    env = GridEnv(config, preset="dungeon_exit", seed=11)
+    env.set_mode("ExitGame", {})
+    env.reset(seed=11)
+    recorder = EpisodeRecorder(env, checkpoint_interval=10, out_path=tmp_path / "episodes.jsonl")
+    recorder.begin()
+    hashes = []
+    for step in range(steps):
+        if step % 7 == 3:
+            apply_human_command(env.world, "human", "move_W")
+            recorder.record_human_input("human", "move_W")
+        action = [2, 2, 5, 10, 4, 0][step % 6]
+        _obs, _reward, done, _truncated, _info = env.step(action)
+        recorder.record_step(action, done=done)
+        hashes.append(state_hash(env))
+        if done:
+            break
+    record = recorder.finish()
+    return config, record, hashes
+
+
+def test_recorded_episode_replays_with_matching_checkpoints(tmp_path) -> None:
+    config, record, hashes = _record_episode(tmp_path)
+    stored = list(iter_records(tmp_path / "episodes.jsonl"))
+    assert len(stored) == 1
+    assert stored[0].actions == record.actions
+    assert stored[0].human_inputs == record.human_inputs
+
+    replayed_hashes = []
+    result = replay_record(stored[0], config, on_step=lambda env, _obs: replayed_hashes.append(state_hash(env)))
+    assert result.ok, result.mismatches
+    assert result.checkpoints_verified == len(record.checkpoints) >= 3
+    assert replayed_hashes == hashes
+
+
+def test_replay_reports_divergence(tmp_path) -> None:
+    config, record, _ = _record_episode(tmp_path)
+    record.human_inputs = []
+    result = replay_record(record, config)
+    assert not result.ok
+    assert "state hash mismatch" in result.mismatches[0]
+
+
+def test_headless_game_appends_records(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    game = AtlasGame(DEFAULT_CONFIG_PATH, record_path=tmp_path / "run.jsonl")
+    game.trainer.predict = lambda obs, state=None, mask=None: (2, state)
+    game.run_headless(25)
+
+    records = list(iter_records(tmp_path / "run.jsonl"))
+    assert sum(len(record.actions) for record in records) == 25
+    for record in records:
+        assert replay_record(record, game.config).ok
+
+
+def test_state_hash_covers_enemies_items_and_held_items() -> None:
+    env = GridEnv(load_config(), preset="dungeon_exit", seed=3)
+    env.reset(seed=3)
+    world = env.world
+    world.spawn_enemy(Enemy(enemy_id="slime_1", pos=Vec2(5, 5), hp=3, atk=1, exp_value=1, aggro_radius=0))
+    world.spawn_item(make_item("potion", "potion_1", (6, 5)))
+    hashes = {state_hash(env)}
+
+    world.damage_enemy("slime_1", 1, "ai_atlas")
+    hashes.add(state_hash(env))
+    world.place_item(world.take_item("potion_1"), (7, 5))
+    hashes.add(state_hash(env))
+    world.atlas.hand_item = world.take_item("potion_1")
+    hashes.add(state_hash(env))
+    world.atlas.inventory.append(world.atlas.hand_item)
+    world.atlas.hand_item = None
+    hashes.add(state_hash(env))
+    assert len(hashes) == 5
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.agent.world_model import WorldModel
+from src.config import load_config
+from src.core.types import Character, TileType, Vec2
+from src.env.exploration import ExplorationMemory
+from src.env.grid_env import GridEnv, World
+from src.env.rewards import EXPLORE_BONUS_PER_CELL
+
+
+def _world(width: int = 21, height: int = 9) -> World:
+    tiles = np.empty((height, width), dtype=object)
+    tiles[:] = TileType.EMPTY
+    tiles[:, 10] = TileType.WALL
+    atlas = Character(entity_id="ai_atlas", display_name="Atlas", pos=Vec2(2, 4))
+    human = Character(entity_id="human", display_name="Human", pos=Vec2(3, 4))
+    return World(tiles=tiles, atlas=atlas, human=human)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_bitmaps_match_boolean_reference(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    height, width = 13, 29
+    memory = ExplorationMemory(height, width)
+    seen = np.zeros((height, width), dtype=bool)
+    visited = np.zeros((height, width), dtype=bool)
+    for _ in range(40):
+        x, y = int(rng.integers(-3, width + 3)), int(rng.integers(-3, height + 3))
+        radius = int(rng.integers(0, 5))
+        before = seen.sum()
+        seen[max(0, y - radius) : max(0, y + radius + 1), max(0, x - radius) : max(0, x + radius + 1)] = True
+        revisit = 0 <= x < width and 0 <= y < height and visited[y, x]
+        assert memory.observe((x, y), radius) == seen.sum() - before
+        assert memory.revisit == revisit
+        if 0 <= x < width and 0 <= y < height:
+            visited[y, x] = True
+    np.testing.assert_array_equal(memory.seen_mask(), seen)
+    np.testing.assert_array_equal(memory.visited_mask(), visited)
+    assert memory.seen_count == seen.sum() and memory.visited_count == visited.sum()
+
+
+def test_frontier_stops_at_walls_and_world_edges() -> None:
+    world = _world()
+    memory = ExplorationMemory.for_world(world)
+    memory.observe((2, 4), 3)
+    frontier = {tuple(cell) for cell in memory.frontier(world).tolist()}
+    # Window is x 0..5, y 1..7: only the right column and the top/bottom rows border unseen cells.
+    assert (5, 4) in frontier and (2, 1) in frontier and (2, 7) in frontier
+    assert (0, 4) not in frontier and (3, 4) not in frontier
+
+    memory.observe((7, 4), 3)
+    frontier = {tuple(cell) for cell in memory.frontier(world).tolist()}
+    assert all(x != 10 for x, _y in frontier)
+    assert (9, 4) not in frontier
+    assert memory.nearest_frontier(world, (7, 4)) in frontier
+
+    model = WorldModel().sync(memory, world)
+    assert model.visited == {(2, 4), (7, 4)}
+    assert model.frontier == frontier
+    assert (10, 4) in model.boundaries
+
+
+def test_hint_points_at_nearest_frontier() -> None:
+    world = _world()
+    memory = ExplorationMemory.for_world(world)
+    memory.observe((2, 4), 3)
+    hint = memory.hint(world, (2, 4))
+    assert hint[0] == pytest.approx(memory.seen_count / (21 * 9))
+    assert hint[1] == 0.0
+    assert max(abs(hint[2]), abs(hint[3])) == 1.0
+    memory.observe((2, 4), 3)
+    assert memory.hint(world, (2, 4))[1] == 1.0
+
+
+def test_env_rewards_newly_seen_cells_and_fills_memory_hint() -> None:
+    env = GridEnv(load_config(), preset="dungeon_exit", seed=5)
+    obs, _info = env.reset(seed=5)
+    assert env.observation_space["memory_hint"].contains(obs["memory_hint"])
+    assert obs["memory_hint"][0] > 0
+    seen_before = env.exploration.seen_count
+
+    _obs, _reward, _done, _trunc, info = env.step(0)
+    assert info["reward_terms"]["explore"] == 0.0
+    for action in (2, 4):
+        _obs, _reward, _done, _trunc, info = env.step(action)
+        if env.exploration.seen_count > seen_before:
+            break
+    gained = env.exploration.seen_count - seen_before
+    assert gained > 0
+    assert info["reward_terms"]["explore"] == pytest.approx(EXPLORE_BONUS_PER_CELL * gained)
+
+
+def _reference_frontier(seen: np.ndarray, passable: np.ndarray) -> set[tuple[int, int]]:
+    unseen = ~seen
+    borders = np.zeros_like(seen)
+    borders[1:, :] |= unseen[:-1, :]
+    borders[:-1, :] |= unseen[1:, :]
+    borders[:, 1:] |= unseen[:, :-1]
+    borders[:, :-1] |= unseen[:, 1:]
+    return {(int(x), int(y)) for y, x in np.argwhere(seen & passable & borders)}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_frontier_matches_full_rescan(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    world = _world(width=37, height=19)
+    for _ in range(60):
+        world.set_tile((int(rng.integers(0, 37)), int(rng.integers(0, 19))), TileType.WALL)
+    memory = ExplorationMemory.for_world(world)
+    for step in range(30):
+        pos = (int(rng.integers(0, 37)), int(rng.integers(0, 19)))
+        memory.observe(pos, int(rng.integers(0, 4)))
+        if step % 10 == 9:
+            world.set_tile(pos, TileType.EMPTY if world.tiles[pos[1], pos[0]] == TileType.WALL else TileType.WALL)
+        passable = np.array([[tile != TileType.WALL for tile in row] for row in world.tiles])
+        expected = _reference_frontier(memory.seen_mask(), passable)
+        assert {tuple(cell) for cell in memory.frontier(world).tolist()} == expected
+
+        query = (int(rng.integers(0, 37)), int(rng.integers(0, 19)))
+        nearest = memory.nearest_frontier(world, query)
+        if not expected:
+            assert nearest is None
+        else:
+            best = min(abs(x - query[0]) + abs(y - query[1]) for x, y in expected)
+            assert nearest in expected and abs(nearest[0] - query[0]) + abs(nearest[1] - query[1]) == best
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import numpy as np
+
+from src.agent.policy import build_model
+from src.config import load_config
+from src.env.grid_env import GridEnv
+from src.runtime.fast_path import FastPolicyRunner, benchmark_predict_latency
+
+
+def _rollout_observations(env: GridEnv, steps: int = 12) -> list[dict]:
+    observations = []
+    obs, _ = env.reset(seed=3)
+    for step in range(steps):
+        observations.append(obs)
+        obs, _, done, _, _ = env.step([2, 5, 11, 4][step % 4])
+        if done:
+            obs, _ = env.reset(seed=3)
+    return observations
+
+
+def test_fast_path_and_traced_actor_match_sb3_predict() -> None:
+    config = load_config()
+    env = GridEnv(config, preset="dungeon_exit", seed=3)
+    model = build_model(env, config)
+    observations = _rollout_observations(env)
+
+    expected = []
+    state = None
+    for idx, obs in enumerate(observations):
+        action, state = model.predict(obs, state=state, episode_start=np.array([idx == 0]), deterministic=True)
+        expected.append(int(action))
+
+    for traced in (False, True):
+        runner = FastPolicyRunner(model, num_threads=1, traced=traced)
+        state = None
+        actions = []
+        for idx, obs in enumerate(observations):
+            action, state = runner.predict(obs, state=state, episode_start=idx == 0, deterministic=True)
+            actions.append(action)
+        assert actions == expected
+
+
+def test_fast_path_hidden_state_matches_sb3_state() -> None:
+    config = load_config()
+    env = GridEnv(config, seed=4)
+    model = build_model(env, config)
+    obs, _ = env.reset(seed=4)
+
+    _, sb3_state = model.predict(obs, state=None, episode_start=np.array([True]), deterministic=True)
+    _, fast_state = FastPolicyRunner(model).predict(obs, state=None, episode_start=True)
+
+    np.testing.assert_allclose(fast_state[0].numpy(), sb3_state[0], rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(fast_state[1].numpy(), sb3_state[1], rtol=1e-5, atol=1e-6)
+
+
+def test_benchmark_reports_p50_and_p99_per_path() -> None:
+    config = load_config()
+    env = GridEnv(config, seed=5)
+    model = build_model(env, config)
+
+    rows = benchmark_predict_latency(model, _rollout_observations(env, 4), iterations=10, warmup=2)
+
+    assert [row["path"] for row in rows] == ["sb3_predict", "fast_path", "fast_path_traced"]
+    for row in rows:
+        assert row["calls"] == 10
+        assert 0.0 < row["p50_ms"] <= row["p99_ms"]
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import zlib
+from datetime import datetime
+
+import numpy as np
+import pygame
+
+from src.config import load_config
+from src.core.rng import RNG
+from src.core.types import Character, TileType, Vec2
+from src.env.grid_env import GridEnv, World
+from src.env.world_gen import generate_world
+from src.logging.db import DBLogger
+from src.main import run_render_episode
+from src.render.frame_capture import FrameRenderer, RawVideoWriter, encode_png
+from src.render.renderer import Renderer
+
+
+def test_offscreen_frames_match_interactive_renderer_tiles() -> None:
+    pygame.init()
+    config = load_config()
+    env = GridEnv(config, preset="dungeon_exit", seed=2, render_mode="rgb_array")
+    env.reset(seed=2)
+    tile_size = 8
+    frame = FrameRenderer(tile_size).render(env.world)
+
+    height, width = env.world.tiles.shape
+    assert frame.shape == (height * tile_size, width * tile_size, 3)
+    surface = pygame.Surface((width * tile_size, height * tile_size + 160))
+    Renderer(tile_size, width, height).render(surface, env.world, env.mode.name, [])
+    reference = pygame.surfarray.array3d(surface).transpose(1, 0, 2)[: height * tile_size]
+    np.testing.assert_array_equal(frame, reference)
+
+    env_frame = env.render()
+    assert env_frame.shape == (height * config.rendering.tile_size, width * config.rendering.tile_size, 3)
+
+
+def test_frame_renderer_follows_tile_mutations_and_batches() -> None:
+    config = load_config()
+    env = GridEnv(config, preset="dungeon_exit", seed=2)
+    env.reset(seed=2)
+    renderer = FrameRenderer(4)
+    before = renderer.render(env.world)
+    env.world.set_tile((0, 0), TileType.GOAL)
+    after = renderer.render(env.world)
+
+    assert tuple(after[0, 0]) == (50, 180, 50)
+    assert not np.array_equal(before, after)
+    assert renderer.render_batch([env.world, env.world]).shape == (2, *after.shape)
+
+
+def test_frame_renderer_never_reuses_codes_across_resets() -> None:
+    # Each "reset" drops the old world before the next is built, so CPython is free to
+    # hand the new tile array the old one's id() while tile_version is 0 again.
+    renderer = FrameRenderer(2)
+    for seed in range(12):
+        tiles = generate_world("floating_islands", 24, 18, RNG(seed))
+        atlas = Character(entity_id="ai_atlas", display_name="Atlas", pos=Vec2(1, 1))
+        human = Character(entity_id="human", display_name="Human", pos=Vec2(2, 1))
+        world = World(tiles=tiles, atlas=atlas, human=human)
+        np.testing.assert_array_equal(renderer.render(world), FrameRenderer(2).render(world))
+        del world, tiles
+
+
+def test_png_encoding_round_trips_pixels() -> None:
+    frame = np.arange(4 * 5 * 3, dtype=np.uint8).reshape(4, 5, 3)
+    data = encode_png(frame)
+    assert data.startswith(b"\x89PNG")
+    idat = data[data.index(b"IDAT") + 4 : data.index(b"IEND") - 8]
+    rows = np.frombuffer(zlib.decompress(idat), dtype=np.uint8).reshape(4, 16)
+    np.testing.assert_array_equal(rows[:, 1:].reshape(4, 5, 3), frame)
+
+
+def test_logged_episode_renders_to_raw_video(tmp_path) -> None:
+    db_path = tmp_path / "atlas.db"
+    logger = DBLogger(db_path)
+    logger.start_episode("dungeon_exit", 3, "ExitGame", datetime.utcnow().isoformat())
+    for action in [2, 2, 5, 0, 4]:
+        logger.log_step({}, action, 0.0, False, {})
+
+    out_path = tmp_path / "episode.rgb"
+    frames = run_render_episode(None, db_path, out_path, tile_size=4)
+
+    meta = json.loads((tmp_path / "episode.rgb.json").read_text(encoding="utf-8"))
+    assert frames == meta["frames"] == 6
+    assert out_path.stat().st_size == frames * meta["width"] * meta["height"] * 3
+    with RawVideoWriter(tmp_path / "empty.rgb") as writer:
+        assert writer.frames == 0
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from collections import deque
+
+import numpy as np
+import pytest
+
+from src.config import load_config
+from src.core.rng import RNG
+from src.core.types import Character, TileType, Vec2
+from src.env.grid_env import GridEnv, World
+from src.env.physics import PASSABLE
+from src.env.shaping import UNREACHABLE, GoalShaper, distance_map, subgoal_targets
+from src.env.world_gen import hide_seek_maze
+
+
+def _reference_bfs(passable: np.ndarray, targets: list[tuple[int, int]]) -> np.ndarray:
+    height, width = passable.shape
+    dist = np.full((height, width), UNREACHABLE, dtype=np.int32)
+    queue = deque()
+    for x, y in targets:
+        dist[y, x] = 0
+        queue.append((x, y))
+    while queue:
+        x, y = queue.popleft()
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= nx < width and 0 <= ny < height and passable[ny, nx] and dist[ny, nx] == UNREACHABLE:
+                dist[ny, nx] = dist[y, x] + 1
+                queue.append((nx, ny))
+    return dist
+
+
+def _maze_world(width: int = 20, height: int = 12) -> World:
+    tiles = hide_seek_maze(width, height, RNG(21))
+    atlas = Character(entity_id="ai_atlas", display_name="Atlas", pos=Vec2(2, height - 2))
+    human = Character(entity_id="human", display_name="Human", pos=Vec2(3, height - 2))
+    return World(tiles=tiles, atlas=atlas, human=human)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_distance_map_matches_reference_bfs(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    passable = rng.random((11, 17)) > 0.3
+    targets = [(int(rng.integers(0, 17)), int(rng.integers(0, 11))) for _ in range(2)]
+    np.testing.assert_array_equal(distance_map(passable, targets), _reference_bfs(passable, targets))
+
+
+def test_maps_are_cached_until_tiles_change() -> None:
+    world = _maze_world()
+    shaper = GoalShaper(scale=0.1, gamma=1.0)
+    target = ((9, 5),)
+    assert shaper.distance(world, target, (9, 7)) == 2
+    shaper.distance(world, target, (3, 3))
+    assert shaper.maps.builds == 1
+
+    # Walling (9, 6) forces a detour around the maze pillars at (8, 6) and (10, 6).
+    world.set_tile((9, 6), TileType.WALL)
+    assert shaper.distance(world, target, (9, 7)) == 6
+    assert shaper.maps.builds == 2
+    assert np.array_equal(
+        shaper.maps.get(world, target), _reference_bfs(PASSABLE[world.tile_codes()], list(target))
+    )
+
+
+def test_shaping_is_a_potential_difference_along_the_path() -> None:
+    world = _maze_world()
+    shaper = GoalShaper(scale=0.1, gamma=1.0)
+    info = {"hide_target": (5, 9)}
+    path = [(2, 10), (3, 10), (4, 10), (5, 10), (5, 9)]
+    total = sum(shaper.shape(world, "find_hide_target", info, a, b) for a, b in zip(path, path[1:]))
+    assert total == pytest.approx(0.1 * 4)
+    assert shaper.shape(world, "find_hide_target", info, (3, 10), (2, 10)) == pytest.approx(-0.1)
+    shaper.reset()
+    assert shaper.shape(world, "explore", info, (2, 10), (3, 10)) == 0.0
+    # Terminal states have potential 0.
+    assert shaper.shape(world, "find_hide_target", info, (5, 10), (5, 9), done=True) == pytest.approx(0.1)
+
+
+def test_shaping_telescopes_across_subgoal_switches() -> None:
+    # A find_flag -> return_flag -> find_flag cycle back to the start earns no net shaping.
+    world = _maze_world()
+    shaper = GoalShaper(scale=0.1, gamma=1.0)
+    info = {"flag_pos": (5, 9), "score_zone": (2, 10)}
+    path = [(2, 10), (3, 10), (4, 10), (5, 10), (5, 9)]
+    total = sum(shaper.shape(world, "find_flag", info, a, b) for a, b in zip(path, path[1:]))
+    assert total == pytest.approx(0.4)
+    back = path[::-1]
+    total += sum(shaper.shape(world, "return_flag", info, a, b) for a, b in zip(back, back[1:]))
+    # The return trip pays 0.4 - 0.4 = 0 net: the switch at (5, 9) drops phi from 0 to -0.4.
+    assert total == pytest.approx(0.4)
+    total += shaper.shape(world, "find_flag", info, (2, 10), (3, 10))
+    total += shaper.shape(world, "find_flag", info, (3, 10), (2, 10))
+    assert total == pytest.approx(0.0)
+    # Actors keep separate potentials.
+    assert shaper.shape(world, "find_flag", info, (2, 10), (3, 10), key="atlas_1") == pytest.approx(0.1)
+
+
+def test_subgoal_targets_follow_tiles_and_mode_info() -> None:
+    world = _maze_world()
+    world.set_tile((6, 3), TileType.FLAG)
+    world.set_tile((14, 3), TileType.DOOR_CLOSED)
+    assert subgoal_targets("find_key", world) == ((6, 3),)
+    assert subgoal_targets("go_door", world) == ((14, 3),)
+    assert subgoal_targets("go_goal", world) == ()
+    assert subgoal_targets("return_flag", world, {"score_zone": (2, 10)}) == ((2, 10),)
+    assert subgoal_targets("find_flag", world, {"flag_pos": None}) == ()
+
+
+def test_env_replaces_manhattan_shaping_per_mode_toggle() -> None:
+    config = load_config()
+    assert config.shaping.enabled("HideAndSeek")
+    env = GridEnv(config, preset="hide_seek_maze", seed=4)
+    env.set_mode("HideAndSeek", {"hide_target": (12, 3)})
+    env.reset(seed=4)
+    assert env.mode.distance_shaping is False
+    x, y = env.world.atlas.pos.as_int()
+    _obs, _reward, _done, _trunc, info = env.step(2)
+    moved = env.world.atlas.pos.as_int()
+    expected = GoalShaper.from_config(config).shape(env.world, "find_hide_target", {"hide_target": (12, 3)}, (x, y), moved)
+    assert info["reward_terms"]["shaping"] == pytest.approx(expected)
+    assert info["reward_terms"]["shaping"] != 0.0
+
+    config.shaping.modes["HideAndSeek"] = False
+    env = GridEnv(config, preset="hide_seek_maze", seed=4)
+    env.set_mode("HideAndSeek", {"hide_target": (12, 3)})
+    env.reset(seed=4)
+    assert env.mode.distance_shaping is True
+    _obs, _reward, _done, _trunc, info = env.step(2)
+    assert info["reward_terms"]["shaping"] == 0.0
@@ -69,3 +69,29 @@ def test_console_hide_set_marker_updates_hide_seek_target() -> None:
     msg_default_y = console.execute(game, "hide set 10")
     assert msg_default_y == "hide marker set to (10, 8)"
     assert game.env.mode.hide_target == (10, 8)
+
+
+def test_mode_info_is_a_snapshot_and_console_validates_params() -> None:
+    class FakeGame:
+        def __init__(self) -> None:
+            self.env = type("Env", (), {})()
+            self.env.calls = []
+            self.env.set_mode = lambda name, params: self.env.calls.append((name, params))
+
+    mode = HideAndSeek(hide_target=(5, 5))
+    world = type("WorldStub", (), {})()
+    world.atlas = Character(entity_id="ai_atlas", display_name="Atlas", pos=Vec2(2, 5))
+    mode.reset(world, RNG(3))
+    before = mode.info()
+    mode.step(world, [], RNG(3))
+    assert before["details"]["steps_elapsed"] == 0
+    assert mode.info()["details"]["steps_elapsed"] == 1
+
+    game = FakeGame()
+    console = Console()
+    assert console.execute(game, 'mode set HideAndSeek {"hide_target": [4, 6]}') == "mode set to HideAndSeek"
+    assert game.env.calls == [("HideAndSeek", {"hide_target": (4, 6)})]
+    assert console.execute(game, 'mode set HideAndSeek {"time_limit_steps": 0}').startswith("mode set failed")
+    assert console.execute(game, 'mode set ExitGame {"bogus": 1}').startswith("mode set failed")
+    assert console.execute(game, "mode set NoSuchMode").startswith("mode set failed")
+    assert len(game.env.calls) == 1
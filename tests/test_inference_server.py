@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import numpy as np
+
+from src.agent.policy import build_model
+from src.config import load_config
+from src.env.grid_env import GridEnv
+from src.runtime.server import InferenceServer, LatencyHistogram
+
+
+class CountingModel:
+    """Stub recurrent model: action = obs value + number of prior steps in the session."""
+
+    def __init__(self) -> None:
+        self.batch_sizes: list[int] = []
+
+    def predict(self, obs, state=None, episode_start=None, deterministic=True):
+        values = np.asarray(obs["stats"])[:, 0]
+        n = values.shape[0]
+        self.batch_sizes.append(n)
+        if state is None:
+            state = (np.zeros((1, n, 1)), np.zeros((1, n, 1)))
+        hidden = np.where(np.asarray(episode_start)[None, :, None], 0.0, state[0]) + 1.0
+        actions = values + hidden[0, :, 0] - 1.0
+        return actions.astype(np.int64), (hidden, state[1])
+
+
+def _obs(value: int) -> dict:
+    return {"stats": np.array([value, 0.0, 0.0, 0.0], dtype=np.float32)}
+
+
+def test_server_batches_concurrent_sessions_and_keeps_state_per_session() -> None:
+    model = CountingModel()
+    results: dict[str, list[int]] = {}
+
+    with InferenceServer(model, max_batch_size=8, max_batch_wait_ms=20.0) as server:
+        def client(session_id: str, base: int) -> None:
+            results[session_id] = [server.predict(session_id, _obs(base)) for _ in range(3)]
+
+        threads = [threading.Thread(target=client, args=(f"s{idx}", idx * 10)) for idx in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = server.stats()
+
+    for idx in range(4):
+        assert results[f"s{idx}"] == [idx * 10, idx * 10 + 1, idx * 10 + 2]
+    assert max(model.batch_sizes) > 1
+    assert stats["sessions"] == 4
+    assert stats["latency"]["count"] == 12
+
+
+def test_same_session_requests_are_never_batched_together() -> None:
+    model = CountingModel()
+    with InferenceServer(model, max_batch_size=8, max_batch_wait_ms=20.0) as server:
+        futures = [server.submit("solo", _obs(0)) for _ in range(4)]
+        actions = [future.result(timeout=5) for future in futures]
+        server.mark_episode_done("solo")
+        restarted = asyncio.run(server.predict_async("solo", _obs(0)))
+
+    assert actions == [0, 1, 2, 3]
+    assert model.batch_sizes[:4] == [1, 1, 1, 1]
+    assert restarted == 0
+
+
+def test_batched_recurrent_policy_matches_sequential_predict() -> None:
+    config = load_config()
+    envs = [GridEnv(config, preset=preset, seed=5) for preset in ("dungeon_exit", "ctf_small", "floating_islands")]
+    model = build_model(envs[0], config)
+    observations = [env.reset(seed=5)[0] for env in envs]
+
+    expected = []
+    for obs in observations:
+        state = None
+        actions = []
+        for step in range(3):
+            action, state = model.predict(obs, state=state, episode_start=np.array([step == 0]), deterministic=True)
+            actions.append(int(action))
+        expected.append(actions)
+
+    with InferenceServer(model, max_batch_size=3, max_batch_wait_ms=20.0) as server:
+        served = [[0] * 3 for _ in observations]
+        for step in range(3):
+            futures = [server.submit(f"env{idx}", obs) for idx, obs in enumerate(observations)]
+            for idx, future in enumerate(futures):
+                served[idx][step] = future.result(timeout=10)
+
+    assert served == expected
+
+
+def test_latency_histogram_reports_percentiles_and_buckets() -> None:
+    histogram = LatencyHistogram(bucket_bounds_ms=(1.0, 10.0))
+    for seconds in (0.0005, 0.002, 0.003, 0.5):
+        histogram.record(seconds)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["buckets"] == {"le_1ms": 1, "le_10ms": 2, "inf": 1}
+    assert snapshot["p50_ms"] > 1.0
+    assert snapshot["p99_ms"] > 100.0
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import numpy as np
+
+from src.config import load_config
+from src.console import Console
+from src.core.types import Character, Facing, TileType, Vec2
+from src.env import encoding, tools
+from src.env.grid_env import GridEnv, World
+from src.env.items import INVENTORY_CAPACITY, apply_item_effects, make_item
+
+
+def _open_world(width: int = 12, height: int = 6) -> World:
+    tiles = np.empty((height, width), dtype=object)
+    tiles[:] = TileType.EMPTY
+    tiles[height - 1, :] = TileType.WALL
+    atlas = Character(entity_id="ai_atlas", display_name="Atlas", pos=Vec2(3, height - 2))
+    human = Character(entity_id="human", display_name="Human", pos=Vec2(9, height - 2))
+    return World(tiles=tiles, atlas=atlas, human=human)
+
+
+def test_pickup_fills_hand_then_inventory_and_drop_promotes_next_item() -> None:
+    world = _open_world()
+    world.spawn_item(make_item("sword", "sword_1", (4, 4)))
+    world.spawn_item(make_item("potion", "potion_1", (2, 4)))
+    world.atlas.facing = Facing.WEST
+
+    first = tools.pickup_adjacent(world, "ai_atlas")
+    assert first.ok and first.delta["slot"] == "hand"
+    assert world.hand_item.item_id == "potion_1"
+    second = tools.pickup_adjacent(world, "ai_atlas")
+    assert second.delta["slot"] == "inventory"
+    assert world.items == [] and world.items_adjacent((3, 4)) == []
+    assert not tools.precheck_pickup_adjacent(world, "ai_atlas").ok
+
+    dropped = tools.drop_hand(world, "ai_atlas")
+    assert dropped.ok and [event.type for event in dropped.events] == ["item_dropped"]
+    assert world.hand_item.item_id == "sword_1"
+    assert [item.item_id for item in world.items_at((3, 4))] == ["potion_1"]
+    assert world.item_by_id("potion_1") is world.items[0]
+
+
+def test_inventory_capacity_blocks_pickup() -> None:
+    world = _open_world()
+    atlas = world.atlas
+    atlas.hand_item = make_item("key", "held", (0, 0))
+    atlas.inventory = [make_item("key", f"k{idx}", (0, 0)) for idx in range(INVENTORY_CAPACITY)]
+    world.spawn_item(make_item("potion", "potion_1", (4, 4)))
+    assert tools.pickup(world, "ai_atlas", "potion_1").error_code == "hand_full"
+
+
+def test_consumables_apply_item_props() -> None:
+    world = _open_world()
+    atlas = world.atlas
+    atlas.facing = Facing.EAST
+    for item_type in ("potion", "boots", "feather", "crystal"):
+        atlas.inventory.append(make_item(item_type, item_type, (0, 0)))
+    atlas.hand_item = atlas.inventory.pop(0)
+
+    atlas.hp = 3
+    hp, jump_power = atlas.hp, atlas.jump_power
+    assert tools.use_adjacent(world, "ai_atlas").events[0].type == "item_used"
+    assert atlas.hp == hp + 5
+    tools.use_adjacent(world, "ai_atlas")
+    assert atlas.jump_power == jump_power + 1
+    tools.use_adjacent(world, "ai_atlas")
+    assert atlas.can_fly and atlas.fly_timer > 0
+    tools.use_adjacent(world, "ai_atlas")
+    assert atlas.transform_state == "berserk"
+    assert atlas.hand_item is None
+
+
+def test_heal_is_capped_at_max_hp() -> None:
+    atlas = _open_world().atlas
+    atlas.hp = atlas.max_hp - 2
+    assert apply_item_effects(atlas, make_item("potion", "potion_1", (0, 0))) == {"heal": 2}
+    assert atlas.hp == atlas.max_hp
+    assert apply_item_effects(atlas, make_item("potion", "potion_2", (0, 0))) == {"heal": 0}
+    assert atlas.hp == atlas.max_hp
+
+
+def test_key_opens_adjacent_door() -> None:
+    world = _open_world()
+    world.set_tile((4, 4), TileType.DOOR_CLOSED)
+    world.atlas.facing = Facing.EAST
+    world.atlas.hand_item = make_item("key", "key_1", (0, 0))
+    result = tools.use_adjacent(world, "ai_atlas")
+    assert [event.type for event in result.events] == ["door_opened"]
+    assert world.tiles[4, 4] == TileType.DOOR_OPEN
+    assert world.hand_item.item_id == "key_1"
+
+
+def test_env_actions_and_hand_observation() -> None:
+    env = GridEnv(load_config(), preset="dungeon_exit", seed=2)
+    obs, _info = env.reset(seed=2)
+    assert obs["hand_item"].tolist() == [0.0, 0.0, 0.0, 0.0]
+    world = env.world
+    x, y = world.atlas.pos.as_int()
+    world.set_tile((x + 1, y), TileType.EMPTY)
+    world.spawn_item(make_item("sword", "sword_1", (x + 1, y)))
+    assert env._obs()["action_mask"][6] == 1
+
+    obs, *_ = env.step(6)
+    assert obs["hand_item"].tolist() == [1.0, 0.0, 1.0, 0.0]
+    np.testing.assert_array_equal(obs["hand_item"], encoding.encode_hand_item(world.atlas.hand_item))
+    assert obs["action_mask"][7] == 1
+
+
+def test_console_spawns_item() -> None:
+    class FakeGame:
+        def __init__(self) -> None:
+            self.env = type("Env", (), {})()
+            self.env.world = _open_world()
+
+    game = FakeGame()
+    console = Console()
+    assert console.execute(game, "item spawn potion 5 4") == "spawned potion_1 at (5, 4)"
+    assert console.execute(game, "item spawn potion 40 4") == "item spawn out of bounds"
+    assert game.env.world.items_at((5, 4))[0].props.heal == 5
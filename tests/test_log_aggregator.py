@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import sqlite3
+
+from src.logging.aggregator import LogAggregator
+from src.logging.db import DBLogger
+
+
+def _log_episode(logger, seed: int, steps: int = 4) -> None:
+    logger.start_episode("dungeon_exit", seed, "ExitGame", "2026-01-01T00:00:00")
+    for tick in range(steps):
+        logger.log_step({"stats": [seed, tick]}, action=tick % 4, reward=0.5, done=tick == steps - 1, info={"t": tick})
+    logger.log_event("goal", {"seed": seed})
+    logger.log_human_action({"stats": []}, 2)
+
+
+def _worker(aggregator_queue, worker_id: str) -> None:
+    from src.logging.aggregator import QueueDBLogger
+
+    logger = QueueDBLogger(aggregator_queue, worker_id)
+    for seed in range(3):
+        _log_episode(logger, seed)
+
+
+def test_inline_aggregator_matches_direct_logger_rows(tmp_path) -> None:
+    direct = DBLogger(tmp_path / "direct.db")
+    _log_episode(direct, 7)
+
+    with LogAggregator(tmp_path / "agg.db", batch_size=3, flush_interval=0.05, inline=True) as aggregator:
+        _log_episode(aggregator.client("w0"), 7)
+
+    query = "SELECT episode_id, tick, obs_json, action_int, action_json, reward_float, done_bool, info_json FROM steps ORDER BY id"
+    expected = sqlite3.connect(tmp_path / "direct.db").execute(query).fetchall()
+    connection = sqlite3.connect(tmp_path / "agg.db")
+    assert connection.execute(query).fetchall() == expected
+    assert connection.execute("SELECT worker_id FROM episodes").fetchall() == [("w0",)]
+    assert connection.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 1
+    assert connection.execute("SELECT COUNT(*) FROM human_actions").fetchone()[0] == 1
+
+
+def test_worker_episodes_get_distinct_database_ids(tmp_path) -> None:
+    with LogAggregator(tmp_path / "agg.db", inline=True) as aggregator:
+        first, second = aggregator.client("a"), aggregator.client("b")
+        _log_episode(first, 1)
+        _log_episode(second, 2)
+        _log_episode(first, 3)
+
+    connection = sqlite3.connect(tmp_path / "agg.db")
+    episodes = connection.execute("SELECT id, seed, worker_id FROM episodes ORDER BY id").fetchall()
+    assert episodes == [(1, 1, "a"), (2, 2, "b"), (3, 3, "a")]
+    per_episode = connection.execute("SELECT episode_id, COUNT(*) FROM steps GROUP BY episode_id").fetchall()
+    assert per_episode == [(1, 4), (2, 4), (3, 4)]
+
+
+def test_writer_process_collects_rows_from_worker_processes(tmp_path) -> None:
+    aggregator = LogAggregator(tmp_path / "agg.db", batch_size=16, flush_interval=0.05).start()
+    workers = [mp.get_context().Process(target=_worker, args=(aggregator.queue, f"w{idx}")) for idx in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(30)
+    aggregator.stop()
+
+    connection = sqlite3.connect(tmp_path / "agg.db")
+    assert connection.execute("SELECT COUNT(*) FROM episodes").fetchone()[0] == 6
+    assert connection.execute("SELECT COUNT(*) FROM steps").fetchone()[0] == 24
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
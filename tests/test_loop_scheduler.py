@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from src.config import DEFAULT_CONFIG_PATH
+from src.core.timebase import FixedRate, LoopScheduler
+from src.main import AtlasGame
+from src.runtime.worker import PolicyWorker
+
+
+def test_headless_scheduler_keeps_channel_rate_ratios() -> None:
+    scheduler = LoopScheduler({"agent": 5, "env": 30, "render": 60}, headless=True)
+    totals = {"agent": 0, "env": 0, "render": 0}
+    for _ in range(120):
+        for name, due in scheduler.tick().items():
+            totals[name] += due
+
+    assert totals == {"agent": 10, "env": 60, "render": 120}
+
+
+def test_fixed_rate_drops_backlog_beyond_catch_up_limit() -> None:
+    rate = FixedRate(hz=10, max_catch_up=3)
+    assert rate.advance(0.05) == 0
+    assert rate.advance(0.05) == 1
+    assert rate.advance(5.0) == 3
+    assert rate.time_to_next() == rate.period
+    assert FixedRate(hz=0).advance(0.0) == 1
+
+
+def test_policy_worker_runs_predict_off_thread_and_tags_results() -> None:
+    def slow_predict(obs, state=None, mask=None):
+        time.sleep(0.02)
+        return obs["value"] * 2, (state or 0) + 1
+
+    worker = PolicyWorker(slow_predict)
+    try:
+        assert worker.submit({"value": 3}, None, True, tag=7)
+        assert not worker.submit({"value": 4}, None, False, tag=7)
+        deadline = time.perf_counter() + 2.0
+        result = None
+        while result is None and time.perf_counter() < deadline:
+            result = worker.poll()
+        assert result == (6, 1, 7)
+        assert not worker.busy
+    finally:
+        worker.close()
+
+
+def test_headless_game_steps_env_at_configured_ratio(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    game = AtlasGame(DEFAULT_CONFIG_PATH)
+    calls = {"predict": 0}
+
+    def predict(obs, state=None, mask=None):
+        calls["predict"] += 1
+        return 0, state
+
+    game.trainer.predict = predict
+    game.run_headless(30)
+
+    timing = game.config.timing
+    assert calls["predict"] == 30 * timing.agent_step_hz // timing.env_step_hz
+    # One ``steps`` row per agent decision.
+    assert game.db.tick == calls["predict"]
+
+
+def test_filler_env_steps_fold_into_the_last_agent_transition(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    game = AtlasGame(DEFAULT_CONFIG_PATH)
+    game.trainer.predict = lambda obs, state=None, mask=None: (0, state)
+    logged: list[tuple[float, bool, dict]] = []
+    log_step = game.db.log_step
+
+    def recording_log_step(obs, action, reward, done, info, reward_terms=None):
+        logged.append((reward, done, reward_terms))
+        log_step(obs, action, reward, done, info, reward_terms)
+
+    game.db.log_step = recording_log_step
+    steps: list[tuple[bool, float, bool]] = []
+    step = game.env.step
+    env_tick = game._env_tick
+
+    def recording_step(action, preference_reward=0.0):
+        result = step(action, preference_reward=preference_reward)
+        steps[-1] = (steps[-1][0], result[1], result[2])
+        return result
+
+    def recording_tick():
+        steps.append((game.pending_action is not None, 0.0, False))
+        env_tick()
+
+    game.env.step = recording_step
+    game._env_tick = recording_tick
+    # End the episode on a filler tick: its ``done`` must still reach the logged row.
+    game.env.config.world.max_episode_steps = 9
+    game.run_headless(30)
+
+    transitions = game.trainer.replay_buffer.transitions
+    assert len(logged) == len(transitions) == 5
+    assert [row[0] for row in logged] == pytest.approx([t.reward for t in transitions])
+    assert [row[1] for row in logged] == [t.done for t in transitions]
+    assert any(done and not decision for decision, _r, done in steps)
+    assert sum(row[1] for row in logged) == sum(done for _d, _r, done in steps)
+    # Every env step from a decision to the episode end is folded into some logged row.
+    covered, open_decision = 0.0, False
+    for decision, reward, done in steps:
+        open_decision = open_decision or decision
+        covered += reward if open_decision else 0.0
+        open_decision = open_decision and not done
+    assert sum(row[0] for row in logged) == pytest.approx(covered)
+    for reward, _done, terms in logged:
+        assert terms["total"] == pytest.approx(reward)
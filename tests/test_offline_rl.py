@@ -1,14 +1,22 @@
 from __future__ import annotations
 
 import json
+import random
 from pathlib import Path
 
 import numpy as np
 
-from src.agent.offline_rl import OfflineReplayEnv, OfflineTransition, load_offline_transitions
+from src.agent.offline_rl import (
+    OfflineReplayEnv,
+    OfflineTransition,
+    load_offline_transitions,
+    shuffle_buffer,
+    stream_offline_transitions,
+)
 from src.config import load_config
 from src.env.grid_env import GridEnv
 from src.logging.db import DBLogger
+from src.logging.replay import export_steps, is_jsonl_export
 
 
 def _obs_payload(action_count: int = 14) -> dict:
@@ -49,6 +57,20 @@ def test_load_offline_transitions_from_jsonl(tmp_path: Path) -> None:
     assert transitions[0].done is True
 
 
+def test_compressed_jsonl_exports_stream_like_plain_jsonl(tmp_path: Path) -> None:
+    db_path = tmp_path / "atlas.db"
+    logger = DBLogger(db_path)
+    logger.start_episode("dungeon_exit", 7, "ExitGame", "2026-01-01T00:00:00")
+    for action in (1, 2, 3):
+        logger.log_step(_obs_payload(), action=action, reward=0.5, done=action == 3, info={})
+    assert export_steps(db_path, tmp_path / "replay.jsonl.gz") == 3
+
+    assert [tr.action for tr in stream_offline_transitions(tmp_path / "replay.jsonl.gz")] == [1, 2, 3]
+    assert load_offline_transitions(tmp_path / "replay.jsonl.gz")[-1].done is True
+    assert is_jsonl_export(Path("run.JSONL.zst")) and is_jsonl_export(Path("replay.jsonl"))
+    assert not is_jsonl_export(Path("atlas.db")) and not is_jsonl_export(Path("archive.gz"))
+
+
 def test_offline_replay_env_runs_step() -> None:
     config = load_config(None)
     env = GridEnv(config)
@@ -73,3 +95,79 @@ def test_offline_replay_env_runs_step() -> None:
     assert isinstance(reward, float)
     assert isinstance(done, bool)
     assert info["algorithm"] == "iql"
+
+
+def test_streamed_transitions_match_list_loader_and_track_reward_stats(tmp_path: Path) -> None:
+    db_path = tmp_path / "atlas.db"
+    logger = DBLogger(db_path)
+    logger.start_episode("dungeon_exit", 7, "ExitGame", "2026-01-01T00:00:00")
+    rewards = [0.5, -1.0, 2.0, 0.0, 3.5, 1.0, -0.25]
+    for idx, reward in enumerate(rewards):
+        logger.log_step(_obs_payload(), action=idx % 4, reward=reward, done=False, info={})
+
+    for workers in (0, 2):
+        stream = stream_offline_transitions(db_path, chunk_size=3, parse_workers=workers)
+        assert [t.reward for t in stream] == rewards
+        assert stream.reward_stats.count == len(rewards)
+        assert np.isclose(stream.reward_stats.std, np.std(rewards))
+    assert [t.action for t in load_offline_transitions(db_path)] == [idx % 4 for idx in range(len(rewards))]
+
+
+def test_shuffle_buffer_is_bounded_permutation() -> None:
+    items = list(range(50))
+    shuffled = list(shuffle_buffer(items, 8, random.Random(1)))
+    assert sorted(shuffled) == items
+    assert shuffled != items
+    assert list(shuffle_buffer(items, 1, random.Random(1))) == items
+
+
+def test_offline_replay_env_cycles_a_stream(tmp_path: Path) -> None:
+    path = tmp_path / "replay.jsonl"
+    rows = [{"mode": "ExitGame", "obs": _obs_payload(), "action": idx % 3, "reward": float(idx), "done": False} for idx in range(5)]
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+    env = GridEnv(load_config(None))
+
+    replay_env = OfflineReplayEnv(
+        transitions=stream_offline_transitions(path, chunk_size=2),
+        observation_space=env.observation_space,
+        action_space=env.action_space,
+        episode_horizon=100,
+        shuffle_buffer_size=3,
+    )
+    replay_env.reset(seed=0)
+    seen = [replay_env.step(0)[4]["expected_action"] for _ in range(12)]
+    assert sorted(seen[:5]) == sorted(row["action"] for row in rows)
+    assert len(seen) == 12
+
+
+def test_streamed_episodes_replay_in_logged_order(tmp_path: Path) -> None:
+    path = tmp_path / "replay.jsonl"
+    # Four logged episodes of 3 steps each; ``action`` encodes (episode, step).
+    rows = [
+        {"mode": "ExitGame", "obs": _obs_payload(), "action": 10 * episode + step, "reward": 1.0, "done": step == 2}
+        for episode in range(4)
+        for step in range(3)
+    ]
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+    env = GridEnv(load_config(None))
+    stream = stream_offline_transitions(path, chunk_size=2)
+    replay_env = OfflineReplayEnv(
+        transitions=stream,
+        observation_space=env.observation_space,
+        action_space=env.action_space,
+        episode_horizon=8,
+        shuffle_buffer_size=32,
+    )
+
+    episodes = []
+    for _ in range(8):
+        replay_env.reset()
+        actions, done = [], False
+        while not done:
+            _obs, _reward, done, _trunc, info = replay_env.step(0)
+            actions.append(info["expected_action"])
+        episodes.append(actions)
+    assert all(actions == [actions[0], actions[0] + 1, actions[0] + 2] for actions in episodes)
+    assert {actions[0] // 10 for actions in episodes} == {0, 1, 2, 3}
+    # The stream restarted at least once, but each row is counted in the reward stats only once.
+    assert stream.reward_stats.count == len(rows)
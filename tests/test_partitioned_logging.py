@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+
+from src.agent.offline_rl import load_offline_transitions
+from src.config import LoggingConfig
+from src.logging.partitions import (
+    PartitionedDBLogger,
+    delete_partition,
+    open_db_logger,
+    partition_paths,
+    query_partitions,
+)
+from src.logging.replay import export_steps, load_episode_actions
+
+
+def _log_episodes(logger, count: int, steps: int = 3) -> None:
+    for episode in range(count):
+        mode = "ExitGame" if episode % 2 == 0 else "CaptureTheFlag"
+        logger.start_episode("dungeon_exit", episode, mode, "2026-01-01T00:00:00")
+        for tick in range(steps):
+            logger.log_step({"stats": [1, 2, 3, 4]}, action=episode, reward=float(tick), done=tick == steps - 1, info={})
+
+
+def test_rotates_by_episode_count_with_globally_unique_episode_ids(tmp_path) -> None:
+    root = tmp_path / "logs"
+    logger = PartitionedDBLogger(root, rotation="episodes", episodes_per_partition=2, writer_id="w0")
+    _log_episodes(logger, 5)
+
+    partitions = partition_paths(root)
+    assert len(partitions) == 3
+    rows = list(query_partitions(root, "SELECT id FROM episodes"))
+    assert sorted(row[0] for row in rows) == [1, 2, 3, 4, 5]
+    assert len(partition_paths(root, episode_ids=[3])) == 1
+
+
+def test_readers_span_partitions_and_writers(tmp_path) -> None:
+    root = tmp_path / "logs"
+    config = LoggingConfig(partition_dir=str(root), rotation="episodes", episodes_per_partition=1)
+    _log_episodes(open_db_logger(config, writer_id="a"), 2)
+    _log_episodes(open_db_logger(config, writer_id="b"), 2)
+
+    out_path = tmp_path / "all.jsonl"
+    assert export_steps(root, out_path) == 12
+    episode_ids = {json.loads(line)["episode_id"] for line in out_path.read_text(encoding="utf-8").splitlines()}
+    assert episode_ids == {1, 2, 3, 4}
+    assert export_steps(root, tmp_path / "ctf.jsonl", mode="CaptureTheFlag") == 6
+    assert len(load_offline_transitions(root)) == 12
+
+    header, actions = load_episode_actions(root, 3)
+    assert header["id"] == 3 and actions == [0, 0, 0]
+
+    removed = delete_partition(root, partition_paths(root, episode_ids=[1])[0].name)
+    assert removed == 1
+    assert export_steps(root, out_path) == 9
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import copy
+
+import numpy as np
+import pytest
+
+from src.core.actor_table import ActorTable
+from src.core.types import Character, TileType, Vec2
+from src.env.grid_env import World, _apply_vertical_motion
+from src.env.physics import MOTION_COLUMNS, apply_vertical_motion_batch, vertical_motion
+
+TILES = list(TileType)
+
+
+def _random_world(rng: np.random.Generator, width: int = 12, height: int = 9) -> World:
+    weights = np.full(len(TILES), 1.0)
+    weights[TILES.index(TileType.EMPTY)] = 8.0
+    codes = rng.choice(len(TILES), size=(height, width), p=weights / weights.sum())
+    tiles = np.empty((height, width), dtype=object)
+    for (y, x), code in np.ndenumerate(codes):
+        tiles[y, x] = TILES[code]
+    atlas = Character(entity_id="ai_atlas", display_name="Atlas", pos=Vec2(1, 1), level=int(rng.integers(0, 3)))
+    human = Character(entity_id="human", display_name="Human", pos=Vec2(2, 1))
+    return World(tiles=tiles, atlas=atlas, human=human)
+
+
+def _random_actor(rng: np.random.Generator, idx: int, width: int, height: int) -> Character:
+    x = float(rng.integers(-1, width + 1)) + (0.5 if rng.random() < 0.2 else 0.0)
+    y = float(rng.uniform(-1.5, height + 0.5)) if rng.random() < 0.7 else float(rng.integers(0, height))
+    return Character(
+        entity_id=f"a{idx}",
+        display_name=f"A{idx}",
+        pos=Vec2(x, y),
+        vel=Vec2(0.0, float(rng.choice([0.0, 0.2, 1.3, 3.0, -0.4]))),
+        can_fly=bool(rng.random() < 0.15),
+        jump_remaining=int(rng.integers(0, 4)) if rng.random() < 0.4 else 0,
+        jump_cooldown=int(rng.integers(0, 4)),
+        grounded=bool(rng.random() < 0.5),
+    )
+
+
+def _state(actor: Character) -> tuple:
+    return (actor.pos.x, actor.pos.y, actor.vel.y, actor.jump_remaining, actor.jump_cooldown, actor.grounded)
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_kernel_matches_scalar_vertical_motion(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    world = _random_world(rng)
+    height, width = world.tiles.shape
+    scalar = [_random_actor(rng, idx, width, height) for idx in range(24)]
+    batched = copy.deepcopy(scalar)
+    table = None
+    for _tick in range(15):
+        for actor in scalar:
+            _apply_vertical_motion(world, actor)
+        table = apply_vertical_motion_batch(world, batched, table)
+        for expected, actual in zip(scalar, batched):
+            assert _state(actual) == _state(expected)
+
+
+def test_kernel_runs_actors_from_several_worlds_at_once() -> None:
+    rng = np.random.default_rng(99)
+    worlds = [_random_world(rng) for _ in range(4)]
+    height, width = worlds[0].tiles.shape
+    actors = [[_random_actor(rng, idx, width, height) for idx in range(6)] for _ in worlds]
+    expected = copy.deepcopy(actors)
+
+    flat = [actor for group in actors for actor in group]
+    for idx, actor in enumerate(flat):
+        actor.entity_id = f"w{idx}"
+    table = ActorTable.from_actors(flat)
+    world_index = np.repeat(np.arange(len(worlds)), 6)
+    passer_level = np.array([world.atlas.level for world in worlds], dtype=np.int32)[world_index]
+    codes = np.stack([world.tile_codes() for world in worlds])
+    for _tick in range(10):
+        vertical_motion(codes, table, passer_level, world_index)
+        for world, group in zip(worlds, expected):
+            for actor in group:
+                _apply_vertical_motion(world, actor)
+    table.store(flat, MOTION_COLUMNS)
+
+    for actual, reference in zip(flat, [actor for group in expected for actor in group]):
+        assert _state(actual) == _state(reference)
+
+
+def test_tile_codes_follow_set_tile() -> None:
+    world = _random_world(np.random.default_rng(1))
+    codes = world.tile_codes()
+    world.set_tile((3, 4), TileType.WALL)
+    assert world.tile_codes() is codes
+    assert codes[4, 3] == TILES.index(TileType.WALL)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import numpy as np
+import pygame
+
+from src.config import load_config
+from src.core.types import Character, Enemy, TileType, Vec2
+from src.env.grid_env import GridEnv
+from src.env.items import make_item
+from src.render.frame_capture import FrameRenderer
+from src.render.renderer import Renderer
+
+
+def _grid_pixels(surface: pygame.Surface, renderer: Renderer) -> bytes:
+    grid = pygame.Rect(0, 0, renderer.width * renderer.tile_size, renderer.height * renderer.tile_size)
+    return pygame.image.tostring(surface.subsurface(grid), "RGB")
+
+
+def test_incremental_frames_match_full_redraw_and_report_small_rects() -> None:
+    pygame.init()
+    config = load_config()
+    env = GridEnv(config, preset="dungeon_exit", seed=2)
+    env.reset(seed=2)
+    world = env.world
+    tile_size = 8
+    renderer = Renderer(tile_size, config.world.width, config.world.height)
+    surface = pygame.Surface((config.world.width * tile_size, config.world.height * tile_size + 160))
+
+    first = renderer.render(surface, world, env.mode.name, [])
+    assert first == [surface.get_rect()]
+
+    world.atlas.pos.x += 1
+    target = next(
+        (x, y)
+        for y in range(world.tiles.shape[0])
+        for x in range(world.tiles.shape[1])
+        if world.tiles[y, x] == TileType.WALL
+    )
+    world.set_tile(target, TileType.EMPTY)
+    rects = renderer.render(surface, world, env.mode.name, [], debug_hud=True)
+    assert surface.get_rect() not in rects
+    assert pygame.Rect(target[0] * tile_size, target[1] * tile_size, tile_size, tile_size) in rects
+    assert not world.dirty_tiles
+
+    renderer.render(surface, world, env.mode.name, [])
+    reference_surface = pygame.Surface(surface.get_size())
+    Renderer(tile_size, config.world.width, config.world.height).render(reference_surface, world, env.mode.name, [])
+    assert _grid_pixels(surface, renderer) == _grid_pixels(reference_surface, renderer)
+
+
+def test_new_world_triggers_full_redraw() -> None:
+    pygame.init()
+    config = load_config()
+    env = GridEnv(config, seed=3)
+    env.reset(seed=3)
+    renderer = Renderer(8, config.world.width, config.world.height)
+    surface = pygame.Surface((config.world.width * 8, config.world.height * 8 + 160))
+    renderer.render(surface, env.world, env.mode.name, [])
+
+    env.reset(seed=4)
+    assert renderer.render(surface, env.world, env.mode.name, []) == [surface.get_rect()]
+
+
+def test_entities_are_drawn_and_their_moves_reported() -> None:
+    pygame.init()
+    config = load_config()
+    env = GridEnv(config, preset="dungeon_exit", seed=2)
+    env.reset(seed=2)
+    world = env.world
+    tile_size = 8
+    free = [
+        (x, y)
+        for y in range(world.tiles.shape[0])
+        for x in range(world.tiles.shape[1])
+        if world.tiles[y, x] == TileType.EMPTY and (x, y) not in {world.atlas.pos.as_int(), world.human.pos.as_int()}
+    ]
+    enemy_cell, enemy_next, item_cell, agent_cell = free[:4]
+    world.spawn_enemy(Enemy(enemy_id="e0", pos=Vec2(*enemy_cell), hp=3, atk=1, exp_value=1, aggro_radius=3))
+    world.spawn_item(make_item("potion", "i0", item_cell))
+    world.agents = {"atlas_1": Character(entity_id="atlas_1", display_name="A1", pos=Vec2(*agent_cell))}
+    renderer = Renderer(tile_size, config.world.width, config.world.height)
+    surface = pygame.Surface((config.world.width * tile_size, config.world.height * tile_size + 160))
+    renderer.render(surface, world, env.mode.name, [])
+
+    def tile_rect(cell: tuple[int, int]) -> pygame.Rect:
+        return pygame.Rect(cell[0] * tile_size, cell[1] * tile_size, tile_size, tile_size)
+
+    for cell in (enemy_cell, item_cell, agent_cell):
+        assert tile_rect(cell) in renderer._actor_rects
+    frame = FrameRenderer(tile_size).render(world)
+    reference = pygame.surfarray.array3d(surface).transpose(1, 0, 2)[: frame.shape[0]]
+    np.testing.assert_array_equal(frame, reference)
+
+    world.enemies[0].pos = Vec2(*enemy_next)
+    world.take_item("i0")
+    rects = renderer.render(surface, world, env.mode.name, [])
+    for cell in (enemy_cell, enemy_next, item_cell):
+        assert tile_rect(cell) in rects
+    reference_surface = pygame.Surface(surface.get_size())
+    Renderer(tile_size, config.world.width, config.world.height).render(reference_surface, world, env.mode.name, [])
+    assert _grid_pixels(surface, renderer) == _grid_pixels(reference_surface, renderer)
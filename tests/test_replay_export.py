@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import gzip
+import json
+from datetime import datetime
+
+from src.logging.db import DBLogger
+from src.logging.replay import export_steps, export_steps_sharded
+
+
+def _populate(db_path) -> None:
+    logger = DBLogger(db_path)
+    for mode, steps in (("ExitGame", 5), ("CaptureTheFlag", 3), ("ExitGame", 4)):
+        logger.start_episode("dungeon_exit", 1, mode, datetime.utcnow().isoformat())
+        for tick in range(steps):
+            logger.log_step({"tick": tick}, tick % 3, 0.5, tick == steps - 1, {"mode": mode})
+
+
+def _read_jsonl(path) -> list[dict]:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle]
+
+
+def test_streaming_export_applies_filters_and_keeps_row_format(tmp_path) -> None:
+    db_path = tmp_path / "atlas.db"
+    _populate(db_path)
+
+    assert export_steps(db_path, tmp_path / "all.jsonl", chunk_size=2) == 12
+    rows = _read_jsonl(tmp_path / "all.jsonl")
+    assert [(row["episode_id"], row["tick"]) for row in rows[:2]] == [(1, 0), (1, 1)]
+    assert set(rows[0]) == {"episode_id", "tick", "obs", "action", "reward", "done", "info"}
+
+    assert export_steps(db_path, tmp_path / "exit.jsonl.gz", mode="ExitGame", tick_range=(1, 3)) == 4
+    filtered = _read_jsonl(tmp_path / "exit.jsonl.gz")
+    assert {row["episode_id"] for row in filtered} == {1, 3}
+    assert {row["tick"] for row in filtered} == {1, 2}
+
+
+def test_sharded_export_writes_one_file_per_episode(tmp_path) -> None:
+    db_path = tmp_path / "atlas.db"
+    _populate(db_path)
+
+    shards = export_steps_sharded(db_path, tmp_path / "shards", compression="gzip", workers=2)
+
+    assert sorted(shards) == [1, 2, 3]
+    assert [len(_read_jsonl(shards[episode])) for episode in (1, 2, 3)] == [5, 3, 4]
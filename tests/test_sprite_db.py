@@ -1,5 +1,6 @@
 import pygame
 
+from src.core.types import TileType
 from src.render.sprite_db import SpriteDB
 
 
@@ -28,3 +29,34 @@ def test_character_sprite_is_not_full_block_and_stays_in_bounds() -> None:
     assert len(filled_pixels) < 32 * 32
     assert surface.get_at((0, 0)).a == 0
     assert surface.get_at((31, 31)).a == 0
+
+
+def test_character_sprites_are_cached_bounded_and_invalidated_on_resize() -> None:
+    pygame.init()
+    sprites = SpriteDB(tile_size=16, max_cached_sprites=2)
+
+    first = sprites.character_sprite((50, 200, 255))
+    assert sprites.character_sprite((50, 200, 255)) is first
+    assert sprites.character_sprite((50, 200, 255), "bird") is not first
+
+    sprites.character_sprite((200, 200, 50))
+    assert sprites.cache_info()["characters"] == 2
+    assert sprites.character_sprite((50, 200, 255)) is not first
+
+    sprites.set_tile_size(32)
+    assert sprites.cache_info()["characters"] == 0
+    assert sprites.character_sprite((50, 200, 255)).get_size() == (32, 32)
+
+
+def test_atlas_frames_override_baked_tile_sprites() -> None:
+    pygame.init()
+    atlas = pygame.Surface((16, 8))
+    atlas.fill((1, 2, 3), pygame.Rect(0, 0, 8, 8))
+    atlas.fill((9, 8, 7), pygame.Rect(8, 0, 8, 8))
+    sprites = SpriteDB(tile_size=16)
+    assert sprites.tile_sprite(TileType.WALL).get_at((0, 0))[:3] == (100, 100, 100)
+
+    sprites.register_atlas(atlas, 8, {TileType.WALL: (1, 0)})
+    wall = sprites.tile_sprite(TileType.WALL)
+    assert wall.get_size() == (16, 16)
+    assert wall.get_at((15, 15))[:3] == (9, 8, 7)
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import json
+
+from src.config import load_config
+from src.env.grid_env import GridEnv
+
+
+def test_step_info_has_the_diagnostic_sections() -> None:
+    env = GridEnv(load_config(), seed=11)
+    env.reset(seed=11)
+    _obs, _reward, _done, _truncated, info = env.step(2)
+
+    assert type(info) is dict
+    assert info["name"] == env.mode.name
+    assert set(info["transform"]) == {"atlas_state", "atlas_timer", "atlas_ended", "human_state", "human_timer", "human_ended"}
+    assert info["progression"]["level"] == env.world.atlas.level
+    assert list(info)[-5:] == ["reward_terms", "tool_safety", "progression", "transform", "fly"]
+    assert json.loads(json.dumps(info, default=str))["fly"]["atlas_can_fly"] is False
+
+
+def test_lean_info_drops_diagnostics() -> None:
+    env = GridEnv(load_config(), seed=11, lean_info=True)
+    env.reset(seed=11)
+    _obs, _reward, _done, _truncated, info = env.step(2)
+    assert info["name"] == env.mode.name
+    assert "reward_terms" in info
+    assert "tool_safety" not in info and "transform" not in info
+    assert info.get("fly") is None
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from src.core.rng import RNG
+from src.core.types import Character, TileType, Vec2
+from src.env import rules
+from src.env.grid_env import World
+from src.env.modes import ExitGame
+from src.env.world_gen import dungeon_exit
+
+
+def _world(seed: int = 7) -> World:
+    tiles = dungeon_exit(20, 12, RNG(seed))
+    atlas = Character(entity_id="ai_atlas", display_name="Atlas", pos=Vec2(2, 10))
+    human = Character(entity_id="human", display_name="Human", pos=Vec2(3, 10))
+    return World(tiles=tiles, atlas=atlas, human=human)
+
+
+def _scan(world: World, tile: TileType) -> list[tuple[int, int]]:
+    height, width = world.tiles.shape
+    return [(x, y) for y in range(height) for x in range(width) if world.tiles[y, x] == tile]
+
+
+def test_index_tracks_random_set_tile_mutations_in_row_major_order() -> None:
+    world = _world()
+    rng = RNG(3)
+    choices = list(TileType)
+    height, width = world.tiles.shape
+    for _ in range(300):
+        pos = (rng.randint(0, width - 1), rng.randint(0, height - 1))
+        world.set_tile(pos, choices[rng.randint(0, len(choices) - 1)])
+        if rng.random() < 0.2:
+            for tile in TileType:
+                assert world.tiles_of(tile) == _scan(world, tile)
+                assert rules.find_tiles(world.tiles, tile) == _scan(world, tile)
+                assert world.has_tile(tile) == bool(_scan(world, tile))
+
+
+def test_exit_game_opens_every_door_through_the_index() -> None:
+    world = _world()
+    doors = world.tiles_of(TileType.DOOR_CLOSED)
+    mode = ExitGame()
+    mode.reset(world, RNG(7))
+    world.atlas.pos = Vec2(*world.tiles_of(TileType.FLAG)[0])
+    _reward, _events, _done, info = mode.step(world, [], RNG(7))
+
+    assert info["door_open"] is True
+    assert world.tiles_of(TileType.DOOR_CLOSED) == []
+    assert world.tiles_of(TileType.DOOR_OPEN) == sorted(doors, key=lambda pos: (pos[1], pos[0]))
+
+
+def test_replacing_the_grid_rebuilds_the_index() -> None:
+    world = _world()
+    assert world.tiles_of(TileType.FLAG)
+    world.tiles = dungeon_exit(20, 12, RNG(99))
+    assert world.tiles_of(TileType.FLAG) == _scan(world, TileType.FLAG)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pygame
+
+from src.render.ui_overlays import UIOverlays
+
+
+class CountingFont:
+    """Wraps a real font and counts render calls."""
+
+    def __init__(self, font: pygame.font.Font) -> None:
+        self._font = font
+        self.renders = 0
+
+    def render(self, text, antialias, color):
+        self.renders += 1
+        return self._font.render(text, antialias, color)
+
+    def size(self, text):
+        return self._font.size(text)
+
+    def get_linesize(self):
+        return self._font.get_linesize()
+
+
+def test_wrapped_lines_are_rendered_once_and_cache_is_bounded() -> None:
+    pygame.init()
+    font = CountingFont(pygame.font.SysFont("Consolas", 16))
+    ui = UIOverlays(font, max_cached_blocks=2)
+    surface = pygame.Surface((120, 200))
+    text = "Reward: mode=+0.00 progress=+0.10 explore=+0.00 total=+0.10"
+
+    height = ui.draw_wrapped_text(surface, text, (0, 0), 100)
+    renders = font.renders
+    assert renders == len(ui.wrap_text(text, 100)) > 1
+    assert ui.draw_wrapped_text(surface, text, (0, 0), 100) == height
+    assert font.renders == renders
+
+    ui.draw_wrapped_text(surface, text, (0, 0), 100, (200, 200, 200))
+    ui.draw_text(surface, "Mode: ExitGame", (0, 0))
+    assert ui.cache_size() == 2
+
+    ui.set_font(CountingFont(pygame.font.SysFont("Consolas", 12)))
+    assert ui.cache_size() == 0